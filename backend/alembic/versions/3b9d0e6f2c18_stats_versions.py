@@ -0,0 +1,31 @@
+"""stats versions
+
+Revision ID: 3b9d0e6f2c18
+Revises: e1f7a3c92b54
+Create Date: 2026-10-18 16:40:12.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d0e6f2c18'
+down_revision: Union[str, Sequence[str], None] = 'e1f7a3c92b54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('daily_game_stats', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    # stored rollups have no stats version yet, each month is computed again on its next read
+    op.add_column('monthly_rollups', sa.Column('statsVersion', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('monthly_rollups', 'statsVersion')
+    op.drop_column('daily_game_stats', 'version')
@@ -0,0 +1,91 @@
+"""daily stats
+
+Revision ID: 5d2e8f1c9a47
+Revises: a4b6c7b9365c
+Create Date: 2026-10-18 09:12:44.301552
+
+"""
+from collections import defaultdict
+import math
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8f1c9a47'
+down_revision: Union[str, Sequence[str], None] = 'a4b6c7b9365c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    daily_game_stats = op.create_table('daily_game_stats',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('gameId', sa.Integer(), nullable=False),
+    sa.Column('playerCount', sa.Integer(), nullable=False),
+    sa.Column('mean', sa.Float(), nullable=False),
+    sa.Column('std', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['gameId'], ['games.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('date', 'gameId')
+    )
+    daily_t_scores = op.create_table('daily_t_scores',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('gameId', sa.Integer(), nullable=False),
+    sa.Column('playerId', sa.Integer(), nullable=False),
+    sa.Column('tScore', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['gameId'], ['games.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['playerId'], ['players.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('date', 'gameId', 'playerId')
+    )
+
+    # backfill from existing scores, same arithmetic as backend.standings.computeMeanStd
+    # (kept inline so the migration does not depend on application code)
+    games = sa.table('games', sa.column('id', sa.Integer), sa.column('scoreMethod', sa.Integer))
+    scores = sa.table('scores',
+        sa.column('id', sa.Integer),
+        sa.column('date', sa.Date),
+        sa.column('gameId', sa.Integer),
+        sa.column('playerId', sa.Integer),
+        sa.column('score', sa.Integer),
+    )
+    bind = op.get_bind()
+    multipliers = dict(bind.execute(sa.select(games.c.id, games.c.scoreMethod)).all())
+    gameScores = defaultdict(list)
+    for date, gameId, playerId, score in bind.execute(
+        sa.select(scores.c.date, scores.c.gameId, scores.c.playerId, scores.c.score).order_by(scores.c.id)
+    ):
+        gameScores[(date, gameId)].append((playerId, score))
+
+    statRows = []
+    tScoreRows = []
+    for (date, gameId), rows in gameScores.items():
+        values = [score for _, score in rows]
+        count = len(values)
+        mean = sum(values) / count
+        std = None
+        if count > 1:
+            runningMean = 0.0
+            sumSquares = 0.0
+            for i, value in enumerate(values, start=1):
+                oldMean = runningMean
+                runningMean += (value - oldMean) / i
+                sumSquares += (value - oldMean) * (value - runningMean)
+            std = math.sqrt(sumSquares / (count - 1))
+        statRows.append({'date': date, 'gameId': gameId, 'playerCount': count, 'mean': mean, 'std': std})
+        for playerId, score in rows:
+            tScore = (score - mean) / std * multipliers[gameId] if std else 0.0
+            tScoreRows.append({'date': date, 'gameId': gameId, 'playerId': playerId, 'tScore': tScore})
+
+    if statRows:
+        op.bulk_insert(daily_game_stats, statRows)
+    if tScoreRows:
+        op.bulk_insert(daily_t_scores, tScoreRows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_t_scores')
+    op.drop_table('daily_game_stats')
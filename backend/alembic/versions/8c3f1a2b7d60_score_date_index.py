@@ -0,0 +1,27 @@
+"""score date index
+
+Revision ID: 8c3f1a2b7d60
+Revises: 5d2e8f1c9a47
+Create Date: 2026-10-18 09:51:07.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f1a2b7d60'
+down_revision: Union[str, Sequence[str], None] = '5d2e8f1c9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_scores_date_game', 'scores', ['date', 'gameId', 'playerId', 'score'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_scores_date_game', table_name='scores')
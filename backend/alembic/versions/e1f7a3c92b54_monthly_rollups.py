@@ -0,0 +1,45 @@
+"""monthly rollups
+
+Revision ID: e1f7a3c92b54
+Revises: 8c3f1a2b7d60
+Create Date: 2026-10-18 11:02:37.540919
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f7a3c92b54'
+down_revision: Union[str, Sequence[str], None] = '8c3f1a2b7d60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # starts empty, rollups are stored by the first standings read of each month
+    op.create_table('monthly_rollups',
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('rollupVersion', sa.Integer(), nullable=True),
+    sa.Column('gameKey', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('month')
+    )
+    op.create_table('monthly_points',
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('playerId', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['month'], ['monthly_rollups.month'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['playerId'], ['players.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('month', 'playerId', 'category')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('monthly_points')
+    op.drop_table('monthly_rollups')
@@ -0,0 +1,168 @@
+import datetime
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Union
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from . import export, services
+from .config import get_settings
+from .models import Player, Game
+from .rollups import planRange, storeRange
+from .schemas import BulkScoreResponse, DailyScoreboardResponse, MonthlyScoreboardResponse, PlayerCreate, PlayerMonthlyPoint, ScoreCreate, StandingsResponse
+from .scoring import getScoringBackend
+from .scoring_pool import scoringPool
+from .serialization import ScoreRow
+from .sql_scoring import collectMonthlyPoints, monthlyPointsQuery, sqlScoringAvailable
+from .standings import getStandingsEngine
+
+# Awaitable versions of services.py for the async endpoints.
+# With a sync Session the sync service runs in the threadpool, as FastAPI does for def
+# endpoints. With an AsyncSession database IO is awaited on the event loop and CPU-bound
+# scoring is pushed to the scoring pool so it never blocks other requests.
+
+AnySession = Union[Session, AsyncSession]
+
+async def runService(session: AnySession, service: Callable[..., Any], *args: Any) -> Any:
+    if isinstance(session, AsyncSession):
+        # runs the sync service on the async connection, each query is awaited under the hood
+        return await session.run_sync(service, *args)
+    return await run_in_threadpool(service, session, *args)
+
+async def getAllPlayers(session: AnySession) -> list[Player]:
+    return await runService(session, services.getAllPlayers)
+
+async def addPlayer(session: AnySession, player: PlayerCreate) -> Player:
+    return await runService(session, services.addPlayer, player)
+
+async def addNewScore(session: AnySession, score: ScoreCreate):
+    return await runService(session, services.addNewScore, score)
+
+async def updateScore(session: AnySession, score: ScoreCreate):
+    return await runService(session, services.updateScore, score)
+
+async def addScores(session: AnySession, scores: list[ScoreCreate], upsert: bool = False) -> BulkScoreResponse:
+    return await runService(session, services.addScores, scores, upsert)
+
+async def getGamesForPlayer(session: AnySession, playerName: str) -> list[Game]:
+    return await runService(session, services.getGamesForPlayer, playerName)
+
+async def getDailyScores(session: AnySession,
+                         startDate: datetime.date,
+                         endDate: Optional[datetime.date] = None,
+                         playerName: Optional[str] = None,
+                         gameName: Optional[str] = None):
+    return await runService(session, services.getDailyScores, startDate, endDate, playerName, gameName)
+
+async def getDailyScoresPage(session: AnySession,
+                             startDate: datetime.date,
+                             endDate: Optional[datetime.date] = None,
+                             playerName: Optional[str] = None,
+                             gameName: Optional[str] = None,
+                             limit: int = 100,
+                             cursor: Optional[str] = None) -> services.ScoresPage:
+    return await runService(session, services.getDailyScoresPage, startDate, endDate, playerName, gameName, limit, cursor)
+
+async def getDailyScoreRows(session: AnySession,
+                            startDate: datetime.date,
+                            endDate: Optional[datetime.date] = None,
+                            playerName: Optional[str] = None,
+                            gameName: Optional[str] = None) -> list[ScoreRow]:
+    return await runService(session, services.getDailyScoreRows, startDate, endDate, playerName, gameName)
+
+async def getDailyScoreRowsPage(session: AnySession,
+                                startDate: datetime.date,
+                                endDate: Optional[datetime.date] = None,
+                                playerName: Optional[str] = None,
+                                gameName: Optional[str] = None,
+                                limit: int = 100,
+                                cursor: Optional[str] = None) -> services.ScoreRowsPage:
+    return await runService(session, services.getDailyScoreRowsPage, startDate, endDate, playerName, gameName, limit, cursor)
+
+def exportScores(session: AnySession,
+                 exportFormat: export.ExportFormat,
+                 startDate: datetime.date,
+                 endDate: Optional[datetime.date] = None,
+                 playerName: Optional[str] = None,
+                 gameName: Optional[str] = None) -> Union[Iterator[str], AsyncIterator[str]]:
+    # a sync iterator is pulled through the threadpool by StreamingResponse
+    if isinstance(session, AsyncSession):
+        return export.exportScoresAsync(session, exportFormat, startDate, endDate, playerName, gameName)
+    return export.exportScores(session, exportFormat, startDate, endDate, playerName, gameName)
+
+async def getCombinedScores(session: AnySession, date: datetime.date):
+    return await runService(session, services.getCombinedScores, date)
+
+async def getCombinedScoreRows(session: AnySession, date: datetime.date) -> list[ScoreRow]:
+    return await runService(session, services.getCombinedScoreRows, date)
+
+async def getScoreboardDaily(session: AnySession, date: datetime.date) -> DailyScoreboardResponse:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(services.getScoreboardDaily, session, date)
+
+    games = (await session.scalars(select(Game))).all()
+    rows = (await session.execute(services.dailyScoreboardQuery(date))).all()
+    return services.buildDailyScoreboard(date, games, rows)
+
+async def getScoreboardMonthly(session: AnySession, date: datetime.date) -> MonthlyScoreboardResponse:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(services.getScoreboardMonthly, session, date)
+    return await scoringPool.coalesceAsync(services.monthlyScoreboardKey(date), lambda: _computeScoreboardMonthly(session, date))
+
+async def _computeScoreboardMonthly(session: AsyncSession, date: datetime.date) -> MonthlyScoreboardResponse:
+    players = (await session.scalars(select(Player))).all()
+    games = (await session.scalars(select(Game))).all()
+    gamesDict = {game.name: game.scoreMethod for game in games}
+
+    startDate = date.replace(day=1)
+    endDate = date
+    if get_settings().incremental_standings:
+        # only sums cached per-day points, cheap enough to stay on the loop
+        playerPoints = await session.run_sync(
+            lambda syncSession: getStandingsEngine(syncSession).monthlyPoints(syncSession, gamesDict, startDate, endDate)
+        )
+    else:
+        playerPoints = await _computeMonthlyPoints(session, gamesDict, startDate, endDate)
+    if not playerPoints:
+        raise HTTPException(404, "No scores found for this month")
+    return services.buildMonthlyScoreboard(players, games, playerPoints)
+
+async def _computeMonthlyPoints(session: AsyncSession,
+                                games: dict[str, int],
+                                startDate: datetime.date,
+                                endDate: datetime.date) -> list[PlayerMonthlyPoint]:
+    # services.computeMonthlyPoints with the rows awaited and the scoring off the loop
+    if sqlScoringAvailable(session):
+        rows = await session.execute(monthlyPointsQuery(startDate, endDate, len(games)))
+        return collectMonthlyPoints(rows, list(games))
+    scoreRows = (await session.execute(services.monthScoresQuery(startDate, endDate))).mappings().all()
+    if not scoreRows:
+        return []
+    return await scoringPool.runAsync(getScoringBackend().calculateMonthlyPoints, games, services.monthScoreEntries(scoreRows))
+
+async def getStandings(session: AnySession, startDate: datetime.date, endDate: datetime.date) -> StandingsResponse:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(services.getStandings, session, startDate, endDate)
+    return await scoringPool.coalesceAsync(services.standingsKey(startDate, endDate), lambda: _computeStandings(session, startDate, endDate))
+
+async def _computeStandings(session: AsyncSession, startDate: datetime.date, endDate: datetime.date) -> StandingsResponse:
+    if get_settings().incremental_standings:
+        # stored rollups plus cached per-day points, cheap enough to stay on the loop
+        return await session.run_sync(services.computeStandings, startDate, endDate)
+
+    # full recomputes: stored months are looked up on the loop, the missing ones are
+    # loaded with awaited queries and scored like the monthly board
+    players = (await session.execute(select(Player.id, Player.name))).all()
+    games = (await session.execute(select(Game.id, Game.name, Game.scoreMethod))).all()
+    gamesDict = {game.name: game.scoreMethod for game in games}
+
+    plan = await session.run_sync(planRange, gamesDict, startDate, endDate, datetime.date.today())
+    computed = {
+        start: services.periodTotals(await _computeMonthlyPoints(session, gamesDict, start, end))
+        for start, end in plan.missing()
+    }
+    playerIds = {player.name: player.id for player in players}
+    periods = await session.run_sync(storeRange, plan, computed, playerIds)
+    return services.buildStandings(players, games, startDate, endDate, periods)
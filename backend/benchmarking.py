@@ -0,0 +1,129 @@
+import datetime
+import json
+import platform
+import statistics
+import time
+from typing import Callable, NamedTuple, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from . import numpy_stats, services, stats
+from .schemas import ScorePublic
+from .serialization import scoreRowsJson
+from .standings import getStandingsEngine
+from .synthetic import SyntheticHistory
+
+BENCHMARK_REPEAT = 5
+# a median this much slower than the baseline is a regression
+REGRESSION_THRESHOLD = 0.2
+
+SCORING_BACKENDS = {"pandas": stats, "numpy": numpy_stats}
+
+def timeCall(function: Callable[[], object], repeat: int = BENCHMARK_REPEAT, setup: Optional[Callable[[], None]] = None) -> dict:
+    """Run once to warm up, then time repeat runs. setup runs before each call, untimed."""
+    if setup:
+        setup()
+    function()
+    durations = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return {
+        "median": statistics.median(durations),
+        "min": min(durations),
+        "max": max(durations),
+        "runs": repeat,
+    }
+
+# what FastAPI does with a list[ScorePublic] response_model: validate the list again, dump it and json.dumps it
+_scoresResponseModel = TypeAdapter(list[ScorePublic])
+
+def validatedScoresJson(scores: list[ScorePublic]) -> bytes:
+    content = _scoresResponseModel.dump_python(_scoresResponseModel.validate_python(scores), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+def scoringBenchmarks(history: SyntheticHistory, repeat: int = BENCHMARK_REPEAT) -> dict[str, dict]:
+    """Both scoring backends over the history's last month, no database involved."""
+    date = history.endDate
+    monthEntries = history.entries(date.replace(day=1), date)
+    return {
+        f"{name}.calculateMonthlyPoints": timeCall(lambda: backend.calculateMonthlyPoints(history.games, monthEntries), repeat)
+        for name, backend in SCORING_BACKENDS.items()
+    }
+
+def serviceBenchmarks(engine: Engine, history: SyntheticHistory, repeat: int = BENCHMARK_REPEAT) -> dict[str, dict]:
+    """Service reads against a database loaded with the history, a fresh session per call like a request."""
+    date = history.endDate
+
+    def call(function: Callable[[Session], object]) -> Callable[[], object]:
+        def run():
+            with Session(engine) as session:
+                return function(session)
+        return run
+
+    def clearStandings() -> None:
+        with Session(engine) as session:
+            getStandingsEngine(session).clear()
+
+    return {
+        "getScoreboardDaily": timeCall(call(lambda s: services.getScoreboardDaily(s, date)), repeat),
+        "getScoreboardMonthly.cold": timeCall(call(lambda s: services.getScoreboardMonthly(s, date)), repeat, clearStandings),
+        "getScoreboardMonthly.warm": timeCall(call(lambda s: services.getScoreboardMonthly(s, date)), repeat),
+        "getDailyScores.month": timeCall(call(lambda s: services.getDailyScores(s, date.replace(day=1), date, None, None)), repeat),
+        "getDailyScores.player": timeCall(call(lambda s: services.getDailyScores(s, history.startDate, date, history.players[0], None)), repeat),
+        # GET /scores/ over the whole history, from the session to the response body
+        "scoresJson.validated": timeCall(call(lambda s: validatedScoresJson(services.getDailyScores(s, history.startDate, date))), repeat),
+        "scoresJson.fast": timeCall(call(lambda s: scoreRowsJson(services.getDailyScoreRows(s, history.startDate, date))), repeat),
+    }
+
+def benchmarkMeta(history: SyntheticHistory, scores: int, repeat: int) -> dict:
+    return {
+        "players": len(history.players),
+        "games": len(history.games),
+        "startDate": history.startDate.isoformat(),
+        "endDate": history.endDate.isoformat(),
+        "seed": history.seed,
+        "scores": scores,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "createdAt": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+
+class Comparison(NamedTuple):
+    group: str
+    name: str
+    median: float
+    baseline: Optional[float]
+
+    @property
+    def change(self) -> Optional[float]:
+        if not self.baseline:
+            return None
+        return self.median / self.baseline - 1
+
+    def isRegression(self, threshold: float) -> bool:
+        return self.change is not None and self.change > threshold
+
+def compareToBaseline(report: dict, baseline: Optional[dict]) -> list[Comparison]:
+    """Pair every current median with the baseline's, results missing from the baseline get None."""
+    baselineResults = (baseline or {}).get("results", {})
+    return [
+        Comparison(group, name, result["median"], baselineResults.get(group, {}).get(name, {}).get("median"))
+        for group, results in report["results"].items()
+        for name, result in results.items()
+    ]
+
+def formatComparisons(comparisons: list[Comparison], threshold: float) -> str:
+    lines = [f"{'benchmark':<48} {'median ms':>10} {'baseline':>10} {'change':>8}"]
+    for c in comparisons:
+        baseline = f"{c.baseline * 1000:10.2f}" if c.baseline else f"{'-':>10}"
+        change = f"{c.change:+8.1%}" if c.change is not None else f"{'-':>8}"
+        flag = "  REGRESSION" if c.isRegression(threshold) else ""
+        lines.append(f"{c.group + '/' + c.name:<48} {c.median * 1000:10.2f} {baseline} {change}{flag}")
+    return "\n".join(lines)
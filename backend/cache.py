@@ -0,0 +1,94 @@
+import datetime
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+DAILY_SCOREBOARD = "daily"
+MONTHLY_SCOREBOARD = "monthly"
+
+class ResponseCache:
+    """LRU cache of serialized response bodies, bounded by total size in bytes.
+
+    Keys are (endpoint, date) tuples. A max size of 0 disables caching. Callers take a
+    token before building a body so a write that invalidates the key in the meantime
+    keeps the stale body out of the cache.
+    """
+
+    def __init__(self, maxBytes: int) -> None:
+        self.maxBytes = maxBytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._generations: dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def token(self, key: Hashable) -> tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._generations.get(key, 0)
+
+    def set(self, key: Hashable, body: bytes, token: Optional[tuple[int, int]] = None) -> None:
+        if len(body) > self.maxBytes:
+            return
+        with self._lock:
+            if token is not None and token != (self._epoch, self._generations.get(key, 0)):
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.maxBytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._generations[key] = self._generations.get(key, 0) + 1
+                body = self._entries.pop(key, None)
+                if body is not None:
+                    self._size -= len(body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._epoch += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "maxBytes": self.maxBytes,
+            }
+
+def scoreboardKeysForDate(date: datetime.date) -> list[tuple[str, datetime.date]]:
+    """Keys whose response depends on scores from this date.
+
+    The daily board for the date, plus every monthly board from the date through the
+    end of its month (each monthly board covers the 1st up to its own date).
+    """
+    keys = [(DAILY_SCOREBOARD, date)]
+    day = date
+    while day.month == date.month:
+        keys.append((MONTHLY_SCOREBOARD, day))
+        day += datetime.timedelta(days=1)
+    return keys
@@ -17,6 +17,36 @@ class Settings(BaseSettings):
     cors_origins: str = "http://localhost:5173"
     environment: str = "dev"
     app_password: str = "dev"
+    # serve /scores/monthly and /scores/standings from the stored per-day T-scores, the
+    # default; false scores every month from its raw scores with scoring_backend
+    incremental_standings: bool = True
+    # "pandas", "numpy" or "sql", see scoring.getScoringBackend; only used by the full
+    # recompute, so it changes nothing while incremental_standings is on
+    scoring_backend: str = "pandas"
+    # size limit for cached /scores/daily and /scores/monthly bodies, 0 disables the cache
+    response_cache_bytes: int = 8 * 1024 * 1024
+    # max-age for read endpoints, 0 makes clients revalidate with If-None-Match every time
+    read_cache_max_age: int = 0
+    # serve requests through an AsyncEngine (aiosqlite / asyncpg) instead of threadpool sessions
+    async_database: bool = False
+    # processes for full monthly scoring, 0 computes in the request's own thread
+    scoring_workers: int = 0
+    # connection pool of the database engines
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # seconds before a pooled connection is replaced, -1 keeps connections indefinitely
+    db_pool_recycle: int = -1
+    # test each connection with a round trip on checkout, cheaper to turn off with a recycle time
+    db_pool_pre_ping: bool = True
+    # write score lists straight to JSON instead of validating a ScorePublic per row, same bytes either way
+    fast_serialization: bool = True
+    # read replica for the read endpoints, empty sends every query to database_url
+    read_database_url: str = ""
+    # upper bound on replica lag: for this long after a write, reads of the written dates and
+    # every read of the writing client go to the primary
+    replica_lag_seconds: float = 5.0
+    # log every SQL statement
+    db_echo: bool = False
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,97 @@
+import datetime
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import select, delete, func, insert
+from sqlalchemy.orm import Session
+
+from .models import Game, Score, DailyGameStat, DailyTScore
+from .standings import computeMeanStd, computeTScores, getStandingsEngine
+from .rollups import outdateRollups
+
+def _writeGameDays(session: Session,
+                   gameScores: dict[tuple[datetime.date, int], dict[int, int]],
+                   multipliers: dict[int, int],
+                   versions: Optional[dict[tuple[datetime.date, int], int]] = None) -> None:
+    statRows = []
+    tScoreRows = []
+    for (date, gameId), scores in gameScores.items():
+        mean, std = computeMeanStd(list(scores.values()))
+        version = versions.get((date, gameId), 1) if versions else 1
+        statRows.append({"date": date, "gameId": gameId, "playerCount": len(scores), "mean": mean, "std": std, "version": version})
+        tScores = computeTScores(scores, mean, std, multipliers[gameId])
+        tScoreRows.extend(
+            {"date": date, "gameId": gameId, "playerId": playerId, "tScore": tScore}
+            for playerId, tScore in tScores.items()
+        )
+
+    # core inserts, an executemany without the ORM bulk bookkeeping per row
+    if statRows:
+        session.execute(insert(DailyGameStat.__table__), statRows)
+    if tScoreRows:
+        session.execute(insert(DailyTScore.__table__), tScoreRows)
+
+def lockGameDay(session: Session, date: datetime.date, gameId: int) -> None:
+    """Hold off other refreshes of the (date, game) until this transaction ends.
+
+    Without it two writes to one game-day under READ COMMITTED each delete only the rows
+    they can see and the later insert fails on the primary key. The waiting transaction
+    reads the scores after the first one committed, so neither misses the other's score.
+    SQLite already serializes writers.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        # a fixed two-int key, the same (date, game) must map to the same lock in every process
+        session.execute(select(func.pg_advisory_xact_lock(gameId, date.toordinal())))
+
+def refreshDailyStats(session: Session, date: datetime.date, gameId: int, scoreMethod: int) -> None:
+    """Recompute the stored stats and T-scores for one (date, game).
+
+    Runs inside the caller's transaction so the tables commit together with the score write.
+    The row's version goes up by one, which outdates the month's stored standings rollup
+    without a shared row every write of the month would have to lock.
+    """
+    lockGameDay(session, date, gameId)
+    session.execute(delete(DailyTScore).where(DailyTScore.date == date, DailyTScore.gameId == gameId))
+    previous = session.scalar(
+        delete(DailyGameStat).where(DailyGameStat.date == date, DailyGameStat.gameId == gameId).returning(DailyGameStat.version)
+    )
+
+    rows = session.execute(
+        select(Score.playerId, Score.score)
+        .where(Score.date == date, Score.gameId == gameId)
+        .order_by(Score.id)
+    ).all()
+    if rows:
+        _writeGameDays(session, {(date, gameId): {r.playerId: r.score for r in rows}}, {gameId: scoreMethod},
+                       {(date, gameId): (previous or 0) + 1})
+
+def rebuildDailyStats(session: Session,
+                      startDate: Optional[datetime.date] = None,
+                      endDate: Optional[datetime.date] = None) -> int:
+    """Rebuild the stored stats for a date range (everything when unbounded), returns the (date, game) count."""
+    statsDelete = delete(DailyGameStat)
+    tScoresDelete = delete(DailyTScore)
+    query = select(Score.date, Score.gameId, Score.playerId, Score.score).order_by(Score.id)
+    if startDate:
+        statsDelete = statsDelete.where(DailyGameStat.date >= startDate)
+        tScoresDelete = tScoresDelete.where(DailyTScore.date >= startDate)
+        query = query.where(Score.date >= startDate)
+    if endDate:
+        statsDelete = statsDelete.where(DailyGameStat.date <= endDate)
+        tScoresDelete = tScoresDelete.where(DailyTScore.date <= endDate)
+        query = query.where(Score.date <= endDate)
+
+    session.execute(tScoresDelete)
+    session.execute(statsDelete)
+    # the daily versions start over, the rollups' own version tells them apart
+    outdateRollups(session, startDate, endDate)
+
+    multipliers = {g.id: g.scoreMethod for g in session.scalars(select(Game))}
+    gameScores: dict[tuple[datetime.date, int], dict[int, int]] = defaultdict(dict)
+    for row in session.execute(query):
+        gameScores[(row.date, row.gameId)][row.playerId] = row.score
+
+    _writeGameDays(session, gameScores, multipliers)
+    session.commit()
+    getStandingsEngine(session).clear()
+    return len(gameScores)
@@ -1,45 +1,165 @@
+import weakref
+from functools import lru_cache
+from typing import Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import create_engine
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from pathlib import Path
 from .models import Base
 from .config import get_settings
+from .db_timing import TimedAsyncQueuePool, TimedQueuePool
 
-# database set up
-settings = get_settings()
+# database set up, the engines are built on first use so importing the app
+# (uvicorn workers, alembic, tests) neither reads settings nor loads a driver
 
-is_sqlite = settings.database_url.startswith("sqlite")
-
-# Resolve SQLite path relative to this file, not the working directory
-if is_sqlite:
+def resolve_database_url(url: str) -> tuple[str, Optional[Path]]:
+    """Return the URL to connect to and, for SQLite, the database file."""
+    if not url.startswith("sqlite"):
+        return url, None
+    # Resolve SQLite path relative to this file, not the working directory
     # strip sqlite:/// prefix to get the raw path
-    raw_path = settings.database_url[len("sqlite:///"):]
+    raw_path = url[len("sqlite:///"):]
     db_path = Path(raw_path) if Path(raw_path).is_absolute() else Path(__file__).parent / raw_path
-    database_url = f"sqlite:///{db_path}"
-else:
-    database_url = settings.database_url
-    db_path = None
-
-connect_args = {"check_same_thread": False} if is_sqlite else {}
-engine = create_engine(
-    database_url,
-    connect_args=connect_args,
-    echo=(settings.environment == "dev"),
-    pool_pre_ping=True,
-)
+    return f"sqlite:///{db_path}", db_path
+
+def pool_args() -> dict:
+    settings = get_settings()
+    return dict(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+
+def _create_engine(url: str) -> Engine:
+    database_url, db_path = resolve_database_url(url)
+    connect_args = {"check_same_thread": False} if db_path else {}
+    return create_engine(
+        database_url,
+        connect_args=connect_args,
+        echo=get_settings().db_echo,
+        poolclass=TimedQueuePool,
+        **pool_args(),
+    )
+
+@lru_cache
+def get_engine() -> Engine:
+    return _create_engine(get_settings().database_url)
+
+# replica engine -> its primary, so the in-process caches keyed by engine (standings,
+# name lookup) are shared by both and primary writes invalidate what replica reads filled
+_primaries: "weakref.WeakKeyDictionary[Engine, Engine]" = weakref.WeakKeyDictionary()
+
+def register_replica(replica: Engine, primary: Engine) -> None:
+    _primaries[replica] = primary
+
+def cache_engine(engine: Engine) -> Engine:
+    return _primaries.get(engine, engine)
+
+@lru_cache
+def get_read_engine() -> Optional[Engine]:
+    """The replica engine, None without READ_DATABASE_URL."""
+    settings = get_settings()
+    if not settings.read_database_url:
+        return None
+    replica = _create_engine(settings.read_database_url)
+    register_replica(replica, get_engine())
+    return replica
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver for its asyncio counterpart: aiosqlite for SQLite, asyncpg for Postgres."""
+    if url.startswith("sqlite:///"):
+        return "sqlite+aiosqlite:///" + url[len("sqlite:///"):]
+    if url.startswith("postgresql"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    return url
+
+@lru_cache
+def get_async_engine() -> Optional[AsyncEngine]:
+    settings = get_settings()
+    # only built in async mode so the async drivers are not needed otherwise
+    if not settings.async_database:
+        return None
+    return create_async_engine(
+        async_database_url(resolve_database_url(settings.database_url)[0]),
+        echo=settings.db_echo,
+        poolclass=TimedAsyncQueuePool,
+        **pool_args(),
+    )
+
+@lru_cache
+def get_async_read_engine() -> Optional[AsyncEngine]:
+    settings = get_settings()
+    if not settings.async_database or not settings.read_database_url:
+        return None
+    replica = create_async_engine(
+        async_database_url(resolve_database_url(settings.read_database_url)[0]),
+        echo=settings.db_echo,
+        poolclass=TimedAsyncQueuePool,
+        **pool_args(),
+    )
+    register_replica(replica.sync_engine, get_async_engine().sync_engine)
+    return replica
+
+def pool_stats() -> dict:
+    engines = {"sync": get_engine()}
+    async_engine = get_async_engine()
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    read_engine = get_read_engine()
+    if read_engine is not None:
+        engines["syncReplica"] = read_engine
+    async_read_engine = get_async_read_engine()
+    if async_read_engine is not None:
+        engines["asyncReplica"] = async_read_engine.sync_engine
+    return {
+        name: {"size": e.pool.size(), "checkedOut": e.pool.checkedout(), "overflow": e.pool.overflow()}
+        for name, e in engines.items()
+    }
 
 def create_db_and_tables():
-    if db_path and db_path.exists():
-        db_path.unlink()
-    Base.metadata.create_all(engine)
+    delete_db()
+    Base.metadata.create_all(get_engine())
 
 def close_db():
-    engine.dispose()
+    get_engine().dispose()
+    read_engine = get_read_engine()
+    if read_engine is not None:
+        read_engine.dispose()
+
+async def close_async_db():
+    for async_engine in (get_async_engine(), get_async_read_engine()):
+        if async_engine is not None:
+            await async_engine.dispose()
 
 def delete_db():
+    db_path = resolve_database_url(get_settings().database_url)[1]
     if db_path and db_path.exists():
         db_path.unlink()
 
 def get_session():
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
+        yield session
+
+async def get_async_session():
+    # objects stay loaded after commit, lazy loads would need IO outside an await
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+def get_read_session():
+    # None without a replica, reads then use the primary session
+    read_engine = get_read_engine()
+    if read_engine is None:
+        yield None
+        return
+    with Session(read_engine) as session:
+        yield session
+
+async def get_async_read_session():
+    read_engine = get_async_read_engine()
+    if read_engine is None:
+        yield None
+        return
+    async with AsyncSession(read_engine, expire_on_commit=False) as session:
         yield session
@@ -0,0 +1,148 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import Histogram, registry
+
+class RequestTiming:
+    """Database work done on behalf of one request."""
+
+    __slots__ = ("queries", "dbTime", "poolWait")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.dbTime = 0.0
+        self.poolWait = 0.0
+
+    def serverTiming(self) -> str:
+        return f'db;dur={self.dbTime * 1000:.2f};desc="{self.queries} queries", pool;dur={self.poolWait * 1000:.2f}'
+
+# the request being served, it follows the request into the threadpool and AsyncSession greenlets
+_currentTiming: contextvars.ContextVar[Optional[RequestTiming]] = contextvars.ContextVar("requestTiming", default=None)
+
+class DbMetrics:
+    """Process totals of the per-request database timings."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.queries = 0
+        self.dbTime = 0.0
+        self.poolWait = 0.0
+        self.maxPoolWait = 0.0
+
+    def record(self, timing: RequestTiming) -> None:
+        with self._lock:
+            self.requests += 1
+            self.queries += timing.queries
+            self.dbTime += timing.dbTime
+            self.poolWait += timing.poolWait
+            self.maxPoolWait = max(self.maxPoolWait, timing.poolWait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "queries": self.queries,
+                "dbSeconds": self.dbTime,
+                "poolWaitSeconds": self.poolWait,
+                "maxPoolWaitSeconds": self.maxPoolWait,
+            }
+
+dbMetrics = DbMetrics()
+
+queryLatency = registry.register(Histogram(
+    "crossdoku_db_query_duration_seconds",
+    "Time in the database driver per statement, requests and background work alike",
+    ("operation",),
+))
+
+poolWaitLatency = registry.register(Histogram(
+    "crossdoku_db_pool_wait_seconds",
+    "Time to check a connection out of the pool, including the pre-ping",
+))
+
+QUERY_OPERATIONS = frozenset(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH"))
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip()[:6].upper()
+    if keyword.startswith("WITH"):
+        return "WITH"
+    return keyword if keyword in QUERY_OPERATIONS else "OTHER"
+
+@contextmanager
+def trackRequest() -> Iterator[RequestTiming]:
+    timing = RequestTiming()
+    token = _currentTiming.set(timing)
+    try:
+        yield timing
+    finally:
+        _currentTiming.reset(token)
+
+# every engine, including the sync engine behind an AsyncEngine
+@event.listens_for(Engine, "before_cursor_execute")
+def _beforeCursorExecute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._timingStart = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _afterCursorExecute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is None:
+        return
+    elapsed = time.perf_counter() - context._timingStart
+    queryLatency.observe(elapsed, _operation(statement))
+    timing = _currentTiming.get()
+    if timing is not None:
+        timing.queries += 1
+        timing.dbTime += elapsed
+
+class _TimedCheckout:
+    # time to get a connection out of the pool, including the pre-ping round trip
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            elapsed = time.perf_counter() - start
+            poolWaitLatency.observe(elapsed)
+            timing = _currentTiming.get()
+            if timing is not None:
+                timing.poolWait += elapsed
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+class DbTimingMiddleware:
+    """Adds a Server-Timing header with the request's query count, DB time and pool wait.
+
+    The header goes out with the response start, so work a streaming body does afterwards
+    is not included.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with trackRequest() as timing:
+            async def sendWithTiming(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append("Server-Timing", timing.serverTiming())
+                    dbMetrics.record(timing)
+                await send(message)
+
+            await self.app(scope, receive, sendWithTiming)
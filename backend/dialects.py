@@ -0,0 +1,13 @@
+from sqlalchemy.orm import Session
+
+def dialectInsert(session: Session):
+    """insert() of the session's dialect, for on_conflict_do_nothing / on_conflict_do_update.
+
+    Imported on demand: loading the postgresql dialect costs SQLite deployments ~40ms of
+    startup, and the engine already loaded the dialect in use.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import HTTPException, status
 
 class ScoreboardExcepction(HTTPException):
@@ -21,6 +23,19 @@ class InvalidDateException(ScoreboardExcepction):
     def __init__(self):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST,detail="Invalid date in the request")
 
+class InvalidDateRangeException(ScoreboardExcepction):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST,detail="Start date is after end date")
+
+class InvalidCursorException(ScoreboardExcepction):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST,detail="Invalid pagination cursor")
+
+class InvalidScoreException(ScoreboardExcepction):
+    def __init__(self, score: int, index: Optional[int] = None):
+        where = f" at index {index}" if index is not None else ""
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST,detail=f"Invalid score {score}{where}, scores cannot be negative")
+
 class InvalidUpdateException(ScoreboardExcepction):
     def __init__(self):
         super().__init__(status_code=status.HTTP_404_NOT_FOUND,detail="Cannot update non-existent score")
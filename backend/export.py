@@ -0,0 +1,136 @@
+import csv
+import datetime
+import io
+import json
+import re
+import unicodedata
+from urllib.parse import quote
+from typing import AsyncIterator, Iterable, Iterator, Literal, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import Player, Score
+from .services import dailyScoresQuery
+
+# Streaming score export. Rows come off a server-side cursor a batch at a time and each
+# batch is formatted and sent before the next is fetched, so memory stays flat however
+# long the range is.
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_ROWS = 1000
+
+def contentDisposition(filename: str) -> str:
+    """An attachment header for any name: headers are latin-1, so a plain ASCII filename
+    for old clients and the UTF-8 name as filename* (RFC 6266) for the rest."""
+    fallback = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode()
+    # quotes, backslashes and control characters would break out of the quoted string
+    fallback = re.sub(r'["\\\x00-\x1f\x7f]', "_", fallback)
+    stem, dot, extension = fallback.rpartition(".")
+    if dot and not stem.strip():
+        fallback = f"scores.{extension}"
+    elif not fallback.strip():
+        fallback = "scores"
+    return f'attachment; filename="{fallback}"; filename*=UTF-8\'\'{quote(filename, safe="")}'
+
+def exportQuery(startDate: datetime.date,
+                endDate: Optional[datetime.date] = None,
+                playerName: Optional[str] = None,
+                gameName: Optional[str] = None):
+    # by date so a wide csv line can be written as soon as its date is complete
+    return (
+        dailyScoresQuery(startDate, endDate, playerName, gameName)
+        .order_by(Score.date, Score.id)
+        .execution_options(yield_per=EXPORT_BATCH_ROWS)
+    )
+
+def csvPlayersQuery(playerName: Optional[str] = None):
+    query = select(Player.name).order_by(Player.id)
+    if playerName:
+        query = query.where(Player.name == playerName)
+    return query
+
+def ndjsonChunk(rows: Iterable) -> str:
+    # same fields and order as ScorePublic
+    return "".join(
+        json.dumps({"date": row.date.isoformat(), "score": row.score, "playerName": row.playerName, "gameName": row.gameName}) + "\n"
+        for row in rows
+    )
+
+class WideCsvWriter:
+    """Formats date-ordered rows of one game in the seed_data layout: a Date column then one per player."""
+
+    def __init__(self, players: list[str]) -> None:
+        self.players = players
+        self._columns = {name: i for i, name in enumerate(players)}
+        self._date: Optional[datetime.date] = None
+        self._cells: list[str] = []
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+
+    def _take(self) -> str:
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+    def _writeDate(self) -> None:
+        if self._date is not None:
+            self._writer.writerow([f"{self._date.month}/{self._date.day}/{self._date.year}", *self._cells])
+
+    def header(self) -> str:
+        self._writer.writerow(["Date", *self.players])
+        return self._take()
+
+    def feed(self, rows: Iterable) -> str:
+        for row in rows:
+            if row.date != self._date:
+                self._writeDate()
+                self._date = row.date
+                self._cells = [""] * len(self.players)
+            column = self._columns.get(row.playerName)
+            # a player created after the header was read has no column
+            if column is not None:
+                self._cells[column] = str(row.score)
+        return self._take()
+
+    def finish(self) -> str:
+        self._writeDate()
+        self._date = None
+        return self._take()
+
+def exportScores(session: Session,
+                 exportFormat: ExportFormat,
+                 startDate: datetime.date,
+                 endDate: Optional[datetime.date] = None,
+                 playerName: Optional[str] = None,
+                 gameName: Optional[str] = None) -> Iterator[str]:
+    query = exportQuery(startDate, endDate, playerName, gameName)
+    if exportFormat == "csv":
+        writer = WideCsvWriter(list(session.scalars(csvPlayersQuery(playerName))))
+        yield writer.header()
+        for partition in session.execute(query).partitions():
+            yield writer.feed(partition)
+        yield writer.finish()
+    else:
+        for partition in session.execute(query).partitions():
+            yield ndjsonChunk(partition)
+
+async def exportScoresAsync(session: AsyncSession,
+                            exportFormat: ExportFormat,
+                            startDate: datetime.date,
+                            endDate: Optional[datetime.date] = None,
+                            playerName: Optional[str] = None,
+                            gameName: Optional[str] = None) -> AsyncIterator[str]:
+    query = exportQuery(startDate, endDate, playerName, gameName)
+    if exportFormat == "csv":
+        writer = WideCsvWriter(list(await session.scalars(csvPlayersQuery(playerName))))
+        yield writer.header()
+        async for partition in (await session.stream(query)).partitions():
+            yield writer.feed(partition)
+        yield writer.finish()
+    else:
+        async for partition in (await session.stream(query)).partitions():
+            yield ndjsonChunk(partition)
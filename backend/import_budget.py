@@ -0,0 +1,80 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+REPO_ROOT = Path(__file__).parent.parent
+BUDGET_FILE = Path(__file__).parent / "import_budget.json"
+
+# what any FastAPI + SQLAlchemy app loads, the app's own cost is measured on top of it
+FRAMEWORK_IMPORTS = ("fastapi", "sqlalchemy.orm", "sqlalchemy.ext.asyncio", "pydantic_settings")
+
+class ImportTiming(NamedTuple):
+    selfUs: int
+    cumulativeUs: int
+
+def parseImportTime(stderr: str) -> dict[str, ImportTiming]:
+    """Read the "import time: self | cumulative | module" lines python -X importtime writes."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        selfUs, cumulativeUs, module = line[len("import time:"):].split("|")
+        if not selfUs.strip().isdigit():
+            # the header line
+            continue
+        timings.setdefault(module.strip(), ImportTiming(int(selfUs), int(cumulativeUs)))
+    return timings
+
+def measureImports(statement: str) -> dict[str, ImportTiming]:
+    """Run the import statement in a fresh interpreter, nothing cached from this process."""
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT), "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return parseImportTime(result.stderr)
+
+def importReport(module: str, repeat: int = 5, forbidden: tuple[str, ...] = ()) -> dict:
+    """Median import time of module, in total and on top of FRAMEWORK_IMPORTS, over repeat cold starts."""
+    framework = set(measureImports("import " + ", ".join(FRAMEWORK_IMPORTS)))
+    totals, appTotals = [], []
+    appModules: dict[str, list[int]] = {}
+    loaded: set[str] = set()
+    for _ in range(repeat):
+        timings = measureImports(f"import {module}")
+        loaded.update(timings)
+        totals.append(timings[module].cumulativeUs)
+        own = {name: t.selfUs for name, t in timings.items() if name not in framework}
+        appTotals.append(sum(own.values()))
+        for name, selfUs in own.items():
+            appModules.setdefault(name, []).append(selfUs)
+    return {
+        "module": module,
+        "totalMs": statistics.median(totals) / 1000,
+        "appMs": statistics.median(appTotals) / 1000,
+        "slowest": sorted(
+            ((name, statistics.median(values) / 1000) for name, values in appModules.items()),
+            key=lambda item: item[1],
+            reverse=True
+        )[:10],
+        "forbiddenLoaded": sorted(name for name in forbidden if name in loaded),
+        "runs": repeat,
+    }
+
+def loadBudget(path: Path = BUDGET_FILE) -> dict:
+    return json.loads(path.read_text())
+
+def checkBudget(report: dict, budget: dict) -> list[str]:
+    """Every way the report breaks the budget, empty when it fits."""
+    problems = []
+    if report["totalMs"] > budget["totalMs"]:
+        problems.append(f"import {report['module']} took {report['totalMs']:.0f}ms, budget {budget['totalMs']}ms")
+    if report["appMs"] > budget["appMs"]:
+        problems.append(f"the app's own imports took {report['appMs']:.0f}ms on top of the framework, budget {budget['appMs']}ms")
+    for name in report["forbiddenLoaded"]:
+        problems.append(f"{name} is loaded at import time, it should be imported on first use")
+    return problems
@@ -0,0 +1,150 @@
+import csv
+import datetime
+import io
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .daily_stats import rebuildDailyStats
+from .lookups import getNameLookup
+from .dialects import dialectInsert
+from .models import Player, Game, Score, ScoreMethod, player_game_table
+
+# Bulk import of wide score CSVs (a Date column, then one column per player) as used by
+# seed_data. Each file is read once and streamed into the database in batches, the
+# per-day stats are rebuilt once for the imported range at the end.
+
+IMPORT_BATCH_ROWS = 5000
+
+class WideCsv(NamedTuple):
+    players: list[str]
+    rows: Iterator[tuple[datetime.date, str, int]]
+
+class ImportResult(NamedTuple):
+    rows: int
+    inserted: int
+
+class MissingGameError(ValueError):
+    """The game does not exist and no score method was given to create it."""
+
+class CsvRowError(ValueError):
+    """A row of the CSV that does not parse, with its line number."""
+    def __init__(self, line: int, row: list[str], error: Exception):
+        super().__init__(f"line {line} {','.join(row)!r}: {error}")
+        self.line = line
+
+def parseCsvDate(value: str) -> datetime.date:
+    month, day, year = value.split("/")
+    return datetime.date(int(year), int(month), int(day))
+
+def readWideCsv(lines: Iterable[str]) -> WideCsv:
+    """Parse the header straight away and the score cells lazily, one (date, player, score) per filled cell."""
+    reader = csv.reader(lines)
+    players = next(reader)[1:]
+
+    def rows() -> Iterator[tuple[datetime.date, str, int]]:
+        for row in reader:
+            try:
+                date = parseCsvDate(row[0])
+                scores = [(name, int(value)) for name, value in zip(players, row[1:]) if value.strip()]
+            except (ValueError, IndexError) as e:
+                raise CsvRowError(reader.line_num, row, e) from e
+            for name, score in scores:
+                yield date, name, score
+
+    return WideCsv(players, rows())
+
+def ensureGame(session: Session, name: str, scoreMethod: Optional[ScoreMethod] = None) -> int:
+    gameId = session.scalar(select(Game.id).where(Game.name == name))
+    if gameId is None:
+        if scoreMethod is None:
+            raise MissingGameError(f"Game {name} does not exist, a score method is needed to create it")
+        gameId = session.scalar(dialectInsert(session)(Game).values(name=name, scoreMethod=scoreMethod).returning(Game.id))
+    return gameId
+
+def ensurePlayers(session: Session, names: list[str], gameId: int) -> dict[str, int]:
+    """Create missing players and link them to the game, two statements however many players."""
+    if names:
+        session.execute(dialectInsert(session)(Player).values([{"name": name} for name in names])
+                        .on_conflict_do_nothing(index_elements=["name"]))
+    playerIds = dict(session.execute(select(Player.name, Player.id).where(Player.name.in_(names))).tuples().all())
+    if playerIds:
+        session.execute(dialectInsert(session)(player_game_table)
+                        .values([{"player_id": playerId, "game_id": gameId} for playerId in playerIds.values()])
+                        .on_conflict_do_nothing(index_elements=["player_id", "game_id"]))
+    return playerIds
+
+def _copyBatch(cursor, batch: list[dict]) -> None:
+    buffer = io.StringIO()
+    for row in batch:
+        buffer.write(f"{row['date'].isoformat()},{row['playerId']},{row['gameId']},{row['score']}\n")
+    buffer.seek(0)
+    cursor.copy_expert('COPY score_import ("date", "playerId", "gameId", score) FROM STDIN WITH (FORMAT csv)', buffer)
+
+def insertScoreBatches(session: Session, batches: Iterable[list[dict]]) -> int:
+    """Insert batches of score rows in the session's transaction, existing scores are skipped. Returns the inserted count."""
+    connection = session.connection()
+    # psycopg2 can COPY, async drivers behind run_sync cannot
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+        with connection.connection.dbapi_connection.cursor() as cursor:
+            # COPY into a scratch table, then one INSERT ... SELECT that skips existing scores
+            cursor.execute('CREATE TEMP TABLE score_import ("date" date, "playerId" integer, "gameId" integer, score integer) ON COMMIT DROP')
+            for batch in batches:
+                _copyBatch(cursor, batch)
+            cursor.execute(
+                'INSERT INTO scores ("date", "playerId", "gameId", score) '
+                'SELECT "date", "playerId", "gameId", score FROM score_import '
+                'ON CONFLICT ("playerId", "gameId", "date") DO NOTHING'
+            )
+            return cursor.rowcount
+
+    # executemany of one prepared statement per batch, scores already present are skipped
+    statement = dialectInsert(session)(Score.__table__).on_conflict_do_nothing(index_elements=["playerId", "gameId", "date"])
+    inserted = 0
+    for batch in batches:
+        inserted += max(connection.execute(statement, batch).rowcount, 0)
+    return inserted
+
+def importScores(session: Session,
+                 gameName: str,
+                 lines: Iterable[str],
+                 scoreMethod: Optional[ScoreMethod] = None,
+                 batchSize: int = IMPORT_BATCH_ROWS,
+                 refreshStats: bool = True) -> ImportResult:
+    """Import one wide CSV of a game's scores in a single transaction, existing scores are kept."""
+    gameId = ensureGame(session, gameName, scoreMethod)
+    wide = readWideCsv(lines)
+    playerIds = ensurePlayers(session, wide.players, gameId)
+
+    rowCount = 0
+    firstDate: Optional[datetime.date] = None
+    lastDate: Optional[datetime.date] = None
+
+    def scoreRows() -> Iterator[dict]:
+        nonlocal rowCount, firstDate, lastDate
+        for date, name, score in wide.rows:
+            rowCount += 1
+            firstDate = date if firstDate is None else min(firstDate, date)
+            lastDate = date if lastDate is None else max(lastDate, date)
+            yield {"date": date, "playerId": playerIds[name], "gameId": gameId, "score": score}
+
+    rows = scoreRows()
+    inserted = insertScoreBatches(session, iter(lambda: list(islice(rows, batchSize)), []))
+    session.commit()
+
+    if refreshStats and rowCount:
+        rebuildDailyStats(session, firstDate, lastDate)
+    getNameLookup(session).clear()
+    return ImportResult(rowCount, inserted)
+
+def importScoresFile(session: Session,
+                     gameName: str,
+                     path: Path,
+                     scoreMethod: Optional[ScoreMethod] = None,
+                     batchSize: int = IMPORT_BATCH_ROWS,
+                     refreshStats: bool = True) -> ImportResult:
+    with open(path, newline="") as f:
+        return importScores(session, gameName, f, scoreMethod, batchSize, refreshStats)
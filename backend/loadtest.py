@@ -0,0 +1,168 @@
+import asyncio
+import datetime
+import math
+import random
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, NamedTuple, Optional
+from urllib.parse import quote
+
+import httpx
+
+class LoadProfile(NamedTuple):
+    """The burst after a puzzle release: every user opens the board, submits their games and keeps refreshing."""
+    users: int = 50
+    # seconds over which users arrive, front loaded like the minutes after a release
+    ramp: float = 5.0
+    # daily board refreshes after each submission
+    refreshes: int = 3
+    # submissions sent twice (a double tap or a retry), the second one gets a 409
+    duplicateRate: float = 0.1
+    # users who also open the monthly board
+    monthlyRate: float = 0.2
+    # mean pause between one user's requests, in seconds
+    thinkTime: float = 0.2
+    seed: int = 0
+
+class RequestRecord(NamedTuple):
+    name: str
+    # 0 when no response came back
+    status: int
+    seconds: float
+    expected: bool
+
+class LoadRecorder:
+    def __init__(self) -> None:
+        self.records: list[RequestRecord] = []
+
+    async def request(self,
+                      client: httpx.AsyncClient,
+                      name: str,
+                      method: str,
+                      url: str,
+                      expected: tuple[int, ...] = (200,),
+                      **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.records.append(RequestRecord(name, 0, time.perf_counter() - start, False))
+            return None
+        self.records.append(RequestRecord(name, response.status_code, time.perf_counter() - start, response.status_code in expected))
+        return response
+
+async def _think(rng: random.Random, profile: LoadProfile) -> None:
+    if profile.thinkTime > 0:
+        await asyncio.sleep(rng.expovariate(1 / profile.thinkTime))
+
+async def virtualUser(client: httpx.AsyncClient,
+                      recorder: LoadRecorder,
+                      profile: LoadProfile,
+                      rng: random.Random,
+                      playerName: str,
+                      allGames: list[str],
+                      date: datetime.date,
+                      delay: float) -> None:
+    await asyncio.sleep(delay)
+    params = {"date": date.isoformat()}
+    await recorder.request(client, "GET /scores/daily", "GET", "/scores/daily", params=params)
+    games = await recorder.request(client, "GET /games/{playerName}", "GET", f"/games/{quote(playerName)}")
+    gameNames = [game["name"] for game in games.json()] if games is not None and games.status_code == 200 else []
+
+    # players without linked games (e.g. created for the run) play everything
+    for gameName in gameNames or allGames:
+        await _think(rng, profile)
+        score = {"date": date.isoformat(), "playerName": playerName, "gameName": gameName, "score": rng.randint(20, 600)}
+        await recorder.request(client, "POST /score/", "POST", "/score/", json=score)
+        if rng.random() < profile.duplicateRate:
+            await recorder.request(client, "POST /score/ (duplicate)", "POST", "/score/", expected=(409,), json=score)
+        for _ in range(profile.refreshes):
+            await _think(rng, profile)
+            await recorder.request(client, "GET /scores/daily", "GET", "/scores/daily", params=params)
+
+    if rng.random() < profile.monthlyRate:
+        await _think(rng, profile)
+        await recorder.request(client, "GET /scores/monthly", "GET", "/scores/monthly", params=params)
+
+async def preparePlayers(client: httpx.AsyncClient, users: int) -> list[str]:
+    """One player per user, creating "Load Player N" players when there are too few."""
+    response = await client.get("/players/")
+    response.raise_for_status()
+    names = sorted(player["name"] for player in response.json())
+    for i in range(len(names), users):
+        name = f"Load Player {i + 1:04d}"
+        created = await client.post("/players/new", json={"name": name})
+        created.raise_for_status()
+        names.append(name)
+    return names[:users]
+
+def percentile(sortedValues: list[float], q: float) -> float:
+    # nearest rank
+    if not sortedValues:
+        return 0.0
+    return sortedValues[max(0, math.ceil(q / 100 * len(sortedValues)) - 1)]
+
+def latencySummary(records: list[RequestRecord]) -> dict:
+    seconds = sorted(r.seconds for r in records)
+    errors = sum(1 for r in records if not r.expected)
+    return {
+        "requests": len(records),
+        "errors": errors,
+        "errorRate": errors / len(records) if records else 0.0,
+        "p50": percentile(seconds, 50),
+        "p95": percentile(seconds, 95),
+        "p99": percentile(seconds, 99),
+        "max": seconds[-1] if seconds else 0.0,
+    }
+
+def summarize(records: list[RequestRecord], elapsed: float) -> dict:
+    byName: dict[str, list[RequestRecord]] = defaultdict(list)
+    for record in records:
+        byName[record.name].append(record)
+    return {
+        "elapsed": elapsed,
+        "throughput": len(records) / elapsed if elapsed else 0.0,
+        **latencySummary(records),
+        "statuses": {str(status): count for status, count in sorted(Counter(r.status for r in records).items())},
+        "endpoints": {name: latencySummary(group) for name, group in sorted(byName.items())},
+    }
+
+async def runLoad(client: httpx.AsyncClient, profile: LoadProfile, date: datetime.date) -> dict:
+    players = await preparePlayers(client, profile.users)
+    board = await client.get("/scores/daily", params={"date": date.isoformat()})
+    board.raise_for_status()
+    # the board also lists the Combined ranking as a game with id 0
+    allGames = [game["name"] for game in board.json()["games"] if game["id"]]
+
+    recorder = LoadRecorder()
+    rng = random.Random(profile.seed)
+    users = [
+        virtualUser(client, recorder, profile, random.Random(rng.random()), name, allGames, date, profile.ramp * rng.random() ** 2)
+        for name in players
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*users)
+    return summarize(recorder.records, time.perf_counter() - start)
+
+@asynccontextmanager
+async def inProcessClient() -> AsyncIterator[httpx.AsyncClient]:
+    """A client calling the app directly, startup and shutdown included."""
+    from .main import app
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest") as client:
+            yield client
+
+def formatSummary(summary: dict) -> str:
+    lines = [
+        f"{summary['requests']} requests in {summary['elapsed']:.2f}s, {summary['throughput']:.1f} req/s, "
+        f"{summary['errorRate']:.2%} errors, statuses {summary['statuses']}",
+        f"{'endpoint':<28} {'requests':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}",
+    ]
+    for name, endpoint in [*summary["endpoints"].items(), ("all", summary)]:
+        lines.append(
+            f"{name:<28} {endpoint['requests']:>8} {endpoint['errors']:>7} "
+            + " ".join(f"{endpoint[key] * 1000:8.1f}" for key in ("p50", "p95", "p99", "max"))
+        )
+    return "\n".join(lines)
@@ -0,0 +1,123 @@
+import threading
+import time
+import weakref
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .database import cache_engine
+from .models import Player, Game
+
+class GameRef(NamedTuple):
+    id: int
+    scoreMethod: int
+
+# how long a name that was not found is answered from memory, another process may add it
+MISS_SECONDS = 5.0
+# bounds the remembered misses, requests can send any name
+MAX_MISSES = 1000
+
+class NameLookup:
+    """In-process name -> id maps for players and games so score writes skip the lookups.
+
+    Loaded on first use (or at startup). A missing name is looked up on its own, since
+    another process may have added it, and a name that is not found either is remembered
+    for MISS_SECONDS so repeats don't query again. addPlayer records new players as they
+    commit. Players and games are never renamed or deleted through the API, so the maps
+    only go stale when the tables are rebuilt, which must call clear().
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._players: Optional[dict[str, int]] = None
+        self._games: Optional[dict[str, GameRef]] = None
+        self._misses: dict[tuple[type, str], float] = {}
+        self.loads = 0
+        self.misses = 0
+
+    def load(self, session: Session) -> tuple[dict[str, int], dict[str, GameRef]]:
+        players = {row.name: row.id for row in session.execute(select(Player.id, Player.name))}
+        games = {
+            row.name: GameRef(row.id, row.scoreMethod)
+            for row in session.execute(select(Game.id, Game.name, Game.scoreMethod))
+        }
+        with self._lock:
+            self._players = players
+            self._games = games
+            self.loads += 1
+        return players, games
+
+    def clear(self) -> None:
+        with self._lock:
+            self._players = None
+            self._games = None
+            self._misses.clear()
+
+    def hasPlayer(self, name: str) -> bool:
+        # cache only, a miss does not mean the player does not exist
+        players = self._players
+        return players is not None and name in players
+
+    def _recentMiss(self, kind: type, name: str) -> bool:
+        missed = self._misses.get((kind, name))
+        return missed is not None and time.monotonic() - missed < MISS_SECONDS
+
+    def _lookUp(self, session: Session, kind: type, name: str, query):
+        """One indexed query for a name missing from the maps, added to them when found."""
+        row = session.execute(query).first()
+        with self._lock:
+            self.misses += 1
+            if row is None:
+                if len(self._misses) >= MAX_MISSES:
+                    self._misses.clear()
+                self._misses[(kind, name)] = time.monotonic()
+                return None
+            self._misses.pop((kind, name), None)
+            found = row.id if kind is Player else GameRef(row.id, row.scoreMethod)
+            names = self._players if kind is Player else self._games
+            if names is not None:
+                names[name] = found
+            return found
+
+    def playerId(self, session: Session, name: str) -> Optional[int]:
+        players = self._players
+        if players is None:
+            players, _ = self.load(session)
+        if name in players:
+            return players[name]
+        if self._recentMiss(Player, name):
+            return None
+        return self._lookUp(session, Player, name, select(Player.id).where(Player.name == name))
+
+    def game(self, session: Session, name: str) -> Optional[GameRef]:
+        games = self._games
+        if games is None:
+            _, games = self.load(session)
+        if name in games:
+            return games[name]
+        if self._recentMiss(Game, name):
+            return None
+        return self._lookUp(session, Game, name, select(Game.id, Game.scoreMethod).where(Game.name == name))
+
+    def addPlayer(self, name: str, playerId: int) -> None:
+        with self._lock:
+            self._misses.pop((Player, name), None)
+            if self._players is not None:
+                self._players[name] = playerId
+
+_nameLookups: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_nameLookupsLock = threading.Lock()
+
+def getNameLookup(session: Session) -> NameLookup:
+    # one cache per database engine, like the standings engine
+    dbEngine = cache_engine(session.get_bind().engine)
+    with _nameLookupsLock:
+        lookup = _nameLookups.get(dbEngine)
+        if lookup is None:
+            lookup = NameLookup()
+            _nameLookups[dbEngine] = lookup
+        return lookup
+
+def loadNameLookup(session: Session) -> None:
+    getNameLookup(session).load(session)
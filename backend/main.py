@@ -1,17 +1,30 @@
-from typing import Annotated, Optional
+from typing import Annotated, Awaitable, Callable, Optional, Union
 import datetime
+import math
 from zoneinfo import ZoneInfo
 from sqlalchemy.orm import Session
-from fastapi import FastAPI, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from .schemas import DailyScoreboardResponse, MonthlyScoreboardResponse, AuthRequest, PlayerPublic, GamePublic, ScorePublic, ScoreCreate, PlayerCreate
-from .database import get_session, create_db_and_tables, close_db, delete_db
+from .schemas import BulkScoreResponse, DailyScoreboardResponse, MonthlyScoreboardResponse, StandingsResponse, AuthRequest, PlayerPublic, GamePublic, ScorePublic, ScoreCreate, PlayerCreate
+from .database import get_engine, get_async_engine, pool_stats, get_session, get_async_session, get_read_session, get_async_read_session, create_db_and_tables, close_db, close_async_db, delete_db
 from .seeding import seed_database
-from .exceptions import InvalidPasswordException, InvalidDateException
-from .services import getAllPlayers, addPlayer as addPlayerService, addNewScore, getGamesForPlayer, getDailyScores, getCombinedScores, getScoreboardDaily, getScoreboardMonthly, updateScore as updateScoreService
+from .exceptions import InvalidPasswordException, InvalidDateException, InvalidDateRangeException
+from .async_services import getAllPlayers, addPlayer as addPlayerService, addNewScore, addScores as addScoresService, getGamesForPlayer, getDailyScoreRows, getDailyScoreRowsPage, exportScores as exportScoresService, getCombinedScoreRows, getScoreboardDaily, getScoreboardMonthly, getStandings as getStandingsService, updateScore as updateScoreService
 from .config import get_settings, ENV_NAME_DEV, ENV_NAME_PROD
+from .cache import ResponseCache, scoreboardKeysForDate, DAILY_SCOREBOARD, MONTHLY_SCOREBOARD
+from .versions import dataVersions, etagMatches
+from .scoring_pool import scoringPool
+from .export import ExportFormat, contentDisposition
+from .lookups import loadNameLookup
+from .db_timing import DbTimingMiddleware, dbMetrics
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, Collected, Counter, MetricsMiddleware, registry as metricsRegistry
+from .standings import standingsCacheStats
+from .serialization import ScoreRow, scoreRowsJson
+from .score_stream import StreamScope, scoreStream
 
 EASTERN = ZoneInfo("America/New_York")
 
@@ -34,19 +47,181 @@ def max_allowed_date() -> datetime.date:
 
 settings = get_settings()
 
+responseCache = ResponseCache(settings.response_cache_bytes)
+
+DEFAULT_SCORES_PAGE = 100
+MAX_SCORES_PAGE = 1000
+
+CACHE_CONTROL = f"private, max-age={settings.read_cache_max_age}" if settings.read_cache_max_age else "no-cache"
+
+async def cachedJsonResponse(key, build: Callable[[], Awaitable], headers: Optional[dict[str, str]] = None) -> Response:
+    body = responseCache.get(key)
+    if body is None:
+        token = responseCache.token(key)
+        body = (await build()).model_dump_json().encode()
+        responseCache.set(key, body, token)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def scoreRowsResponse(rows: list[ScoreRow], response: Response) -> Union[Response, list[ScoreRow]]:
+    # response_model validation builds a ScorePublic per row, serializing the rows directly gives the same bytes
+    if settings.fast_serialization:
+        return Response(content=scoreRowsJson(rows), media_type="application/json", headers=dict(response.headers))
+    return rows
+
+def notModifiedResponse(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Return a 304 if the client already holds this version, otherwise add the validators to the response.
+
+    The version must be read before any data is loaded, so a write racing the request can
+    only make the ETag older than the body, never newer.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etagMatches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+def scoreChanged(date: datetime.date) -> None:
+    responseCache.invalidate(*scoreboardKeysForDate(date))
+    dataVersions.scoreChanged(date)
+
+async def publishScores(session: Union[Session, AsyncSession], scores: list[ScorePublic]) -> None:
+    """Push written scores to the streams watching their dates, after the write committed."""
+    byDate: dict[datetime.date, list[ScorePublic]] = {}
+    for score in scores:
+        byDate.setdefault(score.date, []).append(score)
+    for date, dateScores in byDate.items():
+        if not scoreStream.wants(date):
+            continue
+        # one query per write however many clients watch the day
+        combined = await getCombinedScoreRows(session, date) if scoreStream.wantsCombined(date) else None
+        scoreStream.publish(date, dateScores, combined)
+
+def playersChanged() -> None:
+    # every scoreboard lists all players
+    responseCache.clear()
+    dataVersions.playersChanged()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # start up operations
     if settings.environment == ENV_NAME_DEV:
         create_db_and_tables()
         seed_database()
+    # player and game ids for the score write path
+    if settings.async_database:
+        async with AsyncSession(get_async_engine()) as session:
+            await session.run_sync(loadNameLookup)
+    else:
+        with Session(get_engine()) as session:
+            loadNameLookup(session)
     yield
     # shut down operations
+    scoreStream.close()
     close_db()
+    await close_async_db()
+    scoringPool.shutdown()
     if settings.environment == ENV_NAME_DEV:
         delete_db()
 
-SessionDep = Annotated[Session,Depends(get_session)]
+def cacheStats() -> dict[str, dict[str, int]]:
+    return {"response": responseCache.stats(), "standings": standingsCacheStats()}
+
+def cacheRequestSamples() -> dict[tuple[str, str], int]:
+    return {
+        (cache, result): stats[field]
+        for cache, stats in cacheStats().items()
+        for result, field in (("hit", "hits"), ("miss", "misses"))
+    }
+
+def cacheHitRatioSamples() -> dict[tuple[str], float]:
+    ratios = {}
+    for cache, stats in cacheStats().items():
+        lookups = stats["hits"] + stats["misses"]
+        if lookups:
+            ratios[(cache,)] = stats["hits"] / lookups
+    return ratios
+
+def poolConnectionSamples() -> dict[tuple[str, str], int]:
+    return {
+        (pool, state): stats[state]
+        for pool, stats in pool_stats().items()
+        for state in ("size", "checkedOut", "overflow")
+    }
+
+metricsRegistry.register(Collected(
+    "counter",
+    "crossdoku_cache_requests_total",
+    "Lookups in the response cache and in the standings per-day cache",
+    ("cache", "result"),
+    cacheRequestSamples,
+))
+metricsRegistry.register(Collected(
+    "gauge",
+    "crossdoku_cache_hit_ratio",
+    "Hits over lookups since the process started",
+    ("cache",),
+    cacheHitRatioSamples,
+))
+metricsRegistry.register(Collected(
+    "gauge",
+    "crossdoku_db_pool_connections",
+    "Connections per engine pool",
+    ("pool", "state"),
+    poolConnectionSamples,
+))
+
+SessionDep = Annotated[Union[Session, AsyncSession],Depends(get_async_session if settings.async_database else get_session)]
+ReplicaSessionDep = Annotated[Optional[Union[Session, AsyncSession]],Depends(get_async_read_session if settings.async_database else get_read_session)]
+
+# set on write responses, the client's reads go to the primary while it lasts
+PRIMARY_READS_COOKIE = "crossdoku_primary_reads"
+
+readsRouted = metricsRegistry.register(Counter(
+    "crossdoku_db_reads_total",
+    "Read endpoint sessions by the database they were routed to",
+    ("target",),
+))
+
+class ReadSessions:
+    """Picks the session of a read endpoint: the replica unless it may miss a write the read needs.
+
+    Reads use the primary when no replica is configured, when the client wrote within
+    REPLICA_LAG_SECONDS (read-your-writes, the write set a cookie), and when anyone wrote
+    the dates read within it, so the response and standings caches are never filled from
+    a replica that is behind. Recent writes are only known for this process, the cookie
+    covers the writing client across processes.
+    """
+
+    def __init__(self, primary: Union[Session, AsyncSession], replica: Optional[Union[Session, AsyncSession]], ownWrite: bool) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.ownWrite = ownWrite
+
+    def _route(self, recentWrite: bool) -> Union[Session, AsyncSession]:
+        if self.replica is None or self.ownWrite or recentWrite:
+            readsRouted.inc("primary")
+            return self.primary
+        readsRouted.inc("replica")
+        return self.replica
+
+    def forDates(self, startDate: datetime.date, endDate: Optional[datetime.date] = None, players: bool = False) -> Union[Session, AsyncSession]:
+        lag = settings.replica_lag_seconds
+        return self._route(
+            dataVersions.scoresWrittenWithin(lag, startDate, endDate)
+            or (players and dataVersions.playersWrittenWithin(lag))
+        )
+
+    def forPlayers(self) -> Union[Session, AsyncSession]:
+        return self._route(dataVersions.playersWrittenWithin(settings.replica_lag_seconds))
+
+def get_read_sessions(primary: SessionDep, replica: ReplicaSessionDep, request: Request) -> ReadSessions:
+    return ReadSessions(primary, replica, PRIMARY_READS_COOKIE in request.cookies)
+
+ReadSessionsDep = Annotated[ReadSessions, Depends(get_read_sessions)]
+
+def markOwnWrite(response: Response) -> None:
+    if settings.read_database_url and settings.replica_lag_seconds > 0:
+        response.set_cookie(PRIMARY_READS_COOKIE, "1", max_age=math.ceil(settings.replica_lag_seconds), httponly=True, samesite="lax")
 
 app = FastAPI(lifespan=lifespan)
 
@@ -57,88 +232,239 @@ app.add_middleware(
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=['*'],
-    allow_headers=['*']
+    allow_headers=['*'],
+    expose_headers=['ETag', 'X-Next-Cursor', 'Server-Timing']
 )
+app.add_middleware(DbTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 @app.post("/auth/verify")
-def verify_password(request: AuthRequest):
+async def verify_password(request: AuthRequest):
     if request.password != settings.app_password:
         raise InvalidPasswordException()
     return {"authenticated": True}
 
 @app.get("/players/", response_model=list[PlayerPublic])
-def getPlayers(
-    session: SessionDep
+async def getPlayers(
+    sessions: ReadSessionsDep,
+    request: Request,
+    response: Response
     ):
-    return getAllPlayers(session=session)
+    notModified = notModifiedResponse(request, response, dataVersions.etag(dataVersions.playersVersion()))
+    if notModified:
+        return notModified
+    return await getAllPlayers(session=sessions.forPlayers())
 
 @app.post("/players/new", response_model=PlayerPublic)
-def addPlayer(
+async def addPlayer(
     session: SessionDep,
+    response: Response,
     player: PlayerCreate
 ):
-    return addPlayerService(session, player)
+    newPlayer = await addPlayerService(session, player)
+    playersChanged()
+    markOwnWrite(response)
+    return newPlayer
 
 @app.post("/score/", response_model=ScorePublic)
-def addScore(
+async def addScore(
     session: SessionDep,
+    response: Response,
     score: ScoreCreate
     ):
     if score.date > max_allowed_date():
         raise InvalidDateException()
     
-    return addNewScore(session, score)
+    newScore = await addNewScore(session, score)
+    scoreChanged(score.date)
+    markOwnWrite(response)
+    await publishScores(session, [ScorePublic.model_validate(newScore)])
+    return newScore
 
 @app.put("/score/", response_model=ScorePublic)
-def updateScore(
+async def updateScore(
     session: SessionDep,
+    response: Response,
     score: ScoreCreate
 ):
-    return updateScoreService(session, score)
+    updatedScore = await updateScoreService(session, score)
+    scoreChanged(score.date)
+    markOwnWrite(response)
+    await publishScores(session, [ScorePublic.model_validate(updatedScore)])
+    return updatedScore
+
+@app.post("/scores/bulk", response_model=BulkScoreResponse)
+async def addScores(
+    session: SessionDep,
+    response: Response,
+    scores: list[ScoreCreate],
+    upsert: bool = False
+):
+    latest = max_allowed_date()
+    if any(score.date > latest for score in scores):
+        raise InvalidDateException()
+
+    result = await addScoresService(session, scores, upsert)
+    for date in {score.date for score in result.scores}:
+        scoreChanged(date)
+    markOwnWrite(response)
+    await publishScores(session, result.scores)
+    return result
     
 @app.get("/games/{playerName}", response_model=list[GamePublic])
-def getGames(
-    session: SessionDep,
+async def getGames(
+    sessions: ReadSessionsDep,
+    request: Request,
+    response: Response,
     playerName: str):
-   return getGamesForPlayer(session, playerName)
+   notModified = notModifiedResponse(request, response, dataVersions.etag(dataVersions.playersVersion()))
+   if notModified:
+       return notModified
+   return await getGamesForPlayer(sessions.forPlayers(), playerName)
     
 @app.get("/scores/", response_model=list[ScorePublic])
-def getScores(
-    session: SessionDep,
+async def getScores(
+    sessions: ReadSessionsDep,
+    request: Request,
+    response: Response,
     startDate: datetime.date,
     endDate: Optional[datetime.date] = None,
     playerName: Optional[str] = None,
     gameName: Optional[str] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_SCORES_PAGE)] = None,
+    cursor: Optional[str] = None,
 ):
     if startDate > max_allowed_date():
         raise InvalidDateException()
     if endDate and endDate > max_allowed_date():
         raise InvalidDateException()
-    return getDailyScores(session,startDate,endDate,playerName,gameName)
+    notModified = notModifiedResponse(request, response, dataVersions.etag(dataVersions.scoresVersion(startDate, endDate)))
+    if notModified:
+        return notModified
+    session = sessions.forDates(startDate, endDate)
+    if limit is None and cursor is None:
+        return scoreRowsResponse(await getDailyScoreRows(session,startDate,endDate,playerName,gameName), response)
+
+    # paged, the cursor of the next page travels in a header so the body stays a plain list
+    page = await getDailyScoreRowsPage(session, startDate, endDate, playerName, gameName, limit or DEFAULT_SCORES_PAGE, cursor)
+    if page.nextCursor:
+        response.headers["X-Next-Cursor"] = page.nextCursor
+    return scoreRowsResponse(page.rows, response)
     
+@app.get("/scores/export")
+async def exportScores(
+    sessions: ReadSessionsDep,
+    startDate: datetime.date,
+    endDate: Optional[datetime.date] = None,
+    playerName: Optional[str] = None,
+    gameName: Optional[str] = None,
+    format: ExportFormat = "ndjson",
+):
+    if startDate > max_allowed_date():
+        raise InvalidDateException()
+    if endDate and endDate > max_allowed_date():
+        raise InvalidDateException()
+    session = sessions.forDates(startDate, endDate)
+    if format == "csv":
+        # the wide layout has one column per player, so one game per file
+        if not gameName:
+            raise HTTPException(400, "gameName is required for csv export")
+        return StreamingResponse(
+            exportScoresService(session, format, startDate, endDate, playerName, gameName),
+            media_type="text/csv",
+            headers={"Content-Disposition": contentDisposition(f"{gameName.lower()}.csv")}
+        )
+    return StreamingResponse(
+        exportScoresService(session, format, startDate, endDate, playerName, gameName),
+        media_type="application/x-ndjson"
+    )
+
 @app.get("/scores/combined", response_model=list[ScorePublic])
-def getCombinedScores(
-    session: SessionDep,
+async def getCombinedScores(
+    sessions: ReadSessionsDep,
+    request: Request,
+    response: Response,
     date: datetime.date
 ):
     if date > max_allowed_date():
         raise InvalidDateException()
-    return getCombinedScores(session,date)
+    notModified = notModifiedResponse(request, response, dataVersions.etag(dataVersions.scoresVersion(date, date)))
+    if notModified:
+        return notModified
+    return scoreRowsResponse(await getCombinedScoreRows(sessions.forDates(date, date),date), response)
+
+@app.get("/scores/stream")
+async def streamScores(
+    date: datetime.date,
+    scope: StreamScope = "day"
+):
+    # server-sent events: "ready" on connect (fetch the board then), "scores" after every write
+    if date > max_allowed_date():
+        raise InvalidDateException()
+    return StreamingResponse(
+        scoreStream.events(date, scope == "month"),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/scores/daily", response_model=DailyScoreboardResponse)
-def getDailyScoreboard(
-    session: SessionDep,
+async def getDailyScoreboard(
+    sessions: ReadSessionsDep,
+    request: Request,
+    response: Response,
     date: datetime.date
 ):
     if date > max_allowed_date():
         raise InvalidDateException()
-    return getScoreboardDaily(session, date)
+    etag = dataVersions.etag(dataVersions.scoresVersion(date, date), dataVersions.playersVersion())
+    notModified = notModifiedResponse(request, response, etag)
+    if notModified:
+        return notModified
+    return await cachedJsonResponse((DAILY_SCOREBOARD, date), lambda: getScoreboardDaily(sessions.forDates(date, date, players=True), date), dict(response.headers))
 
 @app.get("/scores/monthly", response_model=MonthlyScoreboardResponse)
-def getMonthlyScoreboard(
-    session: SessionDep,
+async def getMonthlyScoreboard(
+    sessions: ReadSessionsDep,
+    request: Request,
+    response: Response,
     date: datetime.date
 ):
     if date > max_allowed_date():
         raise InvalidDateException()
-    return getScoreboardMonthly(session,date) 
+    etag = dataVersions.etag(dataVersions.scoresVersion(date.replace(day=1), date), dataVersions.playersVersion())
+    notModified = notModifiedResponse(request, response, etag)
+    if notModified:
+        return notModified
+    return await cachedJsonResponse((MONTHLY_SCOREBOARD, date), lambda: getScoreboardMonthly(sessions.forDates(date.replace(day=1), date, players=True),date), dict(response.headers))
+
+@app.get("/scores/standings", response_model=StandingsResponse)
+async def getStandings(
+    # the primary, the first read of a closed month stores its rollup
+    session: SessionDep,
+    request: Request,
+    response: Response,
+    start: datetime.date,
+    end: datetime.date
+):
+    if end > max_allowed_date():
+        raise InvalidDateException()
+    if start > end:
+        raise InvalidDateRangeException()
+    etag = dataVersions.etag(dataVersions.scoresVersion(start, end), dataVersions.playersVersion())
+    notModified = notModifiedResponse(request, response, etag)
+    if notModified:
+        return notModified
+    return await getStandingsService(session, start, end)
+
+@app.get("/cache/stats")
+async def getCacheStats():
+    return responseCache.stats()
+
+@app.get("/db/stats")
+async def getDbStats():
+    return {**dbMetrics.stats(), "pools": pool_stats()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def getMetrics():
+    # async so the threadpool gauges read the loop's limiter, and scraping never waits for a thread
+    return PlainTextResponse(metricsRegistry.render(), media_type=METRICS_CONTENT_TYPE)
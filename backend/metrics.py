@@ -0,0 +1,197 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from anyio import to_thread
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# seconds, from a cached response up to a cold monthly scoreboard
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Sample = tuple[str, tuple[tuple[str, str], ...], float]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _formatSample(name: str, labels: tuple[tuple[str, str], ...], value: float) -> str:
+    if labels:
+        name += "{" + ",".join(f'{key}="{_escape(str(v))}"' for key, v in labels) + "}"
+    if value == float("inf"):
+        return f"{name} +Inf"
+    return f"{name} {value!r}"
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+        # a counter without labels reports 0 before its first increment
+        self._values: dict[tuple[str, ...], float] = {} if labels else {(): 0}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values = dict(self._values)
+        for labelValues, value in values.items():
+            yield self.name, tuple(zip(self.labels, labelValues)), value
+
+class Histogram:
+    """Fixed bucket histogram, one series per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # per series: a count per bucket plus one for +Inf, and the sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            series = {labels: (list(counts), total[0]) for labels, (counts, total) in self._series.items()}
+        for labelValues, (counts, total) in series.items():
+            labels = tuple(zip(self.labels, labelValues))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", labels + (("le", "+Inf" if bound == float("inf") else repr(bound)),), cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+class Collected:
+    """Values read from elsewhere when the metrics are scraped.
+
+    collect returns {label values: value}, so counters the app already keeps (cache hits,
+    pool sizes) are exported without counting twice.
+    """
+
+    def __init__(self, kind: str, name: str, help: str, labels: tuple[str, ...], collect: Callable[[], dict[tuple[str, ...], float]]) -> None:
+        self.kind = kind
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.collect = collect
+
+    def samples(self) -> Iterator[Sample]:
+        for labelValues, value in self.collect().items():
+            yield self.name, tuple(zip(self.labels, labelValues)), value
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(_formatSample(*sample) for sample in metric.samples())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+requestLatency = registry.register(Histogram(
+    "crossdoku_http_request_duration_seconds",
+    "Time from receiving a request to sending the last of its response",
+    ("method", "route", "status"),
+))
+
+threadpoolSaturated = registry.register(Counter(
+    "crossdoku_threadpool_saturated_total",
+    "Requests that arrived while every worker thread was busy",
+))
+
+def _threadLimiter() -> Optional[object]:
+    # the limiter belongs to the running event loop
+    try:
+        return to_thread.current_default_thread_limiter()
+    except RuntimeError:
+        return None
+
+def _threadpoolStats() -> dict[tuple[str, ...], float]:
+    limiter = _threadLimiter()
+    if limiter is None:
+        return {}
+    return {("busy",): limiter.borrowed_tokens, ("max",): limiter.total_tokens}
+
+registry.register(Collected(
+    "gauge",
+    "crossdoku_threadpool_threads",
+    "Worker threads running sync endpoints, dependencies and DB calls",
+    ("state",),
+    _threadpoolStats,
+))
+
+class MetricsMiddleware:
+    """Records every request's latency under its route template, e.g. /games/{playerName}.
+
+    Paths that match no route share the "unmatched" label so scanners cannot grow the
+    number of series.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        limiter = _threadLimiter()
+        if limiter is not None and limiter.borrowed_tokens >= limiter.total_tokens:
+            threadpoolSaturated.inc()
+        status = 500
+
+        async def sendWithStatus(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, sendWithStatus)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            requestLatency.observe(time.perf_counter() - start, scope["method"], route, str(status))
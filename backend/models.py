@@ -1,5 +1,5 @@
-from typing import List
-from sqlalchemy import UniqueConstraint, Table, Column, ForeignKey, Date, CheckConstraint, Integer
+from typing import List, Optional
+from sqlalchemy import UniqueConstraint, Index, Table, Column, ForeignKey, Date, CheckConstraint, Integer
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 import datetime
 from enum import IntEnum
@@ -52,8 +52,50 @@ class Score(Base):
 
     __table_args__ = (
         UniqueConstraint("playerId","gameId","date", name="uq_player_game_date"),
+        # date ranges are the entry point of every read, the trailing columns make it covering
+        Index("ix_scores_date_game", "date", "gameId", "playerId", "score"),
     )
 
     player: Mapped[Player] = relationship(back_populates="scores")
     game: Mapped[Game] = relationship(back_populates="scores")
 
+### Materialized per-day scoring, kept in step with score writes
+
+class DailyGameStat(Base):
+    __tablename__ = "daily_game_stats"
+    date: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    gameId: Mapped[int] = mapped_column(ForeignKey("games.id",ondelete="CASCADE"), primary_key=True)
+    playerCount: Mapped[int]
+    mean: Mapped[float]
+    # null when fewer than two players have scored, matching pandas' NaN std
+    std: Mapped[Optional[float]]
+    # bumped by every refresh of the (date, game), a month's sum outdates its stored rollup
+    version: Mapped[int] = mapped_column(default=1, server_default="1")
+
+class DailyTScore(Base):
+    __tablename__ = "daily_t_scores"
+    date: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    gameId: Mapped[int] = mapped_column(ForeignKey("games.id",ondelete="CASCADE"), primary_key=True)
+    playerId: Mapped[int] = mapped_column(ForeignKey("players.id",ondelete="CASCADE"), primary_key=True)
+    tScore: Mapped[float]
+
+### Monthly rollups for range standings
+
+class MonthlyRollup(Base):
+    __tablename__ = "monthly_rollups"
+    # first day of the month
+    month: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    # bumped by stats rebuilds of the month, score writes only bump daily_game_stats
+    version: Mapped[int] = mapped_column(default=0)
+    # the versions and game set the stored points were computed for, they are only used while all still match
+    rollupVersion: Mapped[Optional[int]]
+    statsVersion: Mapped[Optional[int]]
+    gameKey: Mapped[Optional[str]]
+
+class MonthlyPoint(Base):
+    __tablename__ = "monthly_points"
+    month: Mapped[datetime.date] = mapped_column(ForeignKey("monthly_rollups.month",ondelete="CASCADE"), primary_key=True)
+    playerId: Mapped[int] = mapped_column(ForeignKey("players.id",ondelete="CASCADE"), primary_key=True)
+    # Participation, Combined or a game name, Individual and Total are derived when summing
+    category: Mapped[str] = mapped_column(primary_key=True)
+    points: Mapped[int]
@@ -0,0 +1,86 @@
+import numpy as np
+from typing import Any
+
+from .schemas import PlayerMonthlyPoint
+from .scoring import timedScoring
+
+# Drop-in replacement for stats.calculateMonthlyPoints built on integer codes and segment reductions.
+# Players, games and dates are mapped to dense indices so every groupby becomes an
+# np.bincount (sums, counts) or np.maximum.reduceat over rows sorted by group.
+
+@timedScoring
+def _encode(scoreEntries: list[dict[str, Any]], games: dict) -> tuple:
+    gameList = list(games.keys())
+    gameIndex = {name: i for i, name in enumerate(gameList)}
+
+    playerNames, playerIdx = np.unique(np.array([e['playerName'] for e in scoreEntries], dtype=object), return_inverse=True)
+    gameIdx = np.array([gameIndex[e['gameName']] for e in scoreEntries], dtype=np.intp)
+    values = np.array([e['score'] for e in scoreEntries], dtype=np.float64)
+    multipliers = np.array([games[name] for name in gameList], dtype=np.float64)
+    return gameList, playerNames, playerIdx.astype(np.intp), gameIdx, values, multipliers
+
+@timedScoring
+def _t_scores(groupIdx: np.ndarray, values: np.ndarray, multipliers: np.ndarray, groupCount: int) -> np.ndarray:
+    counts = np.bincount(groupIdx, minlength=groupCount)
+    sums = np.bincount(groupIdx, weights=values, minlength=groupCount)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+        deviations = values - means[groupIdx]
+        squares = np.bincount(groupIdx, weights=deviations * deviations, minlength=groupCount)
+        stds = np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+        rowStd = stds[groupIdx]
+        # if only one player has played this will prevent divide by 0 errors
+        return np.where((rowStd == 0) | np.isnan(rowStd), 0.0, deviations / rowStd * multipliers)
+
+@timedScoring
+def _unique_max(groupIdx: np.ndarray, values: np.ndarray, groupCount: int) -> np.ndarray:
+    """Boolean mask of rows holding the sole maximum of their group."""
+    order = np.argsort(groupIdx, kind='stable')
+    sortedGroups = groupIdx[order]
+    starts = np.flatnonzero(np.r_[True, sortedGroups[1:] != sortedGroups[:-1]])
+    groupMax = np.full(groupCount, -np.inf)
+    groupMax[sortedGroups[starts]] = np.maximum.reduceat(values[order], starts)
+
+    isMax = values == groupMax[groupIdx]
+    maxCounts = np.bincount(groupIdx, weights=isMax, minlength=groupCount)
+    return isMax & (maxCounts[groupIdx] == 1)
+
+@timedScoring
+def calculateMonthlyPoints(games:dict, scoreEntries:list[dict[str,Any]]) -> list[PlayerMonthlyPoint]:
+    if not scoreEntries:
+        return []
+
+    gameList, playerNames, playerIdx, gameIdx, values, multipliers = _encode(scoreEntries, games)
+    dateKeys, dateIdx = np.unique(np.array([e['date'] for e in scoreEntries], dtype=object), return_inverse=True)
+    dateIdx = dateIdx.astype(np.intp)
+    nPlayers, nGames, nDates = len(playerNames), len(gameList), len(dateKeys)
+
+    # t-scores and single winners per (date, game)
+    dateGame = dateIdx * nGames + gameIdx
+    tScores = _t_scores(dateGame, values, multipliers[gameIdx], nDates * nGames)
+    individual = _unique_max(dateGame, tScores, nDates * nGames)
+    gamePoints = np.bincount(playerIdx * nGames + gameIdx, weights=individual, minlength=nPlayers * nGames)
+    gamePoints = gamePoints.reshape(nPlayers, nGames).astype(np.int64)
+
+    # participation and combined winners per date, only for players who played every game
+    datePlayer = dateIdx * nPlayers + playerIdx
+    gamesPlayed = np.bincount(datePlayer, minlength=nDates * nPlayers).reshape(nDates, nPlayers)
+    eligible = gamesPlayed == nGames
+    totals = np.bincount(datePlayer, weights=tScores, minlength=nDates * nPlayers).reshape(nDates, nPlayers)
+    totals = np.where(eligible, totals, -np.inf)
+    dayMax = totals.max(axis=1, keepdims=True)
+    combinedWinners = eligible & (totals == dayMax)
+    combinedWinners &= combinedWinners.sum(axis=1, keepdims=True) == 1
+
+    participation = eligible.sum(axis=0)
+    combined = combinedWinners.sum(axis=0)
+    individualTotal = gamePoints.sum(axis=1)
+    columns = [participation, individualTotal, combined, participation + combined + individualTotal]
+    columns += [gamePoints[:, i] for i in range(nGames)]
+    categories = ['Participation', 'Individual', 'Combined', 'Total'] + gameList
+
+    return [
+        PlayerMonthlyPoint(playerName=str(playerName), category=category, points=int(points))
+        for category, column in zip(categories, columns)
+        for playerName, points in zip(playerNames, column)
+    ]
@@ -0,0 +1,169 @@
+import datetime
+from typing import Callable, NamedTuple, Optional
+
+from sqlalchemy import select, delete, func, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .dialects import dialectInsert
+from .models import DailyGameStat, MonthlyRollup, MonthlyPoint, Player
+
+# player -> category -> points, before Individual and Total are derived
+PointTotals = dict[str, dict[str, int]]
+
+DERIVED_CATEGORIES = ("Individual", "Total")
+
+def monthEnd(date: datetime.date) -> datetime.date:
+    nextMonth = date.replace(day=28) + datetime.timedelta(days=4)
+    return nextMonth - datetime.timedelta(days=nextMonth.day)
+
+def rangePeriods(startDate: datetime.date, endDate: datetime.date) -> list[tuple[datetime.date, datetime.date]]:
+    """Split a date range at month boundaries."""
+    periods = []
+    start = startDate
+    while start <= endDate:
+        end = min(monthEnd(start), endDate)
+        periods.append((start, end))
+        start = end + datetime.timedelta(days=1)
+    return periods
+
+def gameKey(games: dict[str, int]) -> str:
+    # adding a game changes who earns participation and combined points on every day
+    return ",".join(f"{name}:{scoreMethod}" for name, scoreMethod in sorted(games.items()))
+
+def statsVersions(session: Session, months: list[datetime.date]) -> dict[datetime.date, int]:
+    """Sum of the months' daily_game_stats versions, it grows with every score write in the month."""
+    versions = {month: 0 for month in months}
+    rows = session.execute(
+        select(DailyGameStat.date, func.sum(DailyGameStat.version).label("version"))
+        .where(DailyGameStat.date >= min(months), DailyGameStat.date <= monthEnd(max(months)))
+        .group_by(DailyGameStat.date)
+    )
+    for row in rows:
+        month = row.date.replace(day=1)
+        if month in versions:
+            versions[month] += row.version
+    return versions
+
+def outdateRollups(session: Session,
+                   startDate: Optional[datetime.date] = None,
+                   endDate: Optional[datetime.date] = None) -> None:
+    statement = update(MonthlyRollup).values(version=MonthlyRollup.version + 1)
+    if startDate:
+        statement = statement.where(MonthlyRollup.month >= startDate.replace(day=1))
+    if endDate:
+        statement = statement.where(MonthlyRollup.month <= endDate)
+    session.execute(statement)
+
+def _loadRollups(session: Session, months: list[datetime.date]) -> dict[datetime.date, PointTotals]:
+    rollups: dict[datetime.date, PointTotals] = {month: {} for month in months}
+    rows = session.execute(
+        select(MonthlyPoint.month, Player.name, MonthlyPoint.category, MonthlyPoint.points)
+        .join(Player, MonthlyPoint.playerId == Player.id)
+        .where(MonthlyPoint.month.in_(months))
+    )
+    for row in rows:
+        rollups[row.month].setdefault(row.name, {})[row.category] = row.points
+    return rollups
+
+def _storeRollups(session: Session,
+                  fresh: dict[datetime.date, PointTotals],
+                  versions: dict[datetime.date, tuple[int, int]],
+                  key: str,
+                  playerIds: dict[str, int]) -> None:
+    # a player added while the points were computed is missing from playerIds, leave that month for the next read
+    fresh = {month: points for month, points in fresh.items() if all(player in playerIds for player in points)}
+    if not fresh:
+        return
+    try:
+        for month in fresh:
+            # the versions read before computing: a write since then has already moved them on
+            version, statsVersion = versions[month]
+            session.execute(
+                dialectInsert(session)(MonthlyRollup)
+                .values(month=month, version=version, rollupVersion=version, statsVersion=statsVersion, gameKey=key)
+                .on_conflict_do_update(index_elements=["month"],
+                                       set_={"rollupVersion": version, "statsVersion": statsVersion, "gameKey": key})
+            )
+        session.execute(delete(MonthlyPoint).where(MonthlyPoint.month.in_(fresh)))
+        rows = [
+            {"month": month, "playerId": playerIds[player], "category": category, "points": value}
+            for month, points in fresh.items()
+            for player, categories in points.items()
+            for category, value in categories.items()
+            if category not in DERIVED_CATEGORIES
+        ]
+        if rows:
+            session.execute(insert(MonthlyPoint.__table__), rows)
+        session.commit()
+    except IntegrityError:
+        # another request stored the same months first
+        session.rollback()
+
+class RangePlan(NamedTuple):
+    """What rangePoints found stored for a range, before anything is computed."""
+    key: str
+    periods: list[tuple[datetime.date, datetime.date]]
+    closedMonths: list[datetime.date]
+    # month -> (rollup version, stats version)
+    versions: dict[datetime.date, tuple[int, int]]
+    stored: dict[datetime.date, PointTotals]
+
+    def missing(self) -> list[tuple[datetime.date, datetime.date]]:
+        return [(start, end) for start, end in self.periods if start not in self.stored]
+
+def planRange(session: Session,
+              games: dict[str, int],
+              startDate: datetime.date,
+              endDate: datetime.date,
+              closedBefore: datetime.date) -> RangePlan:
+    key = gameKey(games)
+    periods = rangePeriods(startDate, endDate)
+    closedMonths = [start for start, end in periods if start.day == 1 and end == monthEnd(start) and end < closedBefore]
+
+    versions: dict[datetime.date, tuple[int, int]] = {}
+    stored: dict[datetime.date, PointTotals] = {}
+    if closedMonths:
+        # versions are read before any points, so a write racing this request outdates what it stores
+        rows = session.execute(
+            select(MonthlyRollup.month, MonthlyRollup.version, MonthlyRollup.rollupVersion,
+                   MonthlyRollup.statsVersion, MonthlyRollup.gameKey)
+            .where(MonthlyRollup.month.in_(closedMonths))
+        ).all()
+        written = statsVersions(session, closedMonths)
+        rollupVersions = {row.month: row.version for row in rows}
+        versions = {month: (rollupVersions.get(month, 0), written[month]) for month in closedMonths}
+        current = [
+            row.month for row in rows
+            if row.rollupVersion == row.version and row.statsVersion == written[row.month] and row.gameKey == key
+        ]
+        if current:
+            stored = _loadRollups(session, current)
+    return RangePlan(key, periods, closedMonths, versions, stored)
+
+def storeRange(session: Session,
+               plan: RangePlan,
+               computed: dict[datetime.date, PointTotals],
+               playerIds: dict[str, int]) -> list[PointTotals]:
+    """The points of every period, stored or computed for each of plan.missing(); stores the closed months computed."""
+    fresh = {start: computed[start] for start in plan.closedMonths if start in computed}
+    if fresh:
+        _storeRollups(session, fresh, plan.versions, plan.key, playerIds)
+    return [plan.stored[start] if start in plan.stored else computed[start] for start, _ in plan.periods]
+
+def rangePoints(session: Session,
+                games: dict[str, int],
+                playerIds: dict[str, int],
+                startDate: datetime.date,
+                endDate: datetime.date,
+                closedBefore: datetime.date,
+                computePoints: Callable[[datetime.date, datetime.date], PointTotals]) -> list[PointTotals]:
+    """Point totals for each month of the range.
+
+    Whole months that ended before closedBefore come from monthly_points while their
+    rollup is current, and are stored after computing otherwise. Partial months at either
+    end of the range and the open month are always computed.
+    """
+    plan = planRange(session, games, startDate, endDate, closedBefore)
+    computed = {start: computePoints(start, end) for start, end in plan.missing()}
+    return storeRange(session, plan, computed, playerIds)
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel, ConfigDict
 from .models import ScoreMethod
 import datetime
@@ -39,6 +40,14 @@ class ScoreCreate(ScoreBase):
     playerName: str
     gameName: str
 
+class BulkScoreConflict(BaseModel):
+    index: int
+    detail: str
+
+class BulkScoreResponse(BaseModel):
+    scores: list[ScorePublic]
+    conflicts: list[BulkScoreConflict]
+
 class AuthRequest(BaseModel):
     password: str
 
@@ -58,4 +67,14 @@ class MonthlyScoreboardResponse(BaseModel):
     categories: list[str]
     games: list[str]
     playerPoints: list[PlayerMonthlyPoint] 
-    
\ No newline at end of file
+
+class StandingsResponse(MonthlyScoreboardResponse):
+    startDate: datetime.date
+    endDate: datetime.date
+    
+class ScoreStreamEvent(BaseModel):
+    date: datetime.date
+    # the rows written, as GET /scores/ returns them
+    scores: list[ScorePublic]
+    # the date's combined scores after the write, null when only month streams are listening
+    combined: Optional[list[ScorePublic]] = None
@@ -0,0 +1,107 @@
+import asyncio
+import datetime
+from typing import AsyncIterator, Literal, Optional
+
+from .metrics import Collected, registry
+from .schemas import ScorePublic, ScoreStreamEvent
+from .serialization import ScoreRow
+
+# "month" streams every write to the monthly board of the date
+StreamScope = Literal["day", "month"]
+
+# sent on connect and after a subscriber fell behind: fetch the board now, diffs follow
+READY = b"event: ready\ndata: {}\n\n"
+# a comment line, keeps proxies from closing an idle stream
+KEEPALIVE = b": keepalive\n\n"
+# seconds without an event before a keepalive is sent
+KEEPALIVE_INTERVAL = 15.0
+# events queued for one subscriber before it is told to refetch instead
+MAX_QUEUED = 64
+
+def formatEvent(event: str, data: str) -> bytes:
+    return f"event: {event}\ndata: {data}\n\n".encode()
+
+class Subscription:
+    def __init__(self, date: datetime.date, month: bool) -> None:
+        self.date = date
+        self.month = month
+        self.queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(MAX_QUEUED)
+
+    def matches(self, date: datetime.date) -> bool:
+        if self.month:
+            # the monthly board of a date covers the month up to it
+            return date.replace(day=1) == self.date.replace(day=1) and date <= self.date
+        return date == self.date
+
+    def send(self, message: Optional[bytes]) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # a slow client skips what it missed and refetches the board
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(READY if message is not None else None)
+
+class ScoreStream:
+    """Pushes committed score writes to the GET /scores/stream subscribers of their date.
+
+    Each write is serialized once however many clients watch its date, and the combined
+    scores are only recomputed when someone watches that day. Subscribers live on the
+    event loop and only see writes made through this process, like dataVersions.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: set[Subscription] = set()
+
+    def subscriberCount(self) -> int:
+        return len(self._subscriptions)
+
+    def wantsCombined(self, date: datetime.date) -> bool:
+        return any(not s.month and s.date == date for s in self._subscriptions)
+
+    def wants(self, date: datetime.date) -> bool:
+        return any(s.matches(date) for s in self._subscriptions)
+
+    def publish(self, date: datetime.date, scores: list[ScorePublic], combined: Optional[list[ScoreRow]] = None) -> None:
+        subscriptions = [s for s in self._subscriptions if s.matches(date)]
+        if not subscriptions:
+            return
+        message = formatEvent("scores", ScoreStreamEvent(date=date, scores=scores, combined=combined).model_dump_json())
+        for subscription in subscriptions:
+            subscription.send(message)
+
+    def close(self) -> None:
+        """End the streams still open when the lifespan shuts down.
+
+        Uvicorn only shuts the lifespan down after open responses finished, so there the
+        streams are ended by --timeout-graceful-shutdown cancelling them (see the Dockerfile);
+        this covers servers and test clients that shut down with streams still open.
+        """
+        for subscription in self._subscriptions:
+            subscription.send(None)
+
+    async def events(self, date: datetime.date, month: bool = False, keepalive: float = KEEPALIVE_INTERVAL) -> AsyncIterator[bytes]:
+        subscription = Subscription(date, month)
+        self._subscriptions.add(subscription)
+        try:
+            yield READY
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    message = KEEPALIVE
+                if message is None:
+                    return
+                yield message
+        finally:
+            self._subscriptions.discard(subscription)
+
+scoreStream = ScoreStream()
+
+registry.register(Collected(
+    "gauge",
+    "crossdoku_score_stream_subscribers",
+    "Open GET /scores/stream connections",
+    (),
+    lambda: {(): scoreStream.subscriberCount()},
+))
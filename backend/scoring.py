@@ -0,0 +1,51 @@
+import time
+from functools import wraps
+from types import ModuleType
+from typing import Callable, TypeVar
+
+from .config import get_settings
+from .metrics import Histogram, registry
+
+F = TypeVar("F", bound=Callable)
+
+SCORING_BACKENDS = ("pandas", "numpy", "sql")
+
+def getScoringBackend() -> ModuleType:
+    """Return the module providing calculateMonthlyPoints.
+
+    Imported on demand so the numpy backend never loads pandas. The sql backend scores
+    months in the database where sql_scoring supports the dialect, pandas covers the rest.
+    Only the full recompute (INCREMENTAL_STANDINGS=false) scores with a backend, by
+    default the standings engine sums the stored per-day T-scores instead.
+    """
+    backend = get_settings().scoring_backend
+    if backend == "numpy":
+        from . import numpy_stats
+        return numpy_stats
+    if backend in ("pandas", "sql"):
+        from . import stats
+        return stats
+    raise ValueError(f"Unknown scoring backend {backend!r}, expected one of {SCORING_BACKENDS}")
+
+scoringLatency = registry.register(Histogram(
+    "crossdoku_scoring_function_duration_seconds",
+    "Time inside each scoring backend function, only for calls made in the API process",
+    ("backend", "function"),
+))
+
+def timedScoring(function: F) -> F:
+    """Record the function's run time under its backend module and name.
+
+    Calls in SCORING_WORKERS processes are timed there and never exported, the pool's
+    own histogram covers them from the caller's side.
+    """
+    labels = (function.__module__.rsplit(".", 1)[-1], function.__name__)
+
+    @wraps(function)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            scoringLatency.observe(time.perf_counter() - start, *labels)
+    return timed
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+from .config import get_settings
+from .metrics import Collected, Histogram, registry
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+T = TypeVar("T")
+
+class ScoringPool:
+    """Runs CPU-bound scoring off the request thread and coalesces identical requests.
+
+    With workers > 0 scoring functions run in a ProcessPoolExecutor so they no longer
+    hold the API process' GIL; with 0 they run in the calling thread (or the loop's
+    default executor for async callers). Independently of that, callers that ask for
+    the same key while a computation is in flight wait for its result instead of
+    starting their own.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self._executor: Optional["ProcessPoolExecutor"] = None
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.computations = 0
+        self.coalesced = 0
+
+    def _getExecutor(self) -> Optional["ProcessPoolExecutor"]:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # multiprocessing is only loaded when workers are configured
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                # spawn, forking a process that already runs server threads is unsafe
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    def _claim(self, key: Hashable) -> tuple[Future, bool]:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            self.computations += 1
+        return future, True
+
+    def _release(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def coalesce(self, key: Hashable, compute: Callable[[], T]) -> T:
+        future, leader = self._claim(key)
+        if not leader:
+            return future.result()
+        try:
+            result = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._release(key, future)
+
+    async def coalesceAsync(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        future, leader = self._claim(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._release(key, future)
+
+    def run(self, function: Callable[..., T], *args: Any) -> T:
+        with poolLatency.time(function.__name__):
+            executor = self._getExecutor()
+            if executor is None:
+                return function(*args)
+            return executor.submit(function, *args).result()
+
+    async def runAsync(self, function: Callable[..., T], *args: Any) -> T:
+        with poolLatency.time(function.__name__):
+            executor = self._getExecutor()
+            if executor is None:
+                return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+            return await asyncio.wrap_future(executor.submit(function, *args))
+
+poolLatency = registry.register(Histogram(
+    "crossdoku_scoring_pool_duration_seconds",
+    "Time a scoring call takes as seen by the request, including waiting for a worker",
+    ("function",),
+))
+
+scoringPool = ScoringPool(get_settings().scoring_workers)
+
+registry.register(Collected(
+    "counter",
+    "crossdoku_scoring_computations_total",
+    "Scoreboard computations, coalesced ones waited for an identical computation in flight",
+    ("result",),
+    lambda: {("computed",): scoringPool.computations, ("coalesced",): scoringPool.coalesced},
+))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+from sqlalchemy.orm import Session
+from sqlalchemy import create_engine, inspect
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+import typer
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.benchmarking import (
+    BENCHMARK_REPEAT,
+    REGRESSION_THRESHOLD,
+    benchmarkMeta,
+    compareToBaseline,
+    formatComparisons,
+    scoringBenchmarks,
+    serviceBenchmarks,
+)
+from backend.models import Base
+from backend.synthetic import loadSyntheticHistory, syntheticHistory
+
+
+
+cli = typer.Typer()
+
+@cli.command()
+def benchmark(
+    db_url: Optional[list[str]] = typer.Option(
+        None,
+        "--db-url",
+        help="Scratch database to benchmark, repeat for several (default: a temporary SQLite file). Its tables are dropped afterwards"
+    ),
+    players: int = typer.Option(20, "--players", help="Synthetic players"),
+    games: int = typer.Option(3, "--games", help="Synthetic games"),
+    years: float = typer.Option(1.0, "--years", help="Years of daily scores"),
+    seed: int = typer.Option(0, "--seed", help="Seed for the synthetic history"),
+    repeat: int = typer.Option(BENCHMARK_REPEAT, "--repeat", help="Timed runs per benchmark"),
+    output: Optional[Path] = typer.Option(
+        None,
+        "--output",
+        help="Write the results as JSON, e.g. to use as a baseline later"
+    ),
+    baseline: Optional[Path] = typer.Option(
+        None,
+        "--baseline",
+        exists=True,
+        dir_okay=False,
+        help="Earlier --output to compare against, exits with 1 on a regression"
+    ),
+    threshold: float = typer.Option(
+        REGRESSION_THRESHOLD,
+        "--threshold",
+        help="Median slowdown over the baseline that counts as a regression (0.2 = 20%)"
+    ),
+):
+    """Time the scoreboard services and scoring backends on a synthetic history."""
+    history = syntheticHistory(players, games, years, seed=seed)
+    results = {"scoring": scoringBenchmarks(history, repeat)}
+    scores = 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        for url in db_url or [f"sqlite:///{Path(directory) / 'benchmark.db'}"]:
+            engine = create_engine(url, pool_pre_ping=True)
+            if inspect(engine).has_table("scores"):
+                raise typer.BadParameter(f"{engine.url.render_as_string()} already has tables, use a scratch database", param_hint="--db-url")
+            Base.metadata.create_all(engine)
+            try:
+                with Session(engine) as session:
+                    scores = loadSyntheticHistory(session, history)
+                results[engine.dialect.name] = serviceBenchmarks(engine, history, repeat)
+            finally:
+                Base.metadata.drop_all(engine)
+                engine.dispose()
+
+    report = {"meta": benchmarkMeta(history, scores, repeat), "results": results}
+    if output:
+        output.write_text(json.dumps(report, indent=2) + "\n")
+
+    baselineReport = json.loads(baseline.read_text()) if baseline else None
+    if baselineReport and baselineReport["meta"]["scores"] != scores:
+        print(f"Warning: the baseline ran on {baselineReport['meta']['scores']} scores, this run on {scores}")
+    comparisons = compareToBaseline(report, baselineReport)
+    print(formatComparisons(comparisons, threshold))
+
+    regressions = [c for c in comparisons if c.isRegression(threshold)]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {threshold:.0%}")
+        raise typer.Exit(1)
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+from sqlalchemy.orm import Session
+from sqlalchemy import create_engine
+import sys
+from pathlib import Path
+from typing import Optional
+import typer
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.importer import IMPORT_BATCH_ROWS, CsvRowError, MissingGameError, importScoresFile
+from backend.models import ScoreMethod
+
+
+
+cli = typer.Typer()
+
+SCORE_METHODS = {"low": ScoreMethod.LOW, "high": ScoreMethod.HIGH}
+
+@cli.command()
+def import_scores(
+    files: list[Path] = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        help="Wide score CSVs: a Date column (M/D/YYYY) then one column per player"
+    ),
+    game: str = typer.Option(
+        ...,
+        "--game",
+        help="Game the scores belong to"
+    ),
+    score_method: Optional[str] = typer.Option(
+        None,
+        "--score-method",
+        help="low or high, needed when the game does not exist yet"
+    ),
+    db_url: str = typer.Option(
+        ...,
+        "--db-url",
+        envvar="DATABASE_URL",
+        help="Database connection URL"
+    ),
+    batch_size: int = typer.Option(
+        IMPORT_BATCH_ROWS,
+        "--batch-size",
+        help="Score rows sent to the database per batch"
+    ),
+):
+    """Bulk import score CSVs, players are created as needed and existing scores are kept.
+
+    Running API workers keep per-day results in memory, restart them after an import.
+    """
+    if score_method is not None and score_method not in SCORE_METHODS:
+        raise typer.BadParameter("must be low or high", param_hint="--score-method")
+
+    engine = create_engine(
+        db_url,
+        pool_pre_ping=True
+    )
+
+    for path in files:
+        with Session(engine) as session:
+            try:
+                result = importScoresFile(
+                    session,
+                    game,
+                    path,
+                    SCORE_METHODS.get(score_method),
+                    batch_size,
+                )
+            except MissingGameError as e:
+                raise typer.BadParameter(str(e), param_hint="--score-method")
+            except CsvRowError as e:
+                # nothing of the file is committed, fix the row and import it again
+                print(f"{path.name}: {e}")
+                raise typer.Exit(1)
+        print(f"{path.name}: read {result.rows} scores, inserted {result.inserted}")
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+import typer
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.import_budget import BUDGET_FILE, checkBudget, importReport, loadBudget
+
+
+
+cli = typer.Typer()
+
+@cli.command()
+def import_time(
+    budget: Path = typer.Option(BUDGET_FILE, "--budget", exists=True, dir_okay=False, help="Budget to check against"),
+    repeat: int = typer.Option(5, "--repeat", help="Cold interpreter starts to take the median of"),
+    output: Optional[Path] = typer.Option(None, "--output", help="Write the measurements as JSON"),
+):
+    """Measure the cold import of the app with python -X importtime, exits with 1 over budget."""
+    limits = loadBudget(budget)
+    report = importReport(limits["module"], repeat, tuple(limits["forbidden"]))
+
+    print(f"import {report['module']}: {report['totalMs']:.0f}ms (budget {limits['totalMs']}ms), "
+          f"{report['appMs']:.0f}ms on top of the framework (budget {limits['appMs']}ms), median of {repeat}")
+    print("slowest modules on top of the framework (self time):")
+    for name, ms in report["slowest"]:
+        print(f"  {ms:8.1f}ms  {name}")
+    if output:
+        output.write_text(json.dumps(report, indent=2) + "\n")
+
+    problems = checkBudget(report, limits)
+    for problem in problems:
+        print(f"Over budget: {problem}")
+    if problems:
+        raise typer.Exit(1)
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+import asyncio
+import datetime
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+import httpx
+import typer
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.loadtest import LoadProfile, formatSummary, inProcessClient, runLoad
+
+
+
+cli = typer.Typer()
+
+DEFAULTS = LoadProfile()
+
+@cli.command()
+def load_test(
+    url: Optional[str] = typer.Option(
+        None,
+        "--url",
+        help="Server to load, e.g. http://localhost:8000 (default: the app in-process, using DATABASE_URL and ENVIRONMENT)"
+    ),
+    users: int = typer.Option(DEFAULTS.users, "--users", help="Players submitting after the release"),
+    ramp: float = typer.Option(DEFAULTS.ramp, "--ramp", help="Seconds over which users arrive, most of them early"),
+    refreshes: int = typer.Option(DEFAULTS.refreshes, "--refreshes", help="Daily board refreshes after each submission"),
+    duplicate_rate: float = typer.Option(DEFAULTS.duplicateRate, "--duplicate-rate", help="Share of submissions sent twice, expecting a 409"),
+    monthly_rate: float = typer.Option(DEFAULTS.monthlyRate, "--monthly-rate", help="Share of users who open the monthly board"),
+    think_time: float = typer.Option(DEFAULTS.thinkTime, "--think-time", help="Mean pause between a user's requests in seconds"),
+    date: Optional[datetime.datetime] = typer.Option(
+        None,
+        "--date",
+        formats=["%Y-%m-%d"],
+        help="Puzzle date to submit for (default: the latest open date). Use one without scores"
+    ),
+    seed: int = typer.Option(DEFAULTS.seed, "--seed", help="Seed for arrivals, pauses and scores"),
+    output: Optional[Path] = typer.Option(None, "--output", help="Write the summary as JSON"),
+):
+    """Replay the burst after a puzzle release: submissions, duplicate submissions and board refreshes.
+
+    Scores and any missing players are written to the target database, point it at a
+    development or scratch database.
+    """
+    if date is None:
+        from backend.main import max_allowed_date
+        puzzleDate = max_allowed_date()
+    else:
+        puzzleDate = date.date()
+    profile = LoadProfile(users, ramp, refreshes, duplicate_rate, monthly_rate, think_time, seed)
+
+    async def run() -> dict:
+        if url:
+            limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+            async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+                return await runLoad(client, profile, puzzleDate)
+        async with inProcessClient() as client:
+            return await runLoad(client, profile, puzzleDate)
+
+    try:
+        summary = asyncio.run(run())
+    except httpx.ConnectError as e:
+        raise typer.BadParameter(f"cannot connect: {e}", param_hint="--url")
+    print(f"{url or 'in-process'}, {users} users, puzzle date {puzzleDate}")
+    print(formatSummary(summary))
+    if output:
+        output.write_text(json.dumps({"target": url or "in-process", "date": puzzleDate.isoformat(), "profile": profile._asdict(), **summary}, indent=2) + "\n")
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+from sqlalchemy.orm import Session
+from sqlalchemy import create_engine
+import datetime
+import sys
+from pathlib import Path
+from typing import Optional
+import typer
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.daily_stats import rebuildDailyStats
+
+
+
+cli = typer.Typer()
+
+@cli.command()
+def rebuild_stats(
+    db_url: str = typer.Option(
+        ...,
+        "--db-url",
+        envvar="DATABASE_URL",
+        help="Database connection URL"
+    ),
+    start: Optional[datetime.datetime] = typer.Option(
+        None,
+        "--start",
+        formats=["%Y-%m-%d"],
+        help="First date to rebuild (default: earliest score)"
+    ),
+    end: Optional[datetime.datetime] = typer.Option(
+        None,
+        "--end",
+        formats=["%Y-%m-%d"],
+        help="Last date to rebuild (default: latest score)"
+    ),
+):
+    """Recompute daily_game_stats and daily_t_scores from the scores table.
+
+    Running API workers keep per-day results in memory, restart them after a rebuild.
+    """
+    engine = create_engine(
+        db_url,
+        pool_pre_ping=True
+    )
+
+    with Session(engine) as session:
+        count = rebuildDailyStats(
+            session,
+            start.date() if start else None,
+            end.date() if end else None,
+        )
+
+    print(f"Rebuilt stats for {count} game days")
+
+if __name__ == "__main__":
+    cli()
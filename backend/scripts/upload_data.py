@@ -1,16 +1,22 @@
 #!/usr/bin/env python3
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, make_url, select
 from sqlalchemy.dialects.postgresql import insert
-import csv
+from itertools import islice
+import hashlib
+import json
 import sys
+import time
 from pathlib import Path
+from typing import Iterator, Optional
 import typer
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from backend.models import Player, Game, Score, player_game_table
-from backend.seeding import SEED_DIR, GAME_CONFIGS, load_scores_from_csv
+from backend.daily_stats import rebuildDailyStats
+from backend.importer import IMPORT_BATCH_ROWS, insertScoreBatches, readWideCsv
+from backend.models import Player, Game, player_game_table
+from backend.seeding import SEED_DIR, GAME_CONFIGS
 
 
 
@@ -18,45 +24,124 @@ cli = typer.Typer()
 
 @cli.command()
 def upload_data(
-    db_url: str = typer.Option(
-        ...,
+    db_url: Optional[str] = typer.Option(
+        None,
         "--db-url",
         envvar="DATABASE_URL",
         help="Database connection URL"
     ),
+    batch_size: int = typer.Option(
+        IMPORT_BATCH_ROWS,
+        "--batch-size",
+        help="Score rows per batch, each batch is committed on its own"
+    ),
+    checkpoint: Path = typer.Option(
+        Path("upload_checkpoint.json"),
+        "--checkpoint",
+        help="Progress file, an interrupted upload resumes from it"
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Parse the seed data and report what would be uploaded without connecting"
+    ),
 ):
-    if not db_url.startswith("postgresql"):
+    key = checkpoint_key(db_url)
+    progress = load_checkpoint(checkpoint, key)
+
+    if dry_run:
+        report_dry_run(batch_size, progress)
+        return
+
+    if not db_url or not db_url.startswith("postgresql"):
         print("Only run data upload to the production database")
         return
-    
+
     engine = create_engine(
         db_url,
         pool_pre_ping=True
     )
-    
+
     with Session(engine) as session:
         game_ids = upload_games(session)
 
     with Session(engine) as session:
         player_ids = upload_players(session)
-    
+
     with Session(engine) as session:
-        upload_scores(session, game_ids, player_ids)
+        upload_scores(session, game_ids, player_ids, batch_size, checkpoint, key, progress)
 
     with Session(engine) as session:
         upload_player_game_links(session, game_ids, player_ids)
-    
+
+    with Session(engine) as session:
+        rebuildDailyStats(session)
+
+    # a finished upload starts from scratch next time
+    checkpoint.unlink(missing_ok=True)
     print("Completed Data Upload")
 
 
-def upload_games(session: Session) -> dict[str,int]:
+def checkpoint_key(db_url: Optional[str]) -> str:
+    """Identify the upload: the target database and the contents of the seed CSVs.
+
+    Progress is a row count per file, only meaningful for the same database and the same files.
+    """
+    digest = hashlib.sha256()
+    # without the password, so the file never holds it and a rotated password keeps the progress
+    digest.update(make_url(db_url).set(password=None).render_as_string().encode() if db_url else b"")
     for config in GAME_CONFIGS:
-        stmt = insert(Game).values(
-            name=config["name"],
-            scoreMethod=config["scoreMethod"]
+        digest.update(config["csv"].encode())
+        digest.update((SEED_DIR / config["csv"]).read_bytes())
+    return digest.hexdigest()
+
+def load_checkpoint(checkpoint: Path, key: str) -> dict[str, int]:
+    if checkpoint.exists():
+        saved = json.loads(checkpoint.read_text())
+        if saved.get("key") != key:
+            print(f"Ignoring {checkpoint}: it was written for another database or other seed files")
+            return {}
+        progress = saved["progress"]
+        print(f"Resuming from {checkpoint}: " + ", ".join(f"{game} {rows} rows" for game, rows in progress.items()))
+        return progress
+    return {}
+
+def save_checkpoint(checkpoint: Path, key: str, progress: dict[str, int]):
+    # replace in one step so an interruption never leaves a half written file
+    partial = checkpoint.with_name(checkpoint.name + ".tmp")
+    partial.write_text(json.dumps({"key": key, "progress": progress}))
+    partial.replace(checkpoint)
+
+def read_game_csv_players(config: dict) -> list[str]:
+    with open(SEED_DIR / config["csv"], newline="") as f:
+        return readWideCsv(f).players
+
+def read_game_csv_rows(config: dict, skip: int = 0) -> Iterator[tuple]:
+    with open(SEED_DIR / config["csv"], newline="") as f:
+        yield from islice(readWideCsv(f).rows, skip, None)
+
+def batched(rows: Iterator, batch_size: int) -> Iterator[list]:
+    return iter(lambda: list(islice(rows, batch_size)), [])
+
+def report_dry_run(batch_size: int, progress: dict[str, int]):
+    start = time.perf_counter()
+    for config in GAME_CONFIGS:
+        total = sum(1 for _ in read_game_csv_rows(config))
+        done = min(progress.get(config["name"], 0), total)
+        remaining = total - done
+        print(
+            f"{config['name']}: {len(read_game_csv_players(config))} players, {total} scores, "
+            f"{done} already uploaded, {remaining} to upload in {-(-remaining // batch_size)} batches"
         )
-        stmt = stmt.on_conflict_do_nothing(index_elements=["name"])
-        session.execute(stmt)
+    print(f"Parsed in {time.perf_counter() - start:.2f}s")
+
+def upload_games(session: Session) -> dict[str,int]:
+    stmt = insert(Game).values([
+        {"name": config["name"], "scoreMethod": config["scoreMethod"]}
+        for config in GAME_CONFIGS
+    ])
+    stmt = stmt.on_conflict_do_nothing(index_elements=["name"])
+    session.execute(stmt)
     session.commit()
     return {g.name: g.id for g in session.scalars(select(Game))}
 
@@ -64,52 +149,55 @@ def upload_players(session: Session) -> dict [str,int]:
     # get player names
     all_player_names = set()
     for config in GAME_CONFIGS:
-        csv_path = SEED_DIR / config["csv"]
-        with open(csv_path) as f:
-            reader = csv.reader(f)
-            header = next(reader)
-            all_player_names.update(header[1:])
+        all_player_names.update(read_game_csv_players(config))
 
     # create players
-    for name in all_player_names:
-        stmt = insert(Player).values(
-            name=name
-        )
-        stmt = stmt.on_conflict_do_nothing(index_elements=["name"])
-        session.execute(stmt)
+    stmt = insert(Player).values([{"name": name} for name in sorted(all_player_names)])
+    stmt = stmt.on_conflict_do_nothing(index_elements=["name"])
+    session.execute(stmt)
     session.commit()
     return {p.name: p.id for p in session.scalars(select(Player))}
 
-def upload_scores(session: Session, game_ids: dict[str,int], player_ids: dict[str,int]):
+def upload_scores(session: Session,
+                  game_ids: dict[str,int],
+                  player_ids: dict[str,int],
+                  batch_size: int,
+                  checkpoint: Path,
+                  key: str,
+                  progress: dict[str, int]):
     for config in GAME_CONFIGS:
-        score_rows = [
-            {
-                "playerId": player_ids[row["player_name"]],
-                "gameId": game_ids[config["name"]],
-                "date": row["date"],
-                "score": row["score"],
-            }
-            for row in load_scores_from_csv(SEED_DIR / config["csv"])
-        ]
-        stmt = insert(Score).values(score_rows)
-        stmt = stmt.on_conflict_do_nothing(constraint="uq_player_game_date")
-        session.execute(stmt)
-    session.commit()
+        name = config["name"]
+        game_id = game_ids[name]
+        done = progress.get(name, 0)
+        start = time.perf_counter()
+        uploaded = 0
+        inserted = 0
+
+        rows = (
+            {"playerId": player_ids[player_name], "gameId": game_id, "date": date, "score": score}
+            for date, player_name, score in read_game_csv_rows(config, skip=done)
+        )
+        for batch in batched(rows, batch_size):
+            inserted += insertScoreBatches(session, [batch])
+            session.commit()
+            uploaded += len(batch)
+            progress[name] = done + uploaded
+            save_checkpoint(checkpoint, key, progress)
+            rate = uploaded / max(time.perf_counter() - start, 1e-9)
+            print(f"{name}: {done + uploaded} rows uploaded ({inserted} new, {rate:.0f} rows/s)")
+
+        print(f"{name}: done, {uploaded} rows sent in {time.perf_counter() - start:.2f}s")
 
 def upload_player_game_links(session: Session, game_ids: dict[str,int], player_ids: dict[str,int]):
-    for config in GAME_CONFIGS:
-        csv_path = SEED_DIR / config["csv"]
-        with open(csv_path) as f:
-            reader = csv.reader(f)
-            header = next(reader)
-            game_player_names = header[1:]
-
-        game_id = game_ids[config["name"]]
-        for name in game_player_names:
-            stmt = insert(player_game_table).values(game_id=game_id, player_id=player_ids[name])
-            stmt = stmt.on_conflict_do_nothing(index_elements=["player_id", "game_id"])
-            session.execute(stmt)
+    links = [
+        {"game_id": game_ids[config["name"]], "player_id": player_ids[name]}
+        for config in GAME_CONFIGS
+        for name in read_game_csv_players(config)
+    ]
+    stmt = insert(player_game_table).values(links)
+    stmt = stmt.on_conflict_do_nothing(index_elements=["player_id", "game_id"])
+    session.execute(stmt)
     session.commit()
 
 if __name__ == "__main__":
-    cli()
\ No newline at end of file
+    cli()
@@ -0,0 +1,26 @@
+import datetime
+
+from pydantic import TypeAdapter
+# pydantic only accepts typing.TypedDict from python 3.12
+from typing_extensions import TypedDict
+
+class ScoreRow(TypedDict):
+    """A ScorePublic as a plain dict, built straight from a result row.
+
+    Keys are serialized in the order the dict was built in, so rows are built in the
+    field order of ScorePublic: date, score, playerName, gameName.
+    """
+    date: datetime.date
+    score: int
+    playerName: str
+    gameName: str
+
+# built once, validating and serializing a list through it never creates a model per row
+scoreRowsAdapter = TypeAdapter(list[ScoreRow])
+
+def scoreRow(date: datetime.date, score: int, playerName: str, gameName: str) -> ScoreRow:
+    return {"date": date, "score": score, "playerName": playerName, "gameName": gameName}
+
+def scoreRowsJson(rows: list[ScoreRow]) -> bytes:
+    """The same bytes FastAPI writes for a list[ScorePublic] response_model, without the per-row validation."""
+    return scoreRowsAdapter.dump_json(rows)
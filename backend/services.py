@@ -1,21 +1,35 @@
-from sqlalchemy import select
+from sqlalchemy import select, update, func, and_, tuple_
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
+import base64
+import binascii
 import datetime
-from typing import Optional
+import json
+from typing import NamedTuple, Optional
 
-from .models import Player, Game, Score, ScoreMethod
-from .schemas import DailyScoreboardResponse, MonthlyScoreboardResponse, GamePublic, PlayerPublic, ScoreCreate, ScorePublic, PlayerCreate
-from .stats import calculateDailyCombinedScore, calculateMonthlyPoints
-from .exceptions import DuplicateScoreException, InvalidUpdateException, DuplicatePlayerException
+from .dialects import dialectInsert
+from .models import Player, Game, Score, ScoreMethod, DailyTScore
+from .schemas import BulkScoreConflict, BulkScoreResponse, DailyScoreboardResponse, MonthlyScoreboardResponse, StandingsResponse, GamePublic, PlayerMonthlyPoint, PlayerPublic, ScoreCreate, ScorePublic, PlayerCreate
+from .scoring import getScoringBackend
+from .serialization import ScoreRow, scoreRow
+from .sql_scoring import sqlMonthlyPoints, sqlScoringAvailable
+from .daily_stats import refreshDailyStats
+from .standings import getStandingsEngine, sumDayPoints, sumMonthlyPoints
+from .rollups import DERIVED_CATEGORIES, PointTotals, rangePoints
+from .lookups import GameRef, getNameLookup
+from .config import get_settings
+from .scoring_pool import scoringPool
+from .versions import dataVersions
+from .exceptions import DuplicateScoreException, InvalidCursorException, InvalidScoreException, InvalidUpdateException, DuplicatePlayerException
 
 
 def getAllPlayers(session: Session)->list[Player]:
     return list(session.scalars(select(Player)).all())
 
 def addPlayer(session: Session, player: PlayerCreate)-> Player:
-    if session.scalars(select(Player).where(Player.name == player.name)).one_or_none():
+    lookup = getNameLookup(session)
+    if lookup.hasPlayer(player.name):
         raise DuplicatePlayerException(player.name)
     
     try:
@@ -23,74 +37,154 @@ def addPlayer(session: Session, player: PlayerCreate)-> Player:
         session.add(player_new)
         session.commit()
         session.refresh(player_new)
+        lookup.addPlayer(player_new.name, player_new.id)
         return player_new
     except IntegrityError:
         session.rollback()
         raise DuplicatePlayerException(player.name)
 
-def addNewScore(session: Session, score: ScoreCreate):
-    player = session.scalars(select(Player).where(Player.name == score.playerName)).one_or_none()
-    if not player:
+def _checkScore(score: ScoreCreate, index: Optional[int] = None) -> None:
+    # min_score_check would reject it, as an IntegrityError the write paths can't tell from a duplicate
+    if score.score < 0:
+        raise InvalidScoreException(score.score, index)
+
+def _resolveNames(session: Session, score: ScoreCreate) -> tuple[int, GameRef]:
+    lookup = getNameLookup(session)
+    playerId = lookup.playerId(session, score.playerName)
+    if playerId is None:
         raise HTTPException(404, "Player Not Found")
 
-    game = session.scalars(select(Game).where(Game.name == score.gameName)).one_or_none()
-    if not game:
+    game = lookup.game(session, score.gameName)
+    if game is None:
         raise HTTPException(404, "Game not found")
+    return playerId, game
 
-    # check for duplicate score
-    existing = session.scalars(select(Score).where(Score.playerId == player.id,
-                                                Score.gameId == game.id,
-                                                Score.date == score.date)
-                                                ).one_or_none()
-    if existing:
-        raise DuplicateScoreException(score.playerName,score.gameName,score.date.strftime("%Y-%m-%d"),existing.score)
-    
+def _scoreWritten(session: Session, score: ScoreCreate, game: GameRef):
+    refreshDailyStats(session, score.date, game.id, game.scoreMethod)
+    session.commit()
+    getStandingsEngine(session).invalidate(score.date, score.gameName)
+    return {
+        "date": score.date,
+        "playerName": score.playerName,
+        "gameName": score.gameName,
+        "score": score.score
+    }
+
+def _scoreInsert(session: Session, rows: list[dict], upsert: bool = False):
+    statement = dialectInsert(session)(Score).values(rows)
+    conflictColumns = [Score.playerId, Score.gameId, Score.date]
+    if upsert:
+        return statement.on_conflict_do_update(index_elements=conflictColumns, set_={"score": statement.excluded.score})
+    return statement.on_conflict_do_nothing(index_elements=conflictColumns)
+
+def addNewScore(session: Session, score: ScoreCreate):
+    _checkScore(score)
+    playerId, game = _resolveNames(session, score)
+
+    # a duplicate is skipped by the database instead of checked for first
+    statement = _scoreInsert(
+        session, [{"date": score.date, "playerId": playerId, "gameId": game.id, "score": score.score}]
+    ).returning(Score.id)
     try:
-        db_score = Score(
-            date=score.date,
-            playerId=player.id,
-            gameId=game.id,
-            score=score.score)
-        session.add(db_score)
-        session.commit()
-        session.refresh(db_score)
-        return {
-            "date": db_score.date,
-            "playerName": player.name,
-            "gameName": game.name,
-            "score": db_score.score
-        }
+        if session.scalar(statement) is None:
+            existing = session.scalar(select(Score.score).where(Score.playerId == playerId,
+                                                                Score.gameId == game.id,
+                                                                Score.date == score.date))
+            session.rollback()
+            raise DuplicateScoreException(score.playerName,score.gameName,score.date.strftime("%Y-%m-%d"),existing)
+        return _scoreWritten(session, score, game)
     except IntegrityError:
         session.rollback()
         raise DuplicateScoreException(score.playerName,score.gameName,score.date.strftime("%Y-%m-%d"),score.score)
     
 def updateScore(session: Session, score: ScoreCreate):
-    player = session.scalars(select(Player).where(Player.name == score.playerName)).one_or_none()
-    if not player:
-        raise HTTPException(404, "Player Not Found")
-
-    game = session.scalars(select(Game).where(Game.name == score.gameName)).one_or_none()
-    if not game:
-        raise HTTPException(404, "Game not found")
+    _checkScore(score)
+    playerId, game = _resolveNames(session, score)
 
-    # check for duplicate score
-    existing = session.scalars(select(Score).where(Score.playerId == player.id,
-                                                Score.gameId == game.id,
-                                                Score.date == score.date)
-                                                ).one_or_none()
-    if existing is None:
+    updated = session.scalar(
+        update(Score)
+        .where(Score.playerId == playerId,
+               Score.gameId == game.id,
+               Score.date == score.date)
+        .values(score=score.score)
+        .returning(Score.id)
+        .execution_options(synchronize_session=False)
+    )
+    if updated is None:
+        session.rollback()
         raise InvalidUpdateException()
+    return _scoreWritten(session, score, game)
+
+# rows per INSERT, keeps the bound parameters well under SQLite's limit
+BULK_INSERT_ROWS = 500
+
+def addScores(session: Session, scores: list[ScoreCreate], upsert: bool = False) -> BulkScoreResponse:
+    """Write many scores in one transaction.
+
+    Without upsert a score that already exists is left alone and reported as a conflict,
+    with upsert it is overwritten like updateScore. An unknown player or game, or a
+    negative score, fails the whole request before anything is written.
+    """
+    rows: dict[tuple[int, int, datetime.date], tuple[int, ScoreCreate]] = {}
+    repeated: list[tuple[int, ScoreCreate, tuple[int, int, datetime.date]]] = []
+    conflicts: list[BulkScoreConflict] = []
+    games: dict[int, tuple[str, GameRef]] = {}
+    for index, score in enumerate(scores):
+        _checkScore(score, index)
+        playerId, game = _resolveNames(session, score)
+        games[game.id] = (score.gameName, game)
+        key = (playerId, game.id, score.date)
+        if key in rows and not upsert:
+            # repeated within the request, the first one is written unless the score exists,
+            # the repeat conflicts with whichever of them is stored
+            repeated.append((index, score, key))
+            continue
+        rows[key] = (index, score)
 
-    existing.score = score.score
-    session.add(existing)
+    written: set[tuple[int, int, datetime.date]] = set()
+    values = [
+        {"date": date, "playerId": playerId, "gameId": gameId, "score": score.score}
+        for (playerId, gameId, date), (_, score) in rows.items()
+    ]
+    for start in range(0, len(values), BULK_INSERT_ROWS):
+        statement = _scoreInsert(session, values[start:start + BULK_INSERT_ROWS], upsert)
+        written.update(session.execute(statement.returning(Score.playerId, Score.gameId, Score.date)).tuples())
+
+    skipped = [key for key in rows if key not in written]
+    stored = {key: score.score for key, (_, score) in rows.items() if key in written}
+    if skipped:
+        existing = {
+            (row.playerId, row.gameId, row.date): row.score
+            for row in session.execute(
+                select(Score.playerId, Score.gameId, Score.date, Score.score)
+                .where(Score.date.in_({date for _, _, date in skipped}),
+                       Score.playerId.in_({playerId for playerId, _, _ in skipped}))
+            )
+        }
+        conflicts.extend(_conflict(rows[key][0], rows[key][1], existing.get(key)) for key in skipped)
+        stored.update((key, existing.get(key)) for key in skipped)
+    conflicts.extend(_conflict(index, score, stored[key]) for index, score, key in repeated)
+
+    days = {(date, gameId) for _, gameId, date in written}
+    for date, gameId in sorted(days):
+        refreshDailyStats(session, date, gameId, games[gameId][1].scoreMethod)
     session.commit()
-    session.refresh(existing)
-    return {
-        "date": existing.date,
-            "playerName": player.name,
-            "gameName": game.name,
-            "score": existing.score
-    }
+    standings = getStandingsEngine(session)
+    for date, gameId in days:
+        standings.invalidate(date, games[gameId][0])
+
+    return BulkScoreResponse(
+        scores=[
+            ScorePublic.model_validate(score)
+            for key, (_, score) in sorted(rows.items(), key=lambda item: item[1][0])
+            if key in written
+        ],
+        conflicts=sorted(conflicts, key=lambda conflict: conflict.index)
+    )
+
+def _conflict(index: int, score: ScoreCreate, existingScore: Optional[int]) -> BulkScoreConflict:
+    detail = DuplicateScoreException(score.playerName, score.gameName, score.date.strftime("%Y-%m-%d"), existingScore).detail
+    return BulkScoreConflict(index=index, detail=detail)
 
 def getGamesForPlayer(session: Session, playerName: str) -> list[Game]:
     player = session.scalars(select(Player).where(Player.name == playerName).options(selectinload(Player.games))).one_or_none()
@@ -99,12 +193,10 @@ def getGamesForPlayer(session: Session, playerName: str) -> list[Game]:
 
     return player.games
 
-def getDailyScores(
-        session: Session,
-        startDate: datetime.date,
-        endDate: Optional[datetime.date] = None,
-        playerName: Optional[str] = None,
-        gameName: Optional[str] = None,) -> list[ScorePublic]:
+def dailyScoresQuery(startDate: datetime.date,
+                     endDate: Optional[datetime.date] = None,
+                     playerName: Optional[str] = None,
+                     gameName: Optional[str] = None):
     query = (
         select(
             Score.date,
@@ -123,56 +215,166 @@ def getDailyScores(
         query = query.where(Player.name == playerName)
     if gameName:
         query = query.where(Game.name == gameName)
-    results = session.execute(query).mappings().all()
-    return [ScorePublic.model_validate(result) for result in results]
+    return query
+
+# keyset order of GET /scores/, the leading columns of ix_scores_date_game
+SCORES_PAGE_ORDER = (Score.date, Score.gameId, Score.playerId)
+
+def getDailyScores(
+        session: Session,
+        startDate: datetime.date,
+        endDate: Optional[datetime.date] = None,
+        playerName: Optional[str] = None,
+        gameName: Optional[str] = None,) -> list[ScorePublic]:
+    return [ScorePublic.model_validate(row) for row in getDailyScoreRows(session, startDate, endDate, playerName, gameName)]
+
+def getDailyScoreRows(
+        session: Session,
+        startDate: datetime.date,
+        endDate: Optional[datetime.date] = None,
+        playerName: Optional[str] = None,
+        gameName: Optional[str] = None,) -> list[ScoreRow]:
+    query = dailyScoresQuery(startDate, endDate, playerName, gameName).order_by(*SCORES_PAGE_ORDER)
+    return [scoreRow(date, score, player, game) for date, game, player, score in session.execute(query)]
+
+class ScoresPage(NamedTuple):
+    scores: list[ScorePublic]
+    nextCursor: Optional[str]
+
+class ScoreRowsPage(NamedTuple):
+    rows: list[ScoreRow]
+    nextCursor: Optional[str]
+
+def encodeScoresCursor(date: datetime.date, gameId: int, playerId: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([date.isoformat(), gameId, playerId]).encode()).decode()
+
+def decodeScoresCursor(cursor: str) -> tuple[datetime.date, int, int]:
+    try:
+        date, gameId, playerId = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.date.fromisoformat(date), int(gameId), int(playerId)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise InvalidCursorException()
+
+def getDailyScoresPage(
+        session: Session,
+        startDate: datetime.date,
+        endDate: Optional[datetime.date] = None,
+        playerName: Optional[str] = None,
+        gameName: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None) -> ScoresPage:
+    page = getDailyScoreRowsPage(session, startDate, endDate, playerName, gameName, limit, cursor)
+    return ScoresPage(scores=[ScorePublic.model_validate(row) for row in page.rows], nextCursor=page.nextCursor)
+
+def getDailyScoreRowsPage(
+        session: Session,
+        startDate: datetime.date,
+        endDate: Optional[datetime.date] = None,
+        playerName: Optional[str] = None,
+        gameName: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None) -> ScoreRowsPage:
+    # seeks past the last row of the previous page, so every page costs the same as the first
+    query = (
+        dailyScoresQuery(startDate, endDate, playerName, gameName)
+        .add_columns(Score.gameId, Score.playerId)
+        .order_by(*SCORES_PAGE_ORDER)
+        .limit(limit + 1)
+    )
+    if cursor:
+        query = query.where(tuple_(*SCORES_PAGE_ORDER) > tuple_(*decodeScoresCursor(cursor)))
+    rows = session.execute(query).all()
+
+    nextCursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        nextCursor = encodeScoresCursor(rows[-1].date, rows[-1].gameId, rows[-1].playerId)
+    return ScoreRowsPage(
+        rows=[scoreRow(r.date, r.score, r.playerName, r.gameName) for r in rows],
+        nextCursor=nextCursor
+    )
 
 def getCombinedScores(
         session: Session,
         date: datetime.date
     ) -> list[ScorePublic]:
-    # get games info for t_score multiplier
-    gameRows = session.scalars(select(Game))
-    gamesDict = {game.name: game.scoreMethod for game in gameRows}
+    return [ScorePublic.model_validate(row) for row in getCombinedScoreRows(session, date)]
 
-    # get scores for day
+def getCombinedScoreRows(
+        session: Session,
+        date: datetime.date
+    ) -> list[ScoreRow]:
+    # sum the stored t-scores of players who participated in every game
+    gameCount = select(func.count(Game.id)).scalar_subquery()
     query = (
         select(
-            Game.name.label("gameName"),
             Player.name.label("playerName"),
-            Score.score
+            func.sum(DailyTScore.tScore).label("tScore")
         )
-        .select_from(Score)
-        .join(Game, Score.gameId == Game.id)
-        .join(Player, Score.playerId == Player.id)
+        .select_from(DailyTScore)
+        .join(Player, DailyTScore.playerId == Player.id)
+        .where(DailyTScore.date == date)
+        .group_by(Player.name)
+        .having(func.count(DailyTScore.gameId) == gameCount)
+        .order_by(Player.name)
     )
-    query = query.where(Score.date == date)
-    scoreRows = session.execute(query).mappings().all()
-
-    if not scoreRows:
-        return []
-    
-    scores = [{"gameName":r.gameName, "playerName": r.playerName, "score": r.score} for r in scoreRows]
-    return calculateDailyCombinedScore(gamesDict,scores,date)
+    return [scoreRow(date, int(round(row.tScore)), row.playerName, "Combined") for row in session.execute(query)]
 
-def getScoreboardDaily(session: Session,
-                       date: datetime.date) -> DailyScoreboardResponse:
-    players = session.scalars(select(Player)).all()
-    games = session.scalars(select(Game)).all()
+def dailyScoreboardQuery(date: datetime.date):
+    # every player with their scores and stored t-scores for the day in a single round trip,
+    # players without a score come back as one row of nulls
+    return (
+        select(
+            Player.id.label("playerId"),
+            Player.name.label("playerName"),
+            Score.id.label("scoreId"),
+            Score.gameId,
+            Score.score,
+            DailyTScore.tScore
+        )
+        .select_from(Player)
+        .outerjoin(Score, and_(Score.playerId == Player.id, Score.date == date))
+        .outerjoin(DailyTScore, and_(DailyTScore.date == date,
+                                     DailyTScore.gameId == Score.gameId,
+                                     DailyTScore.playerId == Player.id))
+        .order_by(Player.id, Score.id)
+    )
 
+def buildDailyScoreboard(date: datetime.date, games, rows) -> DailyScoreboardResponse:
     gamesPublic = [GamePublic.model_validate(game) for game in games]
+    gameNames = {game.id: game.name for game in games}
 
-    gameScores = getDailyScores(session,startDate=date,endDate=date)
-    sortedGameScores = []
+    players: dict[int, PlayerPublic] = {}
+    scoresByGame: dict[int, list[tuple[int, ScorePublic]]] = {game.id: [] for game in games}
+    tScoresByPlayer: dict[str, list[float]] = {}
+    for row in rows:
+        if row.playerId not in players:
+            players[row.playerId] = PlayerPublic(id=row.playerId, name=row.playerName)
+        if row.scoreId is None:
+            continue
+        scoresByGame[row.gameId].append((
+            row.scoreId,
+            ScorePublic(date=date, playerName=row.playerName, gameName=gameNames[row.gameId], score=row.score)
+        ))
+        if row.tScore is not None:
+            tScoresByPlayer.setdefault(row.playerName, []).append(row.tScore)
 
+    sortedGameScores = []
     for game in gamesPublic:
-        filteredScores = [score for score in gameScores if score.gameName == game.name]
+        # submission order first so ties keep it, then rank by score
+        gameScores = [score for _, score in sorted(scoresByGame[game.id], key=lambda s: s[0])]
         order = False
         if game.scoreMethod == ScoreMethod.HIGH:
             order = True
-        sortedScores = sorted(filteredScores, key= lambda s: s.score, reverse=order)
+        sortedScores = sorted(gameScores, key= lambda s: s.score, reverse=order)
         sortedGameScores.extend(sortedScores)
 
-    combinedScores = getCombinedScores(session, date=date)
+    # players who participated in all games, by name to match getCombinedScores
+    combinedScores = [
+        ScorePublic(date=date, playerName=playerName, gameName="Combined", score=int(round(sum(tScores))))
+        for playerName, tScores in sorted(tScoresByPlayer.items())
+        if len(tScores) == len(games)
+    ]
     sortedCombined = sorted(combinedScores, key= lambda s: s.score, reverse=True)
 
     gamesPublic.append(
@@ -185,23 +387,17 @@ def getScoreboardDaily(session: Session,
 
     return DailyScoreboardResponse(
         date=date,
-        players=[PlayerPublic.model_validate(player) for player in players],
+        players=list(players.values()),
         games=gamesPublic,
         scores=(sortedCombined + sortedGameScores)
     )
 
-def getScoreboardMonthly(session:Session,
-                         date: datetime.date) -> MonthlyScoreboardResponse:
-    players = session.scalars(select(Player)).all()
+def getScoreboardDaily(session: Session,
+                       date: datetime.date) -> DailyScoreboardResponse:
     games = session.scalars(select(Game)).all()
+    return buildDailyScoreboard(date, games, session.execute(dailyScoreboardQuery(date)))
 
-    # Build categories list: participation, individual games, combined, total
-    categories = ['Participation', 'Individual', 'Combined', 'Total']
-    gameNames = [game.name for game in games]
-    gamesDict = {game.name: game.scoreMethod for game in games}
-
-    startDate = date.replace(day=1)
-    endDate = date
+def monthScoresQuery(startDate: datetime.date, endDate: datetime.date):
     query = (
         select(
             Score.date,
@@ -213,21 +409,104 @@ def getScoreboardMonthly(session:Session,
         .join(Game, Score.gameId == Game.id)
         .join(Player, Score.playerId == Player.id)
     )
-    query = query.where(Score.date >= startDate).where(Score.date <= endDate)
-    scoreRows = session.execute(query).mappings().all()
+    return query.where(Score.date >= startDate).where(Score.date <= endDate)
+
+def monthlyScoreboardKey(date: datetime.date) -> tuple:
+    # identical requests share one computation while it is in flight, a score write in
+    # the month (or a new player) changes the key so later requests never join a stale one
+    return ("monthly", date, dataVersions.scoresVersion(date.replace(day=1), date), dataVersions.playersVersion())
+
+def getScoreboardMonthly(session:Session,
+                         date: datetime.date) -> MonthlyScoreboardResponse:
+    return scoringPool.coalesce(monthlyScoreboardKey(date), lambda: _computeScoreboardMonthly(session, date))
+
+def _computeScoreboardMonthly(session:Session,
+                              date: datetime.date) -> MonthlyScoreboardResponse:
+    players = session.scalars(select(Player)).all()
+    games = session.scalars(select(Game)).all()
+
+    gamesDict = {game.name: game.scoreMethod for game in games}
 
+    startDate = date.replace(day=1)
+    endDate = date
+    if get_settings().incremental_standings:
+        playerPoints = getStandingsEngine(session).monthlyPoints(session, gamesDict, startDate, endDate)
+        if not playerPoints:
+            raise HTTPException(404, "No scores found for this month")
+    else:
+        playerPoints = computeMonthlyPoints(session, gamesDict, startDate, endDate)
+        if not playerPoints:
+            raise HTTPException(404, "No scores found for this month")
+    return buildMonthlyScoreboard(players, games, playerPoints)
+
+def computeMonthlyPoints(session: Session,
+                         games: dict[str, int],
+                         startDate: datetime.date,
+                         endDate: datetime.date) -> list[PlayerMonthlyPoint]:
+    """calculateMonthlyPoints over every score of the range, [] without scores."""
+    if sqlScoringAvailable(session):
+        # window functions in the database, only the per-player totals come back
+        return sqlMonthlyPoints(session, games, startDate, endDate)
+    scoreRows = session.execute(monthScoresQuery(startDate, endDate)).mappings().all()
     if not scoreRows:
-        raise HTTPException(404, "No scores found for this month")
+        return []
+    return scoringPool.run(getScoringBackend().calculateMonthlyPoints, games, monthScoreEntries(scoreRows))
 
-    scores = [{"date":r.date, "gameName":r.gameName, "playerName": r.playerName, "score": r.score} for r in scoreRows]
-    playerPoints = calculateMonthlyPoints(gamesDict,scores)
+def standingsKey(startDate: datetime.date, endDate: datetime.date) -> tuple:
+    return ("standings", startDate, endDate, dataVersions.scoresVersion(startDate, endDate), dataVersions.playersVersion())
+
+def getStandings(session: Session,
+                 startDate: datetime.date,
+                 endDate: datetime.date) -> StandingsResponse:
+    return scoringPool.coalesce(standingsKey(startDate, endDate), lambda: computeStandings(session, startDate, endDate))
+
+def computeStandings(session: Session,
+                     startDate: datetime.date,
+                     endDate: datetime.date) -> StandingsResponse:
+    """Monthly scoreboard points summed over any range, closed months come from stored rollups."""
+    # plain rows, storing rollups commits and would expire ORM objects
+    players = session.execute(select(Player.id, Player.name)).all()
+    games = session.execute(select(Game.id, Game.name, Game.scoreMethod)).all()
+    gamesDict = {game.name: game.scoreMethod for game in games}
+
+    def periodPoints(periodStart: datetime.date, periodEnd: datetime.date) -> PointTotals:
+        if get_settings().incremental_standings:
+            return sumDayPoints(getStandingsEngine(session).dayPoints(session, gamesDict, periodStart, periodEnd))
+        return periodTotals(computeMonthlyPoints(session, gamesDict, periodStart, periodEnd))
+
+    periods = rangePoints(
+        session,
+        gamesDict,
+        {player.name: player.id for player in players},
+        startDate,
+        endDate,
+        datetime.date.today(),
+        periodPoints,
+    )
+    return buildStandings(players, games, startDate, endDate, periods)
+
+def periodTotals(playerPoints: list[PlayerMonthlyPoint]) -> PointTotals:
+    totals: PointTotals = {}
+    for point in playerPoints:
+        if point.category not in DERIVED_CATEGORIES:
+            totals.setdefault(point.playerName, {})[point.category] = point.points
+    return totals
+
+def buildStandings(players, games, startDate: datetime.date, endDate: datetime.date, periods: list[PointTotals]) -> StandingsResponse:
+    if not any(periods):
+        raise HTTPException(404, "No scores found for this range")
+    board = buildMonthlyScoreboard(players, games, sumMonthlyPoints(periods, [game.name for game in games]))
+    return StandingsResponse(startDate=startDate, endDate=endDate, **board.model_dump())
+
+def monthScoreEntries(scoreRows) -> list[dict]:
+    return [{"date":r.date, "gameName":r.gameName, "playerName": r.playerName, "score": r.score} for r in scoreRows]
+
+def buildMonthlyScoreboard(players, games, playerPoints) -> MonthlyScoreboardResponse:
+    # Build categories list: participation, individual games, combined, total
+    categories = ['Participation', 'Individual', 'Combined', 'Total']
     return MonthlyScoreboardResponse(
         players=[PlayerPublic.model_validate(player) for player in players],
         categories=categories,
-        games=gameNames,
+        games=[game.name for game in games],
         playerPoints=playerPoints
     )
-    
-    
-
-    
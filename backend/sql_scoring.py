@@ -0,0 +1,117 @@
+import datetime
+from typing import Union
+
+from sqlalchemy import Float, and_, case, cast, func, literal, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .models import Game, Player, Score
+from .schemas import PlayerMonthlyPoint
+from .standings import sumMonthlyPoints
+
+# dialects with stddev_samp() and window functions, the others score in python
+SQL_SCORING_DIALECTS = ("postgresql",)
+
+def sqlScoringAvailable(session: Union[Session, AsyncSession]) -> bool:
+    """Whether SCORING_BACKEND=sql can score in this session's database."""
+    return get_settings().scoring_backend == "sql" and session.get_bind().dialect.name in SQL_SCORING_DIALECTS
+
+def monthlyPointsQuery(startDate: datetime.date, endDate: datetime.date, gameCount: int):
+    """calculateMonthlyPoints as one query: (playerName, category, points) for the range.
+
+    Categories are the game names, Participation and Combined; Individual and Total are
+    derived from them like the per-day points of the standings engine.
+    """
+    dayGame = (Score.date, Score.gameId)
+    # double precision throughout like the pandas backend, postgres would otherwise
+    # compute avg and stddev_samp of integers in NUMERIC
+    score = cast(Score.score, Float)
+    scored = (
+        select(
+            Score.date,
+            Score.gameId,
+            Score.playerId,
+            score.label("score"),
+            Game.scoreMethod.label("multiplier"),
+            func.avg(score).over(partition_by=dayGame).label("mean"),
+            func.stddev_samp(score, type_=Float).over(partition_by=dayGame).label("std"),
+        )
+        .join(Game, Score.gameId == Game.id)
+        .where(Score.date >= startDate, Score.date <= endDate)
+        .cte("scored")
+    )
+    tScore = case(
+        # if only one player has played this will prevent divide by 0 errors
+        (or_(scored.c.std.is_(None), scored.c.std == 0), 0.0),
+        else_=(scored.c.score - scored.c.mean) / scored.c.std * scored.c.multiplier,
+    )
+    tScores = select(scored.c.date, scored.c.gameId, scored.c.playerId, tScore.label("tScore")).cte("t_scores")
+
+    gameRanks = select(
+        tScores.c.playerId,
+        tScores.c.gameId,
+        tScores.c.date,
+        func.rank().over(partition_by=(tScores.c.date, tScores.c.gameId), order_by=tScores.c.tScore.desc()).label("gameRank"),
+    ).cte("game_ranks")
+    gameWinners = select(
+        gameRanks.c.playerId,
+        gameRanks.c.gameId,
+        gameRanks.c.gameRank,
+        func.sum(case((gameRanks.c.gameRank == 1, 1), else_=0))
+            .over(partition_by=(gameRanks.c.date, gameRanks.c.gameId)).label("leaders"),
+    ).cte("game_winners")
+
+    # only players who participated in all games earn participation and combined points
+    days = (
+        select(tScores.c.date, tScores.c.playerId, func.sum(tScores.c.tScore).label("combinedTScore"))
+        .group_by(tScores.c.date, tScores.c.playerId)
+        .having(func.count() == gameCount)
+        .cte("days")
+    )
+    dayRanks = select(
+        days.c.date,
+        days.c.playerId,
+        func.rank().over(partition_by=days.c.date, order_by=days.c.combinedTScore.desc()).label("combinedRank"),
+    ).cte("day_ranks")
+    dayWinners = select(
+        dayRanks.c.playerId,
+        dayRanks.c.combinedRank,
+        func.sum(case((dayRanks.c.combinedRank == 1, 1), else_=0))
+            .over(partition_by=dayRanks.c.date).label("leaders"),
+    ).cte("day_winners")
+
+    def uniqueWinner(rank, leaders):
+        return func.sum(case((and_(rank == 1, leaders == 1), 1), else_=0))
+
+    return union_all(
+        select(Player.name.label("playerName"), Game.name.label("category"), uniqueWinner(gameWinners.c.gameRank, gameWinners.c.leaders).label("points"))
+        .select_from(gameWinners)
+        .join(Player, gameWinners.c.playerId == Player.id)
+        .join(Game, gameWinners.c.gameId == Game.id)
+        .group_by(Player.name, Game.name),
+        select(Player.name, literal("Participation"), func.count())
+        .select_from(dayWinners)
+        .join(Player, dayWinners.c.playerId == Player.id)
+        .group_by(Player.name),
+        select(Player.name, literal("Combined"), uniqueWinner(dayWinners.c.combinedRank, dayWinners.c.leaders))
+        .select_from(dayWinners)
+        .join(Player, dayWinners.c.playerId == Player.id)
+        .group_by(Player.name),
+    )
+
+def collectMonthlyPoints(rows, gameList: list[str]) -> list[PlayerMonthlyPoint]:
+    """Shape monthlyPointsQuery rows like calculateMonthlyPoints, [] without scores."""
+    totals: dict[str, dict[str, int]] = {}
+    for row in rows:
+        totals.setdefault(row.playerName, {})[row.category] = int(row.points)
+    if not totals:
+        return []
+    return sumMonthlyPoints([totals], gameList)
+
+def sqlMonthlyPoints(session: Session,
+                     games: dict[str, int],
+                     startDate: datetime.date,
+                     endDate: datetime.date) -> list[PlayerMonthlyPoint]:
+    rows = session.execute(monthlyPointsQuery(startDate, endDate, len(games)))
+    return collectMonthlyPoints(rows, list(games.keys()))
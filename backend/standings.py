@@ -0,0 +1,217 @@
+import datetime
+import math
+import threading
+import weakref
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .database import cache_engine
+from .models import Player, Game, DailyTScore
+from .schemas import PlayerMonthlyPoint
+
+CATEGORIES = ['Participation', 'Individual', 'Combined', 'Total']
+
+def computeMeanStd(values: list[int]) -> tuple[float, Optional[float]]:
+    """Mean and sample std of one (date, game), std is None for fewer than two scores.
+
+    Mirrors the pandas groupby in stats._compute_t_scores: the mean is an exact sum
+    divided by the count and the std uses Welford's update, so the floats come out
+    bit-for-bit identical to the full recompute.
+    """
+    count = len(values)
+    mean = sum(values) / count
+    if count < 2:
+        return mean, None
+
+    runningMean = 0.0
+    sumSquares = 0.0
+    for i, value in enumerate(values, start=1):
+        oldMean = runningMean
+        runningMean += (value - oldMean) / i
+        sumSquares += (value - oldMean) * (value - runningMean)
+    return mean, math.sqrt(sumSquares / (count - 1))
+
+def computeTScores(scores: dict, mean: float, std: Optional[float], multiplier: int) -> dict:
+    if not std:
+        # if only one player has played this will prevent divide by 0 errors
+        return {player: 0.0 for player in scores}
+    return {player: (score - mean) / std * multiplier for player, score in scores.items()}
+
+def _uniqueWinner(values: dict[str, float]) -> Optional[str]:
+    if not values:
+        return None
+    best = max(values.values())
+    winners = [player for player, value in values.items() if value == best]
+    return winners[0] if len(winners) == 1 else None
+
+def computeDayPoints(gameTScores: dict[str, dict[str, float]], gameList: list[str]) -> dict[str, dict[str, int]]:
+    """Points earned by each player on one date, keyed by player then category."""
+    points: dict[str, dict[str, int]] = defaultdict(dict)
+
+    for gameName in gameList:
+        tScores = gameTScores.get(gameName, {})
+        winner = _uniqueWinner(tScores)
+        for player in tScores:
+            points[player][gameName] = 1 if player == winner else 0
+
+    # only players who participated in all games earn participation and combined points
+    eligible = [player for player in points if all(player in gameTScores.get(g, {}) for g in gameList)]
+    combinedTotals = {player: sum(gameTScores[g][player] for g in gameList) for player in eligible}
+    combinedWinner = _uniqueWinner(combinedTotals)
+    for player in eligible:
+        points[player]['Participation'] = 1
+        points[player]['Combined'] = 1 if player == combinedWinner else 0
+
+    return dict(points)
+
+def sumDayPoints(dayPoints: Iterable[dict[str, dict[str, int]]]) -> dict[str, dict[str, int]]:
+    """Add up per-day points (or earlier sums of them) by player and category."""
+    totals: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for day in dayPoints:
+        for player, categories in day.items():
+            playerTotals = totals[player]
+            for category, value in categories.items():
+                playerTotals[category] += value
+    return totals
+
+def sumMonthlyPoints(dayPoints: Iterable[dict[str, dict[str, int]]], gameList: list[str]) -> list[PlayerMonthlyPoint]:
+    """Collapse per-day points into the category-major list calculateMonthlyPoints returns."""
+    totals = sumDayPoints(dayPoints)
+
+    for playerTotals in totals.values():
+        playerTotals['Individual'] = sum(playerTotals[g] for g in gameList)
+        playerTotals['Total'] = playerTotals['Participation'] + playerTotals['Combined'] + playerTotals['Individual']
+
+    players = sorted(totals)
+    return [
+        PlayerMonthlyPoint(playerName=player, category=category, points=totals[player][category])
+        for category in CATEGORIES + list(gameList)
+        for player in players
+    ]
+
+class StandingsEngine:
+    """Per-day scoring results cached across requests.
+
+    Score writes invalidate a single (date, game); the next monthly read reloads only the
+    missing pairs from daily_t_scores, then sums the cached per-day points.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._games: dict[str, int] = {}
+        self._gameDays: dict[tuple[datetime.date, str], dict[str, float]] = {}
+        self._dayPoints: dict[datetime.date, dict[str, dict[str, int]]] = {}
+        self._generations: dict[tuple[datetime.date, str], int] = defaultdict(int)
+        # (date, game) pairs served from memory and loaded from daily_t_scores
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, date: datetime.date, gameName: str) -> None:
+        with self._lock:
+            self._gameDays.pop((date, gameName), None)
+            self._dayPoints.pop(date, None)
+            self._generations[(date, gameName)] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clearLocked()
+
+    def _clearLocked(self) -> None:
+        self._gameDays.clear()
+        self._dayPoints.clear()
+        for key in self._generations:
+            self._generations[key] += 1
+
+    def monthlyPoints(self,
+                      session: Session,
+                      games: dict[str, int],
+                      startDate: datetime.date,
+                      endDate: datetime.date) -> list[PlayerMonthlyPoint]:
+        dayPoints = self.dayPoints(session, games, startDate, endDate)
+        if not any(dayPoints):
+            return []
+        return sumMonthlyPoints(dayPoints, list(games.keys()))
+
+    def dayPoints(self,
+                  session: Session,
+                  games: dict[str, int],
+                  startDate: datetime.date,
+                  endDate: datetime.date) -> list[dict[str, dict[str, int]]]:
+        gameList = list(games.keys())
+        dates = [startDate + datetime.timedelta(days=i) for i in range((endDate - startDate).days + 1)]
+        keys = [(d, g) for d in dates for g in gameList]
+
+        with self._lock:
+            if games != self._games:
+                self._clearLocked()
+                self._games = dict(games)
+            generations = {key: self._generations[key] for key in keys}
+            gameDays = {key: self._gameDays[key] for key in keys if key in self._gameDays}
+            cachedDayPoints = {d: self._dayPoints[d] for d in dates if d in self._dayPoints}
+            missing = [key for key in keys if key not in gameDays]
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            gameDays.update(self._loadGameDays(session, missing))
+
+        missingDates = {d for d, _ in missing}
+        dayPoints = []
+        with self._lock:
+            for d in dates:
+                points = cachedDayPoints.get(d) if d not in missingDates else None
+                if points is None:
+                    points = computeDayPoints({g: gameDays[(d, g)] for g in gameList}, gameList)
+                    # a write that landed while we were loading wins; leave that date for the next read
+                    if all(self._generations[(d, g)] == generations[(d, g)] for g in gameList):
+                        for g in gameList:
+                            self._gameDays[(d, g)] = gameDays[(d, g)]
+                        self._dayPoints[d] = points
+                dayPoints.append(points)
+        return dayPoints
+
+    def _loadGameDays(self,
+                      session: Session,
+                      missing: list[tuple[datetime.date, str]]) -> dict[tuple[datetime.date, str], dict[str, float]]:
+        query = (
+            select(
+                DailyTScore.date,
+                Game.name.label("gameName"),
+                Player.name.label("playerName"),
+                DailyTScore.tScore
+            )
+            .select_from(DailyTScore)
+            .join(Game, DailyTScore.gameId == Game.id)
+            .join(Player, DailyTScore.playerId == Player.id)
+            .where(DailyTScore.date.in_({d for d, _ in missing}))
+        )
+        gameDays: dict[tuple[datetime.date, str], dict[str, float]] = {key: {} for key in missing}
+        for row in session.execute(query):
+            key = (row.date, row.gameName)
+            if key in gameDays:
+                gameDays[key][row.playerName] = row.tScore
+        return gameDays
+
+_standingsEngines: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_standingsEnginesLock = threading.Lock()
+
+def getStandingsEngine(session: Session) -> StandingsEngine:
+    # one cache per database so separate databases (e.g. tests) never share results, a replica shares its primary's
+    dbEngine = cache_engine(session.get_bind().engine)
+    with _standingsEnginesLock:
+        standings = _standingsEngines.get(dbEngine)
+        if standings is None:
+            standings = StandingsEngine()
+            _standingsEngines[dbEngine] = standings
+        return standings
+
+def standingsCacheStats() -> dict[str, int]:
+    with _standingsEnginesLock:
+        engines = list(_standingsEngines.values())
+    return {
+        "hits": sum(standings.hits for standings in engines),
+        "misses": sum(standings.misses for standings in engines),
+    }
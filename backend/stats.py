@@ -4,7 +4,9 @@ import numpy as np
 from typing import Any
 
 from .schemas import PlayerMonthlyPoint, ScorePublic
+from .scoring import timedScoring
 
+@timedScoring
 def _compute_t_scores(scores: pd.DataFrame) -> pd.DataFrame:
     gameStats = scores.groupby(['date','gameName']).agg({'score':['mean','std']}).reset_index()
     gameStats.columns = ['date', 'gameName', 'mean', 'std']
@@ -18,6 +20,7 @@ def _compute_t_scores(scores: pd.DataFrame) -> pd.DataFrame:
         )
     return scores
 
+@timedScoring
 def _compute_individual_game_points(scores: pd.DataFrame, gameList:list[str]) -> pd.DataFrame:
     # add individual game points here
     maxScores = scores.groupby(['date','gameName'])['t_score'].transform('max')
@@ -34,6 +37,7 @@ def _compute_individual_game_points(scores: pd.DataFrame, gameList:list[str]) ->
     indivPointsWide['individual_points'] = indivPointsWide[list(gameList)].sum(axis=1)
     return indivPointsWide
 
+@timedScoring
 def _compute_category_points(scores: pd.DataFrame, gameList: list[str]) -> pd.DataFrame:
     # filter to only players who participated in all games
     scores['game_count'] = scores.groupby(['date','playerName'])['gameName'].transform('nunique')
@@ -66,6 +70,7 @@ def _compute_category_points(scores: pd.DataFrame, gameList: list[str]) -> pd.Da
 
     return scoresWide.groupby('playerName')[['participation_points','combined_points']].sum().reset_index()
 
+@timedScoring
 def _assemble_monthly_points(widePoints: pd.DataFrame, indivPointsWide: pd.DataFrame, gamesList: list[str]) -> pd.DataFrame:
     monthlyScores = widePoints.merge(indivPointsWide, on='playerName',how='outer').fillna(0)
     monthlyScores['total_points'] = monthlyScores[['participation_points', 'combined_points', 'individual_points']].sum(axis=1)
@@ -75,6 +80,7 @@ def _assemble_monthly_points(widePoints: pd.DataFrame, indivPointsWide: pd.DataF
     monthlyScores['category'] = monthlyScores['category'].str.replace('_points','', regex=False).str.capitalize()
     return monthlyScores
 
+@timedScoring
 def calculateMonthlyPoints(games:dict, scoreEntries:list[dict[str,Any]]) -> list[PlayerMonthlyPoint]:
 
     scores = pd.DataFrame(scoreEntries)
@@ -91,6 +97,7 @@ def calculateMonthlyPoints(games:dict, scoreEntries:list[dict[str,Any]]) -> list
         points=score['points']
     ) for score in monthlyScores.to_dict('records')]
 
+@timedScoring
 def calculateDailyCombinedScore(games:dict, 
                                 scoreEntries: list[dict[str,Any]], 
                                 date: datetime.date) -> list[ScorePublic]:
@@ -0,0 +1,92 @@
+import datetime
+import random
+from itertools import islice
+from typing import Iterator, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from .daily_stats import rebuildDailyStats
+from .importer import IMPORT_BATCH_ROWS, ensureGame, ensurePlayers, insertScoreBatches
+from .models import ScoreMethod
+
+class SyntheticHistory(NamedTuple):
+    """A reproducible score history for benchmarks and load tests.
+
+    Scores are generated per date from the seed, so any date range can be produced
+    without generating the whole history. Timed games score low (seconds to solve),
+    the others high (points out of 100), and each player has a fixed skill.
+    """
+    games: dict[str, ScoreMethod]
+    players: list[str]
+    skills: dict[str, float]
+    startDate: datetime.date
+    endDate: datetime.date
+    seed: int
+    playRate: float
+
+    def dates(self) -> Iterator[datetime.date]:
+        for offset in range((self.endDate - self.startDate).days + 1):
+            yield self.startDate + datetime.timedelta(days=offset)
+
+    def dayScores(self, date: datetime.date) -> Iterator[tuple[str, str, int]]:
+        rng = random.Random(self.seed * 1_000_003 + date.toordinal())
+        for gameName, scoreMethod in self.games.items():
+            for playerName in self.players:
+                if rng.random() >= self.playRate:
+                    continue
+                form = self.skills[playerName] * rng.lognormvariate(0, 0.35)
+                if scoreMethod == ScoreMethod.LOW:
+                    score = int(30 + 600 / form)
+                else:
+                    score = min(100, int(45 * form))
+                yield gameName, playerName, score
+
+    def scores(self, startDate: Optional[datetime.date] = None, endDate: Optional[datetime.date] = None) -> Iterator[tuple[datetime.date, str, str, int]]:
+        for date in self.dates():
+            if (startDate and date < startDate) or (endDate and date > endDate):
+                continue
+            for gameName, playerName, score in self.dayScores(date):
+                yield date, gameName, playerName, score
+
+    def entries(self, startDate: datetime.date, endDate: datetime.date) -> list[dict]:
+        """Score entries in the shape the scoring backends take."""
+        return [
+            {"date": date, "gameName": gameName, "playerName": playerName, "score": score}
+            for date, gameName, playerName, score in self.scores(startDate, endDate)
+        ]
+
+def syntheticHistory(players: int = 20,
+                     games: int = 3,
+                     years: float = 1.0,
+                     endDate: Optional[datetime.date] = None,
+                     seed: int = 0,
+                     playRate: float = 0.8) -> SyntheticHistory:
+    endDate = endDate or datetime.date(2024, 12, 31)
+    rng = random.Random(seed)
+    playerNames = [f"Player {i + 1:04d}" for i in range(players)]
+    return SyntheticHistory(
+        games={f"Game {i + 1}": ScoreMethod.LOW if i % 2 == 0 else ScoreMethod.HIGH for i in range(games)},
+        players=playerNames,
+        skills={name: rng.uniform(0.5, 2.0) for name in playerNames},
+        startDate=endDate - datetime.timedelta(days=max(int(years * 365) - 1, 0)),
+        endDate=endDate,
+        seed=seed,
+        playRate=playRate,
+    )
+
+def loadSyntheticHistory(session: Session, history: SyntheticHistory, batchSize: int = IMPORT_BATCH_ROWS) -> int:
+    """Write the history through the bulk import path and build its daily stats, returns the score count."""
+    gameIds = {}
+    playerIds = {}
+    for gameName, scoreMethod in history.games.items():
+        gameIds[gameName] = ensureGame(session, gameName, scoreMethod)
+        playerIds = ensurePlayers(session, history.players, gameIds[gameName])
+
+    rows = (
+        {"date": date, "playerId": playerIds[playerName], "gameId": gameIds[gameName], "score": score}
+        for date, gameName, playerName, score in history.scores()
+    )
+    inserted = insertScoreBatches(session, iter(lambda: list(islice(rows, batchSize)), []))
+    session.commit()
+    rebuildDailyStats(session)
+    return inserted
@@ -0,0 +1,44 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from ..daily_stats import rebuildDailyStats
+from ..database import get_session
+from ..models import Base, Game, Player, Score
+from ..seeding import GAME_CONFIGS, SEED_DIR, load_scores_from_csv
+
+
+def load_seed_scores(session: Session) -> None:
+    entries = {config["name"]: load_scores_from_csv(SEED_DIR / config["csv"]) for config in GAME_CONFIGS}
+    players = {name: Player(name=name) for name in sorted({e["player_name"] for rows in entries.values() for e in rows})}
+    games = {config["name"]: Game(name=config["name"], scoreMethod=config["scoreMethod"]) for config in GAME_CONFIGS}
+    session.add_all(list(players.values()) + list(games.values()))
+    session.flush()
+    session.add_all([
+        Score(date=e["date"], playerId=players[e["player_name"]].id, gameId=games[name].id, score=e["score"])
+        for name, rows in entries.items()
+        for e in rows
+    ])
+    session.commit()
+    rebuildDailyStats(session)
+
+
+def create_shared_memory_engine() -> Engine:
+    # one connection shared across threads so the TestClient worker sees the same in-memory database
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def create_test_client(engine: Engine) -> TestClient:
+    """Client for the app bound to the given engine, without running the dev lifespan seeding."""
+    from ..main import app
+
+    def get_test_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_test_session
+    return TestClient(app)
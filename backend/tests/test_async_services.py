@@ -0,0 +1,95 @@
+import datetime
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from .. import async_services, export, services
+from ..database import async_database_url
+from ..models import Base, MonthlyRollup
+from ..schemas import ScoreCreate
+from ..scoring_pool import scoringPool
+from .helpers import load_seed_scores
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "aiosqlite is not installed")
+class AsyncServicesTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{Path(self.directory.name) / 'test.db'}"
+        self.engine = create_engine(url)
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        load_seed_scores(self.session)
+
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+        self.asyncEngine = create_async_engine(async_database_url(url))
+        self.asyncSession = AsyncSession(self.asyncEngine, expire_on_commit=False)
+
+    async def asyncTearDown(self) -> None:
+        await self.asyncSession.close()
+        await self.asyncEngine.dispose()
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    async def test_scoreboards_match_sync_services(self) -> None:
+        date = datetime.date(2024, 5, 12)
+
+        self.assertEqual(await async_services.getScoreboardDaily(self.asyncSession, date),
+                         services.getScoreboardDaily(self.session, date))
+        self.assertEqual(await async_services.getScoreboardMonthly(self.asyncSession, date),
+                         services.getScoreboardMonthly(self.session, date))
+        with mock.patch("backend.async_services.get_settings") as settings:
+            settings.return_value.incremental_standings = False
+            self.assertEqual(await async_services.getScoreboardMonthly(self.asyncSession, date),
+                             services.getScoreboardMonthly(self.session, date))
+
+    async def test_standings_match_sync_services(self) -> None:
+        startDate, endDate = datetime.date(2024, 1, 10), datetime.date(2024, 5, 12)
+        # first read stores the closed months, the second is served from them
+        for _ in range(2):
+            self.assertEqual(await async_services.getStandings(self.asyncSession, startDate, endDate),
+                             services.getStandings(self.session, startDate, endDate))
+
+    async def test_full_recompute_standings_score_off_the_loop(self) -> None:
+        startDate, endDate = datetime.date(2024, 1, 10), datetime.date(2024, 5, 12)
+        with mock.patch("backend.async_services.get_settings") as asyncSettings, \
+                mock.patch("backend.services.get_settings") as settings:
+            asyncSettings.return_value.incremental_standings = False
+            settings.return_value.incremental_standings = False
+            expected = services.computeStandings(self.session, startDate, endDate)
+            # nothing stored, every month is scored again
+            self.session.execute(MonthlyRollup.__table__.delete())
+            self.session.commit()
+
+            with mock.patch.object(scoringPool, "run", wraps=scoringPool.run) as onLoop, \
+                    mock.patch.object(scoringPool, "runAsync", wraps=scoringPool.runAsync) as offLoop:
+                self.assertEqual(await async_services.getStandings(self.asyncSession, startDate, endDate), expected)
+            onLoop.assert_not_called()
+            self.assertEqual(offLoop.call_count, 5)
+
+    async def test_writes_through_async_session(self) -> None:
+        score = ScoreCreate(date=datetime.date(2024, 5, 12), score=10, playerName="Rebecca", gameName="Crossword")
+        created = await async_services.addNewScore(self.asyncSession, score)
+        self.assertEqual(created["score"], 10)
+
+        scores = await async_services.getDailyScores(self.asyncSession, score.date, score.date, "Rebecca")
+        self.assertEqual([(s.gameName, s.score) for s in scores], [("Crossword", 10)])
+        # the stored t-scores were refreshed in the same transaction
+        self.assertEqual(services.getCombinedScores(self.session, score.date),
+                         await async_services.getCombinedScores(self.asyncSession, score.date))
+
+    async def test_export_streams_from_async_session(self) -> None:
+        for exportFormat, gameName in [("ndjson", None), ("csv", "Sudoku")]:
+            with self.subTest(format=exportFormat):
+                chunks = [chunk async for chunk in async_services.exportScores(
+                    self.asyncSession, exportFormat, datetime.date(2024, 1, 1), None, None, gameName)]
+                self.assertEqual("".join(chunks), "".join(export.exportScores(
+                    self.session, exportFormat, datetime.date(2024, 1, 1), None, None, gameName)))
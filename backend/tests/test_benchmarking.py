@@ -0,0 +1,55 @@
+import unittest
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from ..benchmarking import compareToBaseline, scoringBenchmarks, serviceBenchmarks
+from ..models import Base, DailyTScore, Player, Score
+from ..synthetic import loadSyntheticHistory, syntheticHistory
+
+
+class SyntheticHistoryTestCase(unittest.TestCase):
+    def test_history_is_reproducible_per_date(self) -> None:
+        history = syntheticHistory(players=8, games=2, years=0.25, seed=3)
+        date = history.endDate.replace(day=10)
+
+        self.assertEqual(list(history.scores()), list(syntheticHistory(players=8, games=2, years=0.25, seed=3).scores()))
+        self.assertEqual(history.entries(date, date), [
+            {"date": date, "gameName": g, "playerName": p, "score": s} for g, p, s in history.dayScores(date)
+        ])
+        self.assertNotEqual(list(history.scores()), list(syntheticHistory(players=8, games=2, years=0.25, seed=4).scores()))
+
+    def test_load_writes_scores_and_daily_stats(self) -> None:
+        history = syntheticHistory(players=6, games=3, years=0.1)
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        try:
+            with Session(engine) as session:
+                inserted = loadSyntheticHistory(session, history, batchSize=50)
+                self.assertEqual(inserted, len(list(history.scores())))
+                self.assertEqual(session.scalar(select(func.count()).select_from(Score)), inserted)
+                self.assertEqual(session.scalar(select(func.count()).select_from(DailyTScore)), inserted)
+                self.assertEqual({len(p.games) for p in session.scalars(select(Player))}, {3})
+
+            results = serviceBenchmarks(engine, history, repeat=1)
+        finally:
+            engine.dispose()
+        self.assertIn("getScoreboardMonthly.cold", results)
+        self.assertIn("scoresJson.fast", results)
+        self.assertTrue(all(r["runs"] == 1 and r["min"] <= r["median"] <= r["max"] for r in results.values()))
+
+
+class BaselineTestCase(unittest.TestCase):
+    def test_slowdowns_beyond_the_threshold_are_regressions(self) -> None:
+        report = {"results": {"sqlite": {"fast": {"median": 0.011}, "slow": {"median": 0.013}, "new": {"median": 0.5}}}}
+        baseline = {"results": {"sqlite": {"fast": {"median": 0.010}, "slow": {"median": 0.010}}}}
+
+        comparisons = {c.name: c for c in compareToBaseline(report, baseline)}
+        self.assertFalse(comparisons["fast"].isRegression(0.2))
+        self.assertTrue(comparisons["slow"].isRegression(0.2))
+        self.assertIsNone(comparisons["new"].change)
+        self.assertFalse(comparisons["new"].isRegression(0.2))
+
+    def test_scoring_benchmarks_cover_both_backends(self) -> None:
+        results = scoringBenchmarks(syntheticHistory(players=5, games=2, years=0.1), repeat=1)
+        self.assertEqual(set(results), {"pandas.calculateMonthlyPoints", "numpy.calculateMonthlyPoints"})
@@ -0,0 +1,71 @@
+import datetime
+import unittest
+
+from sqlalchemy.orm import Session
+
+from ..cache import DAILY_SCOREBOARD, MONTHLY_SCOREBOARD, ResponseCache, scoreboardKeysForDate
+from .helpers import create_shared_memory_engine, create_test_client, load_seed_scores
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    def test_evicts_least_recently_used_beyond_size_limit(self) -> None:
+        cache = ResponseCache(maxBytes=10)
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        self.assertEqual(cache.get("a"), b"1234")
+        cache.set("c", b"1234")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), b"1234")
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(cache.stats()["bytes"], 8)
+
+    def test_invalidation_during_build_keeps_stale_body_out(self) -> None:
+        cache = ResponseCache(maxBytes=100)
+        token = cache.token("a")
+        cache.invalidate("a")
+        cache.set("a", b"stale", token)
+
+        self.assertIsNone(cache.get("a"))
+
+    def test_score_date_invalidates_daily_and_rest_of_month(self) -> None:
+        keys = scoreboardKeysForDate(datetime.date(2024, 2, 27))
+
+        self.assertEqual(keys, [
+            (DAILY_SCOREBOARD, datetime.date(2024, 2, 27)),
+            (MONTHLY_SCOREBOARD, datetime.date(2024, 2, 27)),
+            (MONTHLY_SCOREBOARD, datetime.date(2024, 2, 28)),
+            (MONTHLY_SCOREBOARD, datetime.date(2024, 2, 29)),
+        ])
+
+
+class ScoreboardCacheEndpointTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_shared_memory_engine()
+        with Session(self.engine) as session:
+            load_seed_scores(session)
+        self.client = create_test_client(self.engine)
+        from ..main import responseCache
+        self.cache = responseCache
+        self.cache.clear()
+
+    def tearDown(self) -> None:
+        self.client.app.dependency_overrides.clear()
+        self.engine.dispose()
+
+    def test_score_write_refreshes_only_affected_boards(self) -> None:
+        first = self.client.get("/scores/daily", params={"date": "2024-05-12"})
+        self.client.get("/scores/daily", params={"date": "2024-05-11"})
+        self.client.get("/scores/monthly", params={"date": "2024-05-12"})
+        self.assertEqual(self.client.get("/scores/daily", params={"date": "2024-05-12"}).content, first.content)
+
+        response = self.client.post("/score/", json={"date": "2024-05-12", "score": 10, "playerName": "Rebecca", "gameName": "Crossword"})
+        self.assertEqual(response.status_code, 200)
+
+        after = self.client.get("/scores/daily", params={"date": "2024-05-12"})
+        self.assertIn({"date": "2024-05-12", "score": 10, "playerName": "Rebecca", "gameName": "Crossword"}, after.json()["scores"])
+        self.assertNotEqual(after.content, first.content)
+        stats = self.client.get("/cache/stats").json()
+        # the 2024-05-11 board survived the write and 2024-05-12 was rebuilt
+        self.assertEqual(stats["entries"], 2)
+        self.assertEqual(stats["hits"], 1)
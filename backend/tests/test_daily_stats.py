@@ -0,0 +1,119 @@
+import datetime
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from .. import daily_stats
+from ..daily_stats import lockGameDay, rebuildDailyStats
+from ..models import Base, DailyGameStat, DailyTScore, Game, Player, Score
+from ..schemas import ScoreCreate
+from ..services import addNewScore, getCombinedScores, updateScore
+from ..stats import calculateDailyCombinedScore
+from .helpers import load_seed_scores
+
+
+class DailyStatsTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        load_seed_scores(self.session)
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.engine.dispose()
+
+    def stored_rows(self):
+        tScores = self.session.execute(
+            select(DailyTScore.date, DailyTScore.gameId, DailyTScore.playerId, DailyTScore.tScore)
+            .order_by(DailyTScore.date, DailyTScore.gameId, DailyTScore.playerId)
+        ).all()
+        stats = self.session.execute(
+            select(DailyGameStat.date, DailyGameStat.gameId, DailyGameStat.playerCount, DailyGameStat.mean, DailyGameStat.std)
+            .order_by(DailyGameStat.date, DailyGameStat.gameId)
+        ).all()
+        return tScores, stats
+
+    def test_combined_scores_match_pandas_path(self) -> None:
+        games = {g.name: g.scoreMethod for g in self.session.scalars(select(Game))}
+        date = datetime.date(2023, 3, 15)
+        while date <= datetime.date(2023, 6, 30):
+            rows = self.session.execute(
+                select(Game.name.label("gameName"), Player.name.label("playerName"), Score.score)
+                .join(Game, Score.gameId == Game.id)
+                .join(Player, Score.playerId == Player.id)
+                .where(Score.date == date)
+            ).mappings().all()
+            expected = calculateDailyCombinedScore(games, [dict(r) for r in rows], date) if rows else []
+            with self.subTest(date=date):
+                self.assertEqual(getCombinedScores(self.session, date), expected)
+            date += datetime.timedelta(days=1)
+
+    def test_score_writes_keep_tables_in_step(self) -> None:
+        updateScore(self.session, ScoreCreate(date=datetime.date(2024, 5, 10), score=20, playerName="Nate", gameName="Crossword"))
+        addNewScore(self.session, ScoreCreate(date=datetime.date(2024, 5, 12), score=30, playerName="Rebecca", gameName="Crossword"))
+        incremental = self.stored_rows()
+
+        rebuildDailyStats(self.session)
+
+        self.assertEqual(incremental, self.stored_rows())
+
+
+class ConcurrentGameDayWritesTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        # a file, so each session has its own connection
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{Path(self.directory.name) / 'writes.db'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine)
+        with Session(self.engine) as session:
+            load_seed_scores(session)
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_two_writes_to_one_game_day_both_succeed(self) -> None:
+        date = datetime.date(2020, 3, 1)
+        first = ScoreCreate(date=date, score=30, playerName="Rebecca", gameName="Crossword")
+        second = ScoreCreate(date=date, score=50, playerName="Nate", gameName="Crossword")
+        results = {}
+
+        def writeSecond() -> None:
+            with Session(self.engine) as session:
+                results["second"] = addNewScore(session, second)
+
+        refresh = daily_stats.refreshDailyStats
+        other = threading.Thread(target=writeSecond)
+
+        def refreshThenStartSecond(*args) -> None:
+            refresh(*args)
+            if not other.is_alive() and "second" not in results:
+                # the second write runs while the first transaction is still open
+                other.start()
+                time.sleep(0.2)
+
+        with mock.patch("backend.services.refreshDailyStats", side_effect=refreshThenStartSecond):
+            with Session(self.engine) as session:
+                results["first"] = addNewScore(session, first)
+            other.join(10)
+
+        self.assertEqual(results["first"]["score"], 30)
+        self.assertEqual(results["second"]["score"], 50)
+        with Session(self.engine) as session:
+            gameId = session.scalar(select(Game.id).where(Game.name == "Crossword"))
+            playerCount = session.scalar(select(DailyGameStat.playerCount).where(DailyGameStat.date == date, DailyGameStat.gameId == gameId))
+            self.assertEqual(playerCount, 2)
+
+    def test_postgres_refreshes_take_a_game_day_lock(self) -> None:
+        session = mock.Mock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        lockGameDay(session, datetime.date(2024, 5, 12), 2)
+        statement = session.execute.call_args.args[0]
+        self.assertIn("pg_advisory_xact_lock", str(statement))
+        self.assertEqual(list(statement.compile().params.values()), [2, datetime.date(2024, 5, 12).toordinal()])
@@ -0,0 +1,53 @@
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from ..db_timing import TimedQueuePool, dbMetrics, trackRequest
+from .helpers import create_shared_memory_engine, create_test_client, load_seed_scores
+
+SERVER_TIMING = re.compile(r'^db;dur=[\d.]+;desc="(\d+) queries", pool;dur=[\d.]+$')
+
+
+class DbTimingTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_shared_memory_engine()
+        with Session(self.engine) as session:
+            load_seed_scores(session)
+        self.client = create_test_client(self.engine)
+
+    def tearDown(self) -> None:
+        self.client.app.dependency_overrides.clear()
+        self.engine.dispose()
+
+    def test_responses_carry_their_query_count(self) -> None:
+        before = dbMetrics.stats()
+        # a date no other test caches, the second request is served from the response cache
+        first = self.client.get("/scores/daily", params={"date": "2023-06-02"})
+        second = self.client.get("/scores/daily", params={"date": "2023-06-02"})
+
+        self.assertEqual(SERVER_TIMING.match(first.headers["server-timing"]).group(1), "2")
+        self.assertEqual(SERVER_TIMING.match(second.headers["server-timing"]).group(1), "0")
+        after = self.client.get("/db/stats").json()
+        self.assertGreaterEqual(after["requests"] - before["requests"], 2)
+        self.assertGreaterEqual(after["queries"] - before["queries"], 2)
+        self.assertIn("sync", after["pools"])
+
+    def test_pool_checkout_time_is_recorded(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{Path(directory) / 'pool.db'}", poolclass=TimedQueuePool, pool_pre_ping=True)
+            try:
+                with trackRequest() as timing, engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                # queries outside a request are not attributed to anything
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            finally:
+                engine.dispose()
+
+        self.assertEqual(timing.queries, 1)
+        self.assertGreater(timing.poolWait, 0)
+        self.assertGreater(timing.dbTime, 0)
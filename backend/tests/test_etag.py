@@ -0,0 +1,63 @@
+import unittest
+from unittest import mock
+
+from sqlalchemy.orm import Session
+
+from ..versions import etagMatches
+from .helpers import create_shared_memory_engine, create_test_client, load_seed_scores
+
+
+class ConditionalRequestTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_shared_memory_engine()
+        with Session(self.engine) as session:
+            load_seed_scores(session)
+        self.client = create_test_client(self.engine)
+
+    def tearDown(self) -> None:
+        self.client.app.dependency_overrides.clear()
+        self.engine.dispose()
+
+    def test_etag_matching_uses_weak_comparison(self) -> None:
+        self.assertTrue(etagMatches('W/"abc-1", "abc-2"', '"abc-1"'))
+        self.assertTrue(etagMatches("*", '"abc-1"'))
+        self.assertFalse(etagMatches('"abc-2"', '"abc-1"'))
+        self.assertFalse(etagMatches(None, '"abc-1"'))
+
+    def test_unchanged_resources_return_304_without_querying(self) -> None:
+        requests = [
+            ("/players/", {}),
+            ("/games/Sarah", {}),
+            ("/scores/", {"startDate": "2024-05-01", "endDate": "2024-05-31"}),
+            ("/scores/combined", {"date": "2024-05-12"}),
+            ("/scores/daily", {"date": "2024-05-12"}),
+            ("/scores/monthly", {"date": "2024-05-12"}),
+        ]
+        for path, params in requests:
+            with self.subTest(path=path):
+                first = self.client.get(path, params=params)
+                self.assertEqual(first.status_code, 200)
+                self.assertEqual(first.headers["cache-control"], "no-cache")
+
+                with mock.patch.object(Session, "execute") as execute, mock.patch.object(Session, "scalars") as scalars:
+                    second = self.client.get(path, params=params, headers={"If-None-Match": first.headers["etag"]})
+                self.assertEqual(second.status_code, 304)
+                self.assertEqual(second.content, b"")
+                execute.assert_not_called()
+                scalars.assert_not_called()
+
+    def test_score_write_changes_etag_of_its_date_only(self) -> None:
+        daily = self.client.get("/scores/daily", params={"date": "2024-05-12"}).headers["etag"]
+        monthly = self.client.get("/scores/monthly", params={"date": "2024-05-20"}).headers["etag"]
+        otherDay = self.client.get("/scores/daily", params={"date": "2024-05-11"}).headers["etag"]
+
+        self.client.post("/score/", json={"date": "2024-05-12", "score": 10, "playerName": "Rebecca", "gameName": "Crossword"})
+
+        for path, date, etag, status in [
+            ("/scores/daily", "2024-05-12", daily, 200),
+            ("/scores/monthly", "2024-05-20", monthly, 200),
+            ("/scores/daily", "2024-05-11", otherDay, 304),
+        ]:
+            with self.subTest(path=path, date=date):
+                response = self.client.get(path, params={"date": date}, headers={"If-None-Match": etag})
+                self.assertEqual(response.status_code, status)
@@ -0,0 +1,70 @@
+import datetime
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sqlalchemy.orm import Session
+
+from ..export import contentDisposition, exportScores
+from ..seeding import SEED_DIR, load_scores_from_csv
+from ..services import getDailyScores
+from .helpers import create_shared_memory_engine, create_test_client, load_seed_scores
+
+
+class ScoreExportTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_shared_memory_engine()
+        with Session(self.engine) as session:
+            load_seed_scores(session)
+        self.client = create_test_client(self.engine)
+
+    def tearDown(self) -> None:
+        self.client.app.dependency_overrides.clear()
+        self.engine.dispose()
+
+    def test_ndjson_export_matches_score_query(self) -> None:
+        params = {"startDate": "2024-01-01", "endDate": "2024-12-31", "playerName": "Sarah"}
+        response = self.client.get("/scores/export", params=params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+        exported = [json.loads(line) for line in response.text.splitlines()]
+        with Session(self.engine) as session:
+            expected = getDailyScores(session, datetime.date(2024, 1, 1), datetime.date(2024, 12, 31), "Sarah")
+        self.assertEqual(sorted(exported, key=lambda s: (s["date"], s["gameName"])),
+                         sorted([s.model_dump(mode="json") for s in expected], key=lambda s: (s["date"], s["gameName"])))
+
+    def test_csv_export_round_trips_the_seed_file(self) -> None:
+        response = self.client.get("/scores/export", params={"startDate": "2023-01-01", "gameName": "Crossword", "format": "csv"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('filename="crossword.csv"', response.headers["content-disposition"])
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "crossword.csv"
+            path.write_text(response.text)
+            exported = load_scores_from_csv(path)
+        key = lambda e: (e["date"], e["player_name"])
+        self.assertEqual(sorted(exported, key=key), sorted(load_scores_from_csv(SEED_DIR / "crossword.csv"), key=key))
+
+    def test_csv_filename_survives_any_game_name(self) -> None:
+        response = self.client.get("/scores/export", params={"startDate": "2024-01-01", "gameName": "数独", "format": "csv"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-disposition"],
+                         "attachment; filename=\"scores.csv\"; filename*=UTF-8''%E6%95%B0%E7%8B%AC.csv")
+        self.assertEqual(contentDisposition('Café "Mini"\r\n.csv'),
+                         "attachment; filename=\"Cafe _Mini___.csv\"; filename*=UTF-8''Caf%C3%A9%20%22Mini%22%0D%0A.csv")
+
+    def test_csv_export_needs_a_game(self) -> None:
+        response = self.client.get("/scores/export", params={"startDate": "2024-01-01", "format": "csv"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_rows_are_fetched_and_sent_in_batches(self) -> None:
+        with Session(self.engine) as session, mock.patch("backend.export.EXPORT_BATCH_ROWS", 100):
+            rowCount = len(getDailyScores(session, datetime.date(2023, 1, 1)))
+            chunks = list(exportScores(session, "ndjson", datetime.date(2023, 1, 1)))
+
+        self.assertEqual(len(chunks), -(-rowCount // 100))
+        self.assertTrue(all(chunk.count("\n") <= 100 for chunk in chunks))
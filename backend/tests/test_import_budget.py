@@ -0,0 +1,32 @@
+import unittest
+
+from ..import_budget import checkBudget, importReport, loadBudget, parseImportTime
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      3000 |       5000 | backend.main
+import time:        50 |         50 |   _io
+"""
+
+
+class ImportBudgetTestCase(unittest.TestCase):
+    def test_parses_importtime_output(self) -> None:
+        timings = parseImportTime(SAMPLE)
+        self.assertEqual(set(timings), {"_io", "backend.main"})
+        self.assertEqual(timings["backend.main"].cumulativeUs, 5000)
+        self.assertEqual(timings["_io"].selfUs, 120)
+
+    def test_budget_violations(self) -> None:
+        budget = {"totalMs": 100, "appMs": 10}
+        report = {"module": "backend.main", "totalMs": 90, "appMs": 12, "forbiddenLoaded": ["pandas"]}
+        problems = checkBudget(report, budget)
+        self.assertEqual(len(problems), 2)
+        self.assertIn("pandas", problems[1])
+        self.assertEqual(checkBudget({**report, "appMs": 5, "forbiddenLoaded": []}, budget), [])
+
+    def test_app_import_leaves_heavy_modules_for_first_use(self) -> None:
+        # timings are too noisy for the test run, scripts/import_time.py checks those
+        budget = loadBudget()
+        report = importReport(budget["module"], repeat=1, forbidden=tuple(budget["forbidden"]))
+        self.assertEqual(report["forbiddenLoaded"], [])
+        self.assertGreater(report["appMs"], 0)
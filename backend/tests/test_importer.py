@@ -0,0 +1,104 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from typer.testing import CliRunner
+
+from ..daily_stats import rebuildDailyStats
+from ..importer import CsvRowError, MissingGameError, importScores, importScoresFile
+from ..models import Base, DailyTScore, Game, Player, Score, ScoreMethod
+from ..scripts.import_scores import cli
+from ..seeding import GAME_CONFIGS, SEED_DIR, load_scores_from_csv
+
+
+def score_rows(session: Session) -> set:
+    return set(session.execute(
+        select(Score.date, Game.name, Player.name, Score.score)
+        .join(Game, Score.gameId == Game.id)
+        .join(Player, Score.playerId == Player.id)
+    ).tuples())
+
+
+class ImporterTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.engine.dispose()
+
+    def test_import_of_seed_files_matches_csv_and_stats(self) -> None:
+        for config in GAME_CONFIGS:
+            result = importScoresFile(self.session, config["name"], SEED_DIR / config["csv"], config["scoreMethod"], batchSize=700)
+            entries = load_scores_from_csv(SEED_DIR / config["csv"])
+            self.assertEqual(result.rows, len(entries))
+            self.assertEqual(result.inserted, len(entries))
+
+        expected = {
+            (e["date"], config["name"], e["player_name"], e["score"])
+            for config in GAME_CONFIGS
+            for e in load_scores_from_csv(SEED_DIR / config["csv"])
+        }
+        self.assertEqual(score_rows(self.session), expected)
+        # every imported player plays every game they have a column for
+        self.assertEqual({len(p.games) for p in self.session.scalars(select(Player))}, {len(GAME_CONFIGS)})
+
+        stored = sorted(self.session.execute(select(DailyTScore.date, DailyTScore.gameId, DailyTScore.playerId, DailyTScore.tScore)).tuples())
+        rebuildDailyStats(self.session)
+        self.assertEqual(stored, sorted(self.session.execute(select(DailyTScore.date, DailyTScore.gameId, DailyTScore.playerId, DailyTScore.tScore)).tuples()))
+
+    def test_reimport_keeps_existing_scores(self) -> None:
+        importScores(self.session, "Crossword", io.StringIO("Date,Ann,Bob\n1/1/2024,30,40\n1/2/2024,,35\n"), ScoreMethod.LOW)
+        result = importScores(self.session, "Crossword", io.StringIO("Date,Bob,Cat\n1/2/2024,99,20\n1/3/2024,41,\n"))
+
+        self.assertEqual(result, (3, 2))
+        self.assertEqual({(d.day, p, s) for d, _, p, s in score_rows(self.session)},
+                         {(1, "Ann", 30), (1, "Bob", 40), (2, "Bob", 35), (2, "Cat", 20), (3, "Bob", 41)})
+
+    def test_new_game_needs_a_score_method(self) -> None:
+        with self.assertRaises(MissingGameError):
+            importScores(self.session, "Wordle", io.StringIO("Date,Ann\n1/1/2024,3\n"))
+        self.assertIsNone(self.session.scalar(select(Game)))
+
+    def test_bad_rows_name_their_line(self) -> None:
+        for csv, line in (("Date,Ann\n1/1/2024,3\n1/2/2024,x\n", 3), ("Date,Ann\n2024-01-01,3\n", 2)):
+            with self.subTest(csv=csv), self.assertRaises(CsvRowError) as raised:
+                importScores(self.session, "Crossword", io.StringIO(csv), ScoreMethod.LOW)
+            self.assertEqual(raised.exception.line, line)
+            self.session.rollback()
+        self.assertEqual(score_rows(self.session), set())
+
+
+class ImportScoresCliTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.dbUrl = f"sqlite:///{Path(self.directory.name) / 'scores.db'}"
+        engine = create_engine(self.dbUrl)
+        Base.metadata.create_all(engine)
+        engine.dispose()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def invoke(self, csv: str, *options: str):
+        path = Path(self.directory.name) / "wordle.csv"
+        path.write_text(csv)
+        return CliRunner().invoke(cli, [str(path), "--game", "Wordle", "--db-url", self.dbUrl, *options])
+
+    def test_malformed_cell_is_reported_with_file_and_row(self) -> None:
+        result = self.invoke("Date,Ann,Bob\n1/1/2024,3,4\n1/2/2024,5,four\n", "--score-method", "low")
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("wordle.csv: line 3 '1/2/2024,5,four'", result.output)
+        self.assertNotIn("--score-method", result.output)
+
+    def test_missing_game_points_at_the_score_method(self) -> None:
+        result = self.invoke("Date,Ann\n1/1/2024,3\n")
+
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("--score-method", result.output)
@@ -0,0 +1,53 @@
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from ..loadtest import LoadProfile, RequestRecord, percentile, runLoad, summarize
+from ..models import Base
+from .helpers import create_test_client, load_seed_scores
+
+
+class LoadTestTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        # a file, concurrent requests cannot share the single connection of an in-memory database
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{Path(self.directory.name) / 'load.db'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine)
+        with Session(self.engine) as session:
+            load_seed_scores(session)
+        self.app = create_test_client(self.engine).app
+
+    def tearDown(self) -> None:
+        self.app.dependency_overrides.clear()
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    async def test_release_burst_against_the_app(self) -> None:
+        profile = LoadProfile(users=5, ramp=0, refreshes=2, duplicateRate=1.0, monthlyRate=1.0, thinkTime=0)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app), base_url="http://test") as client:
+            # a date without seed scores, so every first submission is new
+            summary = await runLoad(client, profile, datetime.date(2020, 1, 1))
+
+        endpoints = summary["endpoints"]
+        submissions = endpoints["POST /score/"]["requests"]
+        self.assertGreaterEqual(submissions, 5)
+        self.assertEqual(endpoints["POST /score/ (duplicate)"]["requests"], submissions)
+        self.assertEqual(endpoints["GET /scores/daily"]["requests"], 5 + 2 * submissions)
+        self.assertEqual(endpoints["GET /scores/monthly"]["requests"], 5)
+        self.assertEqual(summary["errors"], 0)
+        self.assertEqual(summary["statuses"]["409"], submissions)
+
+    def test_summary_percentiles_and_errors(self) -> None:
+        records = [RequestRecord("GET /x", 200, i / 1000, True) for i in range(1, 101)]
+        records.append(RequestRecord("GET /x", 500, 1.0, False))
+
+        summary = summarize(records, 2.0)
+        self.assertEqual(summary["throughput"], 50.5)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual((summary["p50"], summary["p99"], summary["max"]), (0.051, 0.1, 1.0))
+        self.assertEqual(percentile([], 95), 0.0)
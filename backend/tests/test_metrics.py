@@ -0,0 +1,97 @@
+import re
+import unittest
+
+from sqlalchemy.orm import Session
+
+from .. import stats
+from ..metrics import Counter, Histogram, Registry
+from ..seeding import GAME_CONFIGS
+from .helpers import create_shared_memory_engine, create_test_client, load_seed_scores
+from .test_numpy_stats import seed_entries
+
+
+def sample_value(text: str, name: str, **labels: str) -> float:
+    selector = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}{re.escape('{' + selector + '}') if labels else ''} (\S+)$", text, re.M)
+    return float(match.group(1)) if match else 0.0
+
+
+class RegistryTestCase(unittest.TestCase):
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        registry = Registry()
+        latency = registry.register(Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0)))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value, "/a")
+        registry.register(Counter("errors_total", "Errors"))
+
+        self.assertEqual(registry.render().splitlines(), [
+            "# HELP latency_seconds Latency",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{route="/a",le="0.1"} 2',
+            'latency_seconds_bucket{route="/a",le="1.0"} 3',
+            'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+            'latency_seconds_sum{route="/a"} 3.65',
+            'latency_seconds_count{route="/a"} 4',
+            "# HELP errors_total Errors",
+            "# TYPE errors_total counter",
+            "errors_total 0",
+        ])
+
+    def test_names_register_once(self) -> None:
+        registry = Registry()
+        registry.register(Counter("errors_total", "Errors"))
+        with self.assertRaises(ValueError):
+            registry.register(Counter("errors_total", "Errors"))
+
+
+class MetricsEndpointTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_shared_memory_engine()
+        with Session(self.engine) as session:
+            load_seed_scores(session)
+        self.client = create_test_client(self.engine)
+
+    def tearDown(self) -> None:
+        self.client.app.dependency_overrides.clear()
+        self.engine.dispose()
+
+    def scrape(self) -> str:
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        return response.text
+
+    def test_requests_are_recorded_under_their_route(self) -> None:
+        route = dict(method="GET", route="/games/{playerName}", status="404")
+        before = self.scrape()
+        self.client.get("/games/Nobody")
+        self.client.get("/no/such/path")
+        after = self.scrape()
+
+        count = "crossdoku_http_request_duration_seconds_count"
+        self.assertEqual(sample_value(after, count, **route) - sample_value(before, count, **route), 1)
+        unmatched = dict(method="GET", route="unmatched", status="404")
+        self.assertEqual(sample_value(after, count, **unmatched) - sample_value(before, count, **unmatched), 1)
+        self.assertGreater(
+            sample_value(after, "crossdoku_db_query_duration_seconds_count", operation="SELECT"),
+            sample_value(before, "crossdoku_db_query_duration_seconds_count", operation="SELECT"),
+        )
+        self.assertGreater(sample_value(after, "crossdoku_threadpool_threads", state="max"), 0)
+
+    def test_cache_hits_and_scoring_time_are_exported(self) -> None:
+        before = self.scrape()
+        # a date no other test caches
+        for _ in range(2):
+            self.client.get("/scores/daily", params={"date": "2023-06-03"})
+        stats.calculateMonthlyPoints(
+            {config["name"]: config["scoreMethod"] for config in GAME_CONFIGS},
+            [e for e in seed_entries() if e["date"].month == 6],
+        )
+        after = self.scrape()
+
+        hits = "crossdoku_cache_requests_total"
+        self.assertEqual(sample_value(after, hits, cache="response", result="hit") - sample_value(before, hits, cache="response", result="hit"), 1)
+        self.assertIn('crossdoku_cache_hit_ratio{cache="response"}', after)
+        for function in ("calculateMonthlyPoints", "_compute_t_scores", "_compute_category_points"):
+            with self.subTest(function=function):
+                self.assertGreater(sample_value(after, "crossdoku_scoring_function_duration_seconds_count", backend="stats", function=function), 0)
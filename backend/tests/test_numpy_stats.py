@@ -0,0 +1,44 @@
+import unittest
+from collections import defaultdict
+from unittest import mock
+
+from .. import numpy_stats, stats
+from ..scoring import getScoringBackend
+from ..seeding import GAME_CONFIGS, SEED_DIR, load_scores_from_csv
+
+
+def seed_entries() -> list[dict]:
+    return [
+        {"date": e["date"], "gameName": config["name"], "playerName": e["player_name"], "score": e["score"]}
+        for config in GAME_CONFIGS
+        for e in load_scores_from_csv(SEED_DIR / config["csv"])
+    ]
+
+
+class NumpyStatsEquivalenceTestCase(unittest.TestCase):
+    games = {config["name"]: config["scoreMethod"] for config in GAME_CONFIGS}
+
+    def test_monthly_points_match_pandas_for_every_seed_month(self) -> None:
+        months = defaultdict(list)
+        for entry in seed_entries():
+            months[entry["date"].replace(day=1)].append(entry)
+
+        for month, entries in sorted(months.items()):
+            with self.subTest(month=month):
+                self.assertEqual(
+                    numpy_stats.calculateMonthlyPoints(self.games, entries),
+                    stats.calculateMonthlyPoints(self.games, entries),
+                )
+
+    def test_backend_selected_from_settings(self) -> None:
+        with mock.patch("backend.scoring.get_settings") as settings:
+            settings.return_value.scoring_backend = "numpy"
+            self.assertIs(getScoringBackend(), numpy_stats)
+            settings.return_value.scoring_backend = "pandas"
+            self.assertIs(getScoringBackend(), stats)
+            # the database scores what it can, pandas the rest
+            settings.return_value.scoring_backend = "sql"
+            self.assertIs(getScoringBackend(), stats)
+            settings.return_value.scoring_backend = "spreadsheet"
+            with self.assertRaises(ValueError):
+                getScoringBackend()
@@ -0,0 +1,56 @@
+import datetime
+import unittest
+
+from sqlalchemy.orm import Session
+
+from ..services import encodeScoresCursor, getDailyScores
+from .helpers import create_shared_memory_engine, create_test_client, load_seed_scores
+
+
+class ScoresPaginationTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_shared_memory_engine()
+        with Session(self.engine) as session:
+            load_seed_scores(session)
+        self.client = create_test_client(self.engine)
+
+    def tearDown(self) -> None:
+        self.client.app.dependency_overrides.clear()
+        self.engine.dispose()
+
+    def test_pages_concatenate_to_the_full_result(self) -> None:
+        params = {"startDate": "2024-01-01", "endDate": "2024-12-31"}
+        pages = []
+        cursor = None
+        while True:
+            response = self.client.get("/scores/", params={**params, "limit": 250, **({"cursor": cursor} if cursor else {})})
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.json())
+            cursor = response.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+
+        self.assertTrue(all(len(page) == 250 for page in pages[:-1]))
+        self.assertLessEqual(len(pages[-1]), 250)
+        with Session(self.engine) as session:
+            expected = getDailyScores(session, datetime.date(2024, 1, 1), datetime.date(2024, 12, 31))
+        self.assertEqual([score for page in pages for score in page], [s.model_dump(mode="json") for s in expected])
+        self.assertEqual(self.client.get("/scores/", params=params).json(), [s.model_dump(mode="json") for s in expected])
+
+    def test_cursor_seeks_past_its_row(self) -> None:
+        day = {"startDate": "2024-05-12", "endDate": "2024-05-12"}
+        full = self.client.get("/scores/", params=day).json()
+        first = self.client.get("/scores/", params={**day, "limit": 4})
+        rest = self.client.get("/scores/", params={**day, "limit": 100, "cursor": first.headers["x-next-cursor"]})
+
+        self.assertEqual(first.json(), full[:4])
+        self.assertEqual(rest.json(), full[4:])
+        self.assertNotIn("x-next-cursor", rest.headers)
+        # the cursor is only a position, it does not need a row to exist there
+        cursor = encodeScoresCursor(datetime.date(2024, 5, 11), 99, 99)
+        self.assertEqual(self.client.get("/scores/", params={**day, "limit": 100, "cursor": cursor}).json(), full)
+
+    def test_bad_cursor_and_limit_are_rejected(self) -> None:
+        self.assertEqual(self.client.get("/scores/", params={"startDate": "2024-01-01", "cursor": "not-a-cursor"}).status_code, 400)
+        self.assertEqual(self.client.get("/scores/", params={"startDate": "2024-01-01", "limit": 0}).status_code, 422)
+        self.assertEqual(self.client.get("/scores/", params={"startDate": "2024-01-01", "limit": 5000}).status_code, 422)
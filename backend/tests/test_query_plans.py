@@ -0,0 +1,95 @@
+import datetime
+import os
+import re
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .. import services
+from ..models import Base
+from ..schemas import ScoreCreate
+from .helpers import load_seed_scores
+
+# score tables that grow with history, a plan may never read them end to end
+HISTORY_TABLES = ("scores", "daily_t_scores", "daily_game_stats")
+DATE = datetime.date(2024, 5, 12)
+
+
+def capture_service_queries(engine: Engine, session: Session) -> list[tuple[str, object]]:
+    """Run the read and write services and return every SELECT they sent to the database."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        services.getDailyScores(session, DATE)
+        services.getDailyScores(session, DATE, DATE, "Rebecca", "Crossword")
+        services.getDailyScores(session, DATE, DATE + datetime.timedelta(days=6), gameName="Sudoku")
+        services.getDailyScoresPage(session, DATE, limit=50,
+                                    cursor=services.encodeScoresCursor(DATE + datetime.timedelta(days=30), 1, 1))
+        services.getCombinedScores(session, DATE)
+        services.getScoreboardDaily(session, DATE)
+        services._computeScoreboardMonthly(session, DATE)
+        with mock.patch("backend.services.get_settings") as settings:
+            settings.return_value.incremental_standings = False
+            services._computeScoreboardMonthly(session, DATE)
+        services.addScores(session, [ScoreCreate(date=DATE, score=1, playerName="Rebecca", gameName="Crossword")])
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return statements
+
+
+class SQLiteQueryPlanTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        load_seed_scores(self.session)
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.engine.dispose()
+
+    def test_service_queries_search_score_tables_by_index(self) -> None:
+        statements = capture_service_queries(self.engine, self.session)
+        fullScan = re.compile(r"^SCAN (%s)\b" % "|".join(HISTORY_TABLES))
+        with self.engine.connect() as conn:
+            for statement, parameters in statements:
+                plan = [row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+                with self.subTest(statement=statement):
+                    self.assertFalse([line for line in plan if fullScan.match(line)], plan)
+
+
+@unittest.skipUnless(os.environ.get("TEST_POSTGRES_URL"), "TEST_POSTGRES_URL is not set")
+class PostgresQueryPlanTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+        Base.metadata.drop_all(self.engine)
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        load_seed_scores(self.session)
+
+    def tearDown(self) -> None:
+        self.session.close()
+        Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def test_service_queries_search_score_tables_by_index(self) -> None:
+        statements = capture_service_queries(self.engine, self.session)
+        with self.engine.connect() as conn:
+            # the seed data is small enough that the planner would rather scan, so ask
+            # whether an index path exists at all
+            conn.exec_driver_sql("SET enable_seqscan = off")
+            for statement, parameters in statements:
+                plan = [row[0] for row in conn.exec_driver_sql("EXPLAIN " + statement, parameters)]
+                with self.subTest(statement=statement):
+                    self.assertFalse(
+                        [line for line in plan if re.search(r"Seq Scan on (%s)\b" % "|".join(HISTORY_TABLES), line)],
+                        plan
+                    )
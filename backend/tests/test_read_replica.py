@@ -0,0 +1,110 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from .. import main
+from ..database import get_read_session, register_replica
+from ..lookups import getNameLookup
+from ..models import Base, Score
+from ..standings import getStandingsEngine
+from ..versions import DataVersions
+from .helpers import create_test_client, load_seed_scores
+
+# only the replica has this score, so a response shows which database served it
+REPLICA_ONLY_SCORE = 9999
+
+
+class ReadReplicaTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        primaryPath = Path(self.directory.name) / "primary.db"
+        replicaPath = Path(self.directory.name) / "replica.db"
+        self.primary = create_engine(f"sqlite:///{primaryPath}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.primary)
+        with Session(self.primary) as session:
+            load_seed_scores(session)
+
+        # "replicate" with an online backup, then make the copy tell itself apart
+        with sqlite3.connect(primaryPath) as source, sqlite3.connect(replicaPath) as target:
+            source.backup(target)
+        self.replica = create_engine(f"sqlite:///{replicaPath}", connect_args={"check_same_thread": False})
+        register_replica(self.replica, self.primary)
+        with Session(self.replica) as session:
+            session.execute(update(Score).where(Score.id == 1).values(score=REPLICA_ONLY_SCORE))
+            session.commit()
+            self.replicaDate = session.get(Score, 1).date.isoformat()
+
+        self.client = create_test_client(self.primary)
+
+        def get_test_read_session():
+            with Session(self.replica) as session:
+                yield session
+
+        self.client.app.dependency_overrides[get_read_session] = get_test_read_session
+        # recent writes of other tests must not route these reads
+        self.patches = [
+            mock.patch.object(main, "dataVersions", DataVersions()),
+            mock.patch.object(main.settings, "read_database_url", "sqlite:///replica.db"),
+            mock.patch.object(main.settings, "replica_lag_seconds", 60.0),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self) -> None:
+        for patch in reversed(self.patches):
+            patch.stop()
+        self.client.app.dependency_overrides.clear()
+        self.primary.dispose()
+        self.replica.dispose()
+        self.directory.cleanup()
+
+    def servedByReplica(self, client: TestClient, startDate: str) -> bool:
+        response = client.get("/scores/", params={"startDate": startDate, "endDate": startDate})
+        self.assertEqual(response.status_code, 200)
+        return any(score["score"] == REPLICA_ONLY_SCORE for score in response.json())
+
+    def test_reads_go_to_the_replica_without_recent_writes(self) -> None:
+        self.assertTrue(self.servedByReplica(self.client, self.replicaDate))
+        self.assertEqual(self.client.get("/players/").status_code, 200)
+
+    def test_writes_send_the_date_and_the_writing_client_to_the_primary(self) -> None:
+        written = {"date": "2020-02-01", "playerName": "Sarah", "gameName": "Crossword", "score": 42}
+        response = self.client.post("/score/", json=written)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(main.PRIMARY_READS_COOKIE, response.cookies)
+
+        # the writer reads every date from the primary
+        self.assertFalse(self.servedByReplica(self.client, self.replicaDate))
+
+        # other clients only for the written date, which the replica may not have yet
+        with TestClient(self.client.app) as other:
+            self.assertTrue(self.servedByReplica(other, self.replicaDate))
+            self.assertEqual(other.get("/scores/", params={"startDate": "2020-02-01", "endDate": "2020-02-01"}).json(), [written])
+
+    def test_replica_serves_again_after_the_lag(self) -> None:
+        with mock.patch.object(main.settings, "replica_lag_seconds", 0.0):
+            response = self.client.post("/score/", json={"date": "2020-02-01", "playerName": "Sarah", "gameName": "Crossword", "score": 42})
+            self.assertNotIn(main.PRIMARY_READS_COOKIE, response.cookies)
+            # the replica never got the score
+            self.assertEqual(self.client.get("/scores/", params={"startDate": "2020-02-01", "endDate": "2020-02-01"}).json(), [])
+            self.assertTrue(self.servedByReplica(self.client, self.replicaDate))
+
+    def test_standings_stay_on_the_primary(self) -> None:
+        # the replica's score would change the points
+        params = {"start": self.replicaDate, "end": self.replicaDate}
+        response = self.client.get("/scores/standings", params=params)
+        self.assertEqual(response.status_code, 200)
+        del self.client.app.dependency_overrides[get_read_session]
+        with mock.patch.object(main.settings, "read_database_url", ""):
+            self.assertEqual(self.client.get("/scores/standings", params=params).json(), response.json())
+
+    def test_replica_shares_the_primary_caches(self) -> None:
+        with Session(self.primary) as primary, Session(self.replica) as replica:
+            self.assertIs(getStandingsEngine(replica), getStandingsEngine(primary))
+            self.assertIs(getNameLookup(replica), getNameLookup(primary))
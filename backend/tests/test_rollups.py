@@ -0,0 +1,142 @@
+import datetime
+import unittest
+from collections import defaultdict
+from unittest import mock
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from ..daily_stats import refreshDailyStats
+from ..models import Base, Game, MonthlyPoint, MonthlyRollup, Player, Score, ScoreMethod
+from ..rollups import monthEnd, planRange, rangePeriods, rangePoints
+from ..schemas import ScoreCreate
+from ..services import _computeScoreboardMonthly, addScores, computeStandings, updateScore
+from .helpers import load_seed_scores
+
+
+class RangePeriodsTestCase(unittest.TestCase):
+    def test_ranges_split_at_month_boundaries(self) -> None:
+        self.assertEqual(monthEnd(datetime.date(2024, 2, 10)), datetime.date(2024, 2, 29))
+        self.assertEqual(rangePeriods(datetime.date(2024, 1, 20), datetime.date(2024, 3, 5)), [
+            (datetime.date(2024, 1, 20), datetime.date(2024, 1, 31)),
+            (datetime.date(2024, 2, 1), datetime.date(2024, 2, 29)),
+            (datetime.date(2024, 3, 1), datetime.date(2024, 3, 5)),
+        ])
+
+
+class StandingsTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        load_seed_scores(self.session)
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.engine.dispose()
+
+    def summed_monthly_boards(self, startDate: datetime.date, endDate: datetime.date) -> dict:
+        totals = defaultdict(int)
+        for monthStart, monthLast in rangePeriods(startDate, endDate):
+            self.assertEqual(monthStart.day, 1)
+            for point in _computeScoreboardMonthly(self.session, monthLast).playerPoints:
+                totals[(point.playerName, point.category)] += point.points
+        return dict(totals)
+
+    def points(self, response) -> dict:
+        return {(p.playerName, p.category): p.points for p in response.playerPoints if p.points}
+
+    def stored_months(self) -> set:
+        return set(self.session.scalars(select(MonthlyPoint.month).distinct()))
+
+    def test_range_is_the_sum_of_its_monthly_boards(self) -> None:
+        startDate, endDate = datetime.date(2024, 1, 1), datetime.date(2024, 6, 30)
+        expected = {key: value for key, value in self.summed_monthly_boards(startDate, endDate).items() if value}
+
+        cold = computeStandings(self.session, startDate, endDate)
+        self.assertEqual(self.points(cold), expected)
+        self.assertEqual(len(self.stored_months()), 6)
+        self.assertEqual(computeStandings(self.session, startDate, endDate), cold)
+
+        with mock.patch("backend.services.get_settings") as settings:
+            settings.return_value.incremental_standings = False
+            self.session.execute(MonthlyRollup.__table__.delete())
+            self.assertEqual(computeStandings(self.session, startDate, endDate), cold)
+
+    def test_partial_and_open_months_are_not_stored(self) -> None:
+        computeStandings(self.session, datetime.date(2024, 1, 15), datetime.date(2024, 3, 10))
+        self.assertEqual(self.stored_months(), {datetime.date(2024, 2, 1)})
+
+        with mock.patch("backend.services.datetime") as clock:
+            clock.date.today.return_value = datetime.date(2024, 4, 30)
+            computeStandings(self.session, datetime.date(2024, 4, 1), datetime.date(2024, 4, 30))
+        self.assertNotIn(datetime.date(2024, 4, 1), self.stored_months())
+
+    def test_score_write_outdates_the_months_rollup(self) -> None:
+        startDate, endDate = datetime.date(2024, 4, 1), datetime.date(2024, 5, 31)
+        before = computeStandings(self.session, startDate, endDate)
+
+        score = self.session.execute(
+            select(Score.date, Player.name.label("playerName"), Game.name.label("gameName"), Game.scoreMethod)
+            .join(Player, Score.playerId == Player.id)
+            .join(Game, Score.gameId == Game.id)
+            .where(Score.date == datetime.date(2024, 5, 12))
+        ).first()
+        # the day's outright best score
+        best = 1 if score.scoreMethod == ScoreMethod.LOW else 10**6
+        updateScore(self.session, ScoreCreate(date=score.date, playerName=score.playerName, gameName=score.gameName, score=best))
+
+        after = computeStandings(self.session, startDate, endDate)
+        self.assertNotEqual(after, before)
+        self.assertEqual(self.points(after), {k: v for k, v in self.summed_monthly_boards(startDate, endDate).items() if v})
+
+    def current_months(self, startDate: datetime.date, endDate: datetime.date) -> set:
+        games = {g.name: g.scoreMethod for g in self.session.scalars(select(Game))}
+        return set(planRange(self.session, games, startDate, endDate, datetime.date(2025, 1, 1)).stored)
+
+    def test_bulk_write_outdates_each_written_month(self) -> None:
+        startDate, endDate = datetime.date(2024, 1, 1), datetime.date(2024, 4, 30)
+        computeStandings(self.session, startDate, endDate)
+        self.assertEqual(len(self.current_months(startDate, endDate)), 4)
+
+        addScores(self.session, [
+            ScoreCreate(date=datetime.date(2024, 2, 3), playerName="Rebecca", gameName="Crossword", score=30),
+            ScoreCreate(date=datetime.date(2024, 2, 4), playerName="Rebecca", gameName="Crossword", score=30),
+            ScoreCreate(date=datetime.date(2024, 3, 9), playerName="Rebecca", gameName="Sudoku", score=30),
+        ], upsert=True)
+
+        self.assertEqual(self.current_months(startDate, endDate), {datetime.date(2024, 1, 1), datetime.date(2024, 4, 1)})
+
+    def test_score_writes_leave_the_monthly_rollups_alone(self) -> None:
+        # the writes of a month touch their own (date, game) rows, none they all have to lock
+        computeStandings(self.session, datetime.date(2024, 1, 1), datetime.date(2024, 2, 29))
+        rollups = self.session.execute(select(MonthlyRollup.__table__)).all()
+
+        addScores(self.session, [
+            ScoreCreate(date=datetime.date(2024, 2, 3), playerName="Rebecca", gameName="Crossword", score=30),
+            ScoreCreate(date=datetime.date(2024, 2, 4), playerName="Rebecca", gameName="Sudoku", score=30),
+        ], upsert=True)
+
+        self.assertEqual(self.session.execute(select(MonthlyRollup.__table__)).all(), rollups)
+
+    def test_write_during_computation_keeps_the_rollup_outdated(self) -> None:
+        month = datetime.date(2024, 2, 1)
+        games = {g.name: g.scoreMethod for g in self.session.scalars(select(Game))}
+        playerIds = {p.name: p.id for p in self.session.scalars(select(Player))}
+        game = self.session.scalars(select(Game)).first()
+
+        def computeWithRacingWrite(start, end):
+            with Session(self.engine) as writer:
+                refreshDailyStats(writer, start + datetime.timedelta(days=4), game.id, game.scoreMethod)
+                writer.commit()
+            return {}
+
+        rangePoints(self.session, games, playerIds, month, monthEnd(month), datetime.date(2025, 1, 1), computeWithRacingWrite)
+        self.assertEqual(self.current_months(month, monthEnd(month)), set())
+
+        calls = []
+        rangePoints(self.session, games, playerIds, month, monthEnd(month), datetime.date(2025, 1, 1), lambda s, e: calls.append(s) or {})
+        self.assertEqual(calls, [month])
+        rangePoints(self.session, games, playerIds, month, monthEnd(month), datetime.date(2025, 1, 1), lambda s, e: calls.append(s) or {})
+        self.assertEqual(calls, [month])
+        self.assertEqual(self.session.scalar(select(func.count()).select_from(MonthlyPoint)), 0)
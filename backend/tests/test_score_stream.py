@@ -0,0 +1,118 @@
+import asyncio
+import datetime
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from .. import main
+from ..models import Base
+from ..score_stream import KEEPALIVE, MAX_QUEUED, READY, Subscription, scoreStream
+from .helpers import create_test_client, load_seed_scores
+
+
+def eventData(message: bytes) -> dict:
+    lines = message.decode().splitlines()
+    assert lines[0] == "event: scores", lines
+    return json.loads(lines[1].removeprefix("data: "))
+
+
+class SubscriptionTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_month_streams_cover_the_month_up_to_their_date(self) -> None:
+        month = Subscription(datetime.date(2024, 5, 12), month=True)
+        self.assertTrue(month.matches(datetime.date(2024, 5, 1)))
+        self.assertTrue(month.matches(datetime.date(2024, 5, 12)))
+        self.assertFalse(month.matches(datetime.date(2024, 5, 13)))
+        self.assertFalse(month.matches(datetime.date(2024, 4, 30)))
+        self.assertFalse(Subscription(datetime.date(2024, 5, 12), month=False).matches(datetime.date(2024, 5, 11)))
+
+    async def test_a_subscriber_that_falls_behind_is_told_to_refetch(self) -> None:
+        subscription = Subscription(datetime.date(2024, 5, 12), month=False)
+        for i in range(MAX_QUEUED + 1):
+            subscription.send(b"event %d" % i)
+        self.assertEqual(subscription.queue.qsize(), 1)
+        self.assertEqual(subscription.queue.get_nowait(), READY)
+
+    async def test_a_cancelled_stream_unsubscribes(self) -> None:
+        # what uvicorn's --timeout-graceful-shutdown does to streams still open
+        started = asyncio.Event()
+
+        async def consume() -> None:
+            async for _ in scoreStream.events(datetime.date(2024, 5, 12)):
+                started.set()
+
+        task = asyncio.create_task(consume())
+        await asyncio.wait_for(started.wait(), 1)
+        self.assertEqual(scoreStream.subscriberCount(), 1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(scoreStream.subscriberCount(), 0)
+
+
+class ScoreStreamTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        # a file, the writes commit from the threadpool
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{Path(self.directory.name) / 'stream.db'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine)
+        with Session(self.engine) as session:
+            load_seed_scores(session)
+        self.app = create_test_client(self.engine).app
+
+    def tearDown(self) -> None:
+        self.app.dependency_overrides.clear()
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    async def test_writes_are_pushed_to_the_streams_of_their_date(self) -> None:
+        # a date without seed scores
+        date = datetime.date(2020, 1, 10)
+        day = scoreStream.events(date)
+        month = scoreStream.events(datetime.date(2020, 1, 31), month=True)
+        otherDay = scoreStream.events(date + datetime.timedelta(days=1), keepalive=0.01)
+        for stream in (day, month, otherDay):
+            self.assertEqual(await anext(stream), READY)
+        self.assertEqual(scoreStream.subscriberCount(), 3)
+
+        written = [
+            {"date": date.isoformat(), "playerName": player, "gameName": game, "score": score}
+            for game, player, score in [("Crossword", "Sarah", 40), ("Crossword", "Phil", 60), ("Sudoku", "Sarah", 200), ("Sudoku", "Phil", 150)]
+        ]
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app), base_url="http://test") as client:
+            for score in written:
+                self.assertEqual((await client.post("/score/", json=score)).status_code, 200)
+            self.assertEqual((await client.put("/score/", json={**written[0], "score": 35})).status_code, 200)
+            combined = (await client.get("/scores/combined", params={"date": date.isoformat()})).json()
+
+        dayEvents = [eventData(await asyncio.wait_for(anext(day), 1)) for _ in range(5)]
+        self.assertEqual([event["scores"] for event in dayEvents], [[score] for score in written] + [[{**written[0], "score": 35}]])
+        self.assertEqual(dayEvents[0]["combined"], [])
+        self.assertEqual(dayEvents[-1]["combined"], combined)
+        self.assertEqual(len(combined), 2)
+
+        monthEvents = [eventData(await asyncio.wait_for(anext(month), 1)) for _ in range(5)]
+        self.assertEqual([event["scores"] for event in monthEvents], [event["scores"] for event in dayEvents])
+        self.assertEqual(await anext(otherDay), KEEPALIVE)
+
+        for stream in (day, month, otherDay):
+            await stream.aclose()
+        self.assertEqual(scoreStream.subscriberCount(), 0)
+
+    async def test_stream_endpoint(self) -> None:
+        response = await main.streamScores(datetime.date(2024, 5, 12))
+        self.assertEqual(response.media_type, "text/event-stream")
+        self.assertEqual(response.headers["cache-control"], "no-cache")
+        self.assertEqual(await anext(response.body_iterator), READY)
+
+        scoreStream.close()
+        with self.assertRaises(StopAsyncIteration):
+            await anext(response.body_iterator)
+        self.assertEqual(scoreStream.subscriberCount(), 0)
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app), base_url="http://test") as client:
+            self.assertEqual((await client.get("/scores/stream", params={"date": "2999-01-01"})).status_code, 400)
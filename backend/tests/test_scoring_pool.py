@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from .. import stats
+from ..scoring_pool import ScoringPool
+from ..seeding import GAME_CONFIGS
+from .test_numpy_stats import seed_entries
+
+
+class ScoringPoolTestCase(unittest.TestCase):
+    def test_concurrent_identical_requests_share_one_computation(self) -> None:
+        pool = ScoringPool(0)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "board"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(pool.coalesce("key", compute)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(pool.coalesce("key", compute))) for _ in range(3)]
+        for follower in followers:
+            follower.start()
+        deadline = time.monotonic() + 5
+        while pool.coalesced < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertEqual(results, ["board"] * 4)
+        self.assertEqual(len(calls), 1)
+        # finished computations are not reused
+        self.assertEqual(pool.coalesce("key", lambda: "next"), "next")
+
+    def test_followers_receive_the_leaders_error(self) -> None:
+        pool = ScoringPool(0)
+
+        async def scenario():
+            gate = asyncio.Event()
+
+            async def failing():
+                await gate.wait()
+                raise ValueError("no scores")
+
+            leader = asyncio.ensure_future(pool.coalesceAsync("key", failing))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(pool.coalesceAsync("key", failing))
+            await asyncio.sleep(0)
+            gate.set()
+            return await asyncio.gather(leader, follower, return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        self.assertEqual([type(r) for r in results], [ValueError, ValueError])
+        self.assertEqual(pool.computations, 1)
+
+    def test_process_pool_matches_inline_scoring(self) -> None:
+        games = {config["name"]: config["scoreMethod"] for config in GAME_CONFIGS}
+        entries = [e for e in seed_entries() if e["date"].strftime("%Y-%m") == "2024-05"]
+        pool = ScoringPool(1)
+        try:
+            self.assertEqual(pool.run(stats.calculateMonthlyPoints, games, entries),
+                             stats.calculateMonthlyPoints(games, entries))
+        finally:
+            pool.shutdown()
@@ -0,0 +1,58 @@
+import datetime
+import unittest
+from unittest import mock
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from .. import main
+from ..models import Player
+from ..schemas import ScorePublic
+from ..serialization import ScoreRow, scoreRow, scoreRowsJson
+from .helpers import create_shared_memory_engine, create_test_client, load_seed_scores
+
+
+class ScoreRowsJsonTestCase(unittest.TestCase):
+    def test_rows_follow_the_schema_field_order(self) -> None:
+        self.assertEqual(list(ScoreRow.__annotations__), list(ScorePublic.model_fields))
+        self.assertEqual(list(scoreRow(datetime.date(2024, 5, 12), 1, "p", "g")), list(ScorePublic.model_fields))
+
+    def test_bytes_match_the_models(self) -> None:
+        rows = [scoreRow(datetime.date(2024, 5, 12), 95, "Zoë", "Mini"), scoreRow(datetime.date(2024, 5, 13), -3, 'a "b"', "Combined")]
+        models = [ScorePublic.model_validate(row) for row in rows]
+        expected = b"[" + b",".join(model.model_dump_json().encode() for model in models) + b"]"
+        self.assertEqual(scoreRowsJson(rows), expected)
+
+
+class FastSerializationTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_shared_memory_engine()
+        with Session(self.engine) as session:
+            load_seed_scores(session)
+            # a name that needs escaping or non-ASCII output in either path
+            session.execute(update(Player).where(Player.name == "Sarah").values(name="Sarah \"Zoë\" ☃"))
+            session.commit()
+        self.client = create_test_client(self.engine)
+
+    def tearDown(self) -> None:
+        self.client.app.dependency_overrides.clear()
+        self.engine.dispose()
+
+    def test_responses_are_byte_identical_to_the_response_model(self) -> None:
+        requests = [
+            ("/scores/", {"startDate": "2024-01-01", "endDate": "2024-12-31"}),
+            ("/scores/", {"startDate": "2024-05-01", "endDate": "2024-05-31", "limit": 7}),
+            ("/scores/", {"startDate": "2024-05-01", "playerName": "Sarah \"Zoë\" ☃"}),
+            ("/scores/combined", {"date": "2024-05-12"}),
+        ]
+        for path, params in requests:
+            with self.subTest(path=path, params=params):
+                with mock.patch.object(main.settings, "fast_serialization", True):
+                    fast = self.client.get(path, params=params)
+                with mock.patch.object(main.settings, "fast_serialization", False):
+                    validated = self.client.get(path, params=params)
+                self.assertEqual(fast.status_code, 200)
+                self.assertTrue(fast.json())
+                self.assertEqual(fast.content, validated.content)
+                for header in ("content-type", "etag", "cache-control", "x-next-cursor"):
+                    self.assertEqual(fast.headers.get(header), validated.headers.get(header))
@@ -1,13 +1,20 @@
 import datetime
 import unittest
+from unittest import mock
 
-from sqlalchemy import create_engine
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, select
 from sqlalchemy.orm import Session
 
-from ..models import Base, Game, Player, Score, ScoreMethod
-from ..schemas import ScoreCreate
+from ..exceptions import DuplicateScoreException, InvalidScoreException, InvalidUpdateException
+from ..lookups import getNameLookup
+from ..daily_stats import rebuildDailyStats
+from ..models import Base, DailyTScore, Game, Player, Score, ScoreMethod
+from ..schemas import PlayerCreate, ScoreCreate
 from ..services import (
     addNewScore,
+    addPlayer,
+    addScores,
     getAllPlayers,
     getDailyScores,
     getScoreboardDaily,
@@ -88,3 +95,154 @@ class ServicesTestCase(unittest.TestCase):
         self.assertEqual(daily_scores[0].gameName, "Sudoku")
         self.assertEqual(scoreboard.players[0].name, "JohnDoe")
         self.assertEqual(scoreboard.games[0].name, "Sudoku")
+
+    def test_daily_scoreboard_uses_two_round_trips(self) -> None:
+        other = Player(name="JaneDoe")
+        crossword = Game(name="Crossword", scoreMethod=ScoreMethod.LOW)
+        self.session.add_all([other, crossword, Player(name="NoScores")])
+        self.session.commit()
+        for player, game, value in [(self.player, self.game, 5), (other, self.game, 7),
+                                    (self.player, crossword, 30), (other, crossword, 20)]:
+            addNewScore(self.session, ScoreCreate(date=datetime.date(2026, 1, 1), score=value,
+                                                  playerName=player.name, gameName=game.name))
+
+        statements: list[str] = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        scoreboard = getScoreboardDaily(self.session, datetime.date(2026, 1, 1))
+
+        self.assertEqual(len(statements), 2)
+        self.assertEqual([p.name for p in scoreboard.players], ["JohnDoe", "JaneDoe", "NoScores"])
+        self.assertEqual(
+            [(s.gameName, s.playerName, s.score) for s in scoreboard.scores],
+            [("Combined", "JaneDoe", 0), ("Combined", "JohnDoe", 0),
+             ("Sudoku", "JohnDoe", 5), ("Sudoku", "JaneDoe", 7),
+             ("Crossword", "JaneDoe", 20), ("Crossword", "JohnDoe", 30)],
+        )
+
+    def test_score_writes_use_cached_ids(self) -> None:
+        getNameLookup(self.session).load(self.session)
+        addPlayer(self.session, PlayerCreate(name="JaneDoe"))
+
+        statements: list[str] = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        score = ScoreCreate(date=datetime.date(2026, 1, 1), score=5, playerName="JaneDoe", gameName="Sudoku")
+        addNewScore(self.session, score)
+        updateScore(self.session, score.model_copy(update={"score": 4}))
+
+        # one statement per write and no lookups, the rest maintains the stored t-scores
+        writes = [s.split()[0] for s in statements if s.startswith(("INSERT INTO scores", "UPDATE scores"))]
+        self.assertEqual(writes, ["INSERT", "UPDATE"])
+        self.assertFalse([s for s in statements if "FROM players" in s or "FROM games" in s])
+        self.assertEqual(self.session.scalar(select(Score.score).where(Score.playerId != self.player.id)), 4)
+
+    def test_score_write_conflicts(self) -> None:
+        score = ScoreCreate(date=datetime.date(2026, 1, 1), score=5, playerName="JohnDoe", gameName="Sudoku")
+        addNewScore(self.session, score)
+
+        with self.assertRaises(DuplicateScoreException) as duplicate:
+            addNewScore(self.session, score.model_copy(update={"score": 9}))
+        self.assertIn("Score of 5 already exists", duplicate.exception.detail)
+        with self.assertRaises(InvalidUpdateException):
+            updateScore(self.session, score.model_copy(update={"date": datetime.date(2026, 1, 2)}))
+        with self.assertRaises(HTTPException) as missing:
+            addNewScore(self.session, score.model_copy(update={"playerName": "Nobody"}))
+        self.assertEqual(missing.exception.status_code, 404)
+
+    def test_unknown_names_are_not_reloaded_on_every_request(self) -> None:
+        lookup = getNameLookup(self.session)
+        lookup.load(self.session)
+        loads, misses = lookup.loads, lookup.misses
+        score = ScoreCreate(date=datetime.date(2026, 1, 1), score=5, playerName="Nobody", gameName="Sudoku")
+
+        for _ in range(5):
+            with self.assertRaises(HTTPException):
+                addNewScore(self.session, score)
+            with self.assertRaises(HTTPException):
+                addNewScore(self.session, score.model_copy(update={"playerName": "JohnDoe", "gameName": "Sudok"}))
+        # one indexed lookup per unknown name, no reloads of the tables
+        self.assertEqual((lookup.loads, lookup.misses), (loads, misses + 2))
+
+        # a player added here is known straight away, one added elsewhere once the miss expires
+        addPlayer(self.session, PlayerCreate(name="Nobody"))
+        addNewScore(self.session, score)
+        self.session.add(Game(name="Sudok", scoreMethod=ScoreMethod.LOW))
+        self.session.commit()
+        with mock.patch("backend.lookups.time.monotonic", return_value=10**9):
+            self.assertEqual(lookup.game(self.session, "Sudok").scoreMethod, ScoreMethod.LOW)
+        self.assertEqual(lookup.loads, loads)
+
+    def test_bulk_scores_report_conflicts_and_upsert(self) -> None:
+        self.session.add(Player(name="JaneDoe"))
+        self.session.commit()
+        day = datetime.date(2026, 1, 1)
+        addNewScore(self.session, ScoreCreate(date=day, score=5, playerName="JohnDoe", gameName="Sudoku"))
+
+        result = addScores(self.session, [
+            ScoreCreate(date=day, score=6, playerName="JohnDoe", gameName="Sudoku"),
+            ScoreCreate(date=day, score=7, playerName="JaneDoe", gameName="Sudoku"),
+            ScoreCreate(date=day + datetime.timedelta(days=1), score=8, playerName="JohnDoe", gameName="Sudoku"),
+            ScoreCreate(date=day, score=9, playerName="JaneDoe", gameName="Sudoku"),
+        ])
+
+        self.assertEqual([(s.playerName, s.date.day, s.score) for s in result.scores],
+                         [("JaneDoe", 1, 7), ("JohnDoe", 2, 8)])
+        self.assertEqual([(c.index, c.detail) for c in result.conflicts], [
+            (0, "Score of 5 already exists for JohnDoe in Sudoku for 2026-01-01"),
+            (3, "Score of 7 already exists for JaneDoe in Sudoku for 2026-01-01"),
+        ])
+
+        upserted = addScores(self.session, [
+            ScoreCreate(date=day, score=4, playerName="JohnDoe", gameName="Sudoku"),
+            ScoreCreate(date=day, score=3, playerName="JaneDoe", gameName="Sudoku"),
+        ], upsert=True)
+        self.assertEqual(upserted.conflicts, [])
+        self.assertEqual(sorted(self.session.execute(select(Score.date, Score.score)).tuples()),
+                         [(day, 3), (day, 4), (day + datetime.timedelta(days=1), 8)])
+
+        # the stored t-scores were kept in step with the bulk writes
+        stored = sorted(self.session.execute(select(DailyTScore.date, DailyTScore.playerId, DailyTScore.tScore)).tuples())
+        rebuildDailyStats(self.session)
+        self.assertEqual(stored, sorted(self.session.execute(select(DailyTScore.date, DailyTScore.playerId, DailyTScore.tScore)).tuples()))
+
+    def test_bulk_scores_repeating_an_existing_score_name_the_stored_one(self) -> None:
+        day = datetime.date(2026, 1, 1)
+        addNewScore(self.session, ScoreCreate(date=day, score=5, playerName="JohnDoe", gameName="Sudoku"))
+
+        result = addScores(self.session, [
+            ScoreCreate(date=day, score=6, playerName="JohnDoe", gameName="Sudoku"),
+            ScoreCreate(date=day, score=7, playerName="JohnDoe", gameName="Sudoku"),
+        ])
+
+        self.assertEqual(result.scores, [])
+        self.assertEqual([(c.index, c.detail) for c in result.conflicts], [
+            (0, "Score of 5 already exists for JohnDoe in Sudoku for 2026-01-01"),
+            (1, "Score of 5 already exists for JohnDoe in Sudoku for 2026-01-01"),
+        ])
+        self.assertEqual(self.session.scalars(select(Score.score)).all(), [5])
+
+    def test_bulk_scores_unknown_name_writes_nothing(self) -> None:
+        with self.assertRaises(HTTPException):
+            addScores(self.session, [
+                ScoreCreate(date=datetime.date(2026, 1, 1), score=5, playerName="JohnDoe", gameName="Sudoku"),
+                ScoreCreate(date=datetime.date(2026, 1, 1), score=5, playerName="Nobody", gameName="Sudoku"),
+            ])
+        self.assertEqual(self.session.scalars(select(Score)).all(), [])
+
+    def test_negative_scores_are_rejected_before_writing(self) -> None:
+        day = datetime.date(2026, 1, 1)
+        with self.assertRaises(InvalidScoreException) as bulk:
+            addScores(self.session, [
+                ScoreCreate(date=day, score=5, playerName="JohnDoe", gameName="Sudoku"),
+                ScoreCreate(date=day + datetime.timedelta(days=1), score=-1, playerName="JohnDoe", gameName="Sudoku"),
+            ])
+        self.assertEqual(bulk.exception.status_code, 400)
+        self.assertIn("at index 1", bulk.exception.detail)
+        self.assertEqual(self.session.scalars(select(Score)).all(), [])
+
+        # not a duplicate, which is how the check constraint's IntegrityError was reported
+        with self.assertRaises(InvalidScoreException):
+            addNewScore(self.session, ScoreCreate(date=day, score=-1, playerName="JohnDoe", gameName="Sudoku"))
+        addNewScore(self.session, ScoreCreate(date=day, score=5, playerName="JohnDoe", gameName="Sudoku"))
+        with self.assertRaises(InvalidScoreException):
+            updateScore(self.session, ScoreCreate(date=day, score=-1, playerName="JohnDoe", gameName="Sudoku"))
+        self.assertEqual(self.session.scalars(select(Score.score)).all(), [5])
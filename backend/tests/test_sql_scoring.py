@@ -0,0 +1,104 @@
+import datetime
+import statistics
+import unittest
+from collections import defaultdict
+from unittest import mock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from .. import services, stats
+from ..models import Base
+from ..seeding import GAME_CONFIGS
+from ..sql_scoring import sqlMonthlyPoints, sqlScoringAvailable
+from .helpers import load_seed_scores
+from .test_numpy_stats import seed_entries
+
+
+class StddevSamp:
+    """postgres' stddev_samp() as a SQLite window function, so the query runs in tests."""
+
+    def __init__(self) -> None:
+        self.values: list[float] = []
+
+    def step(self, value: float) -> None:
+        self.values.append(value)
+
+    def inverse(self, value: float) -> None:
+        self.values.remove(value)
+
+    def value(self):
+        return statistics.stdev(self.values) if len(self.values) > 1 else None
+
+    def finalize(self):
+        return self.value()
+
+
+class SqlScoringTestCase(unittest.TestCase):
+    games = {config["name"]: config["scoreMethod"] for config in GAME_CONFIGS}
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.engine = create_engine("sqlite://")
+        event.listen(cls.engine, "connect", lambda connection, _: connection.create_window_function("stddev_samp", 1, StddevSamp))
+        Base.metadata.create_all(cls.engine)
+        with Session(cls.engine) as session:
+            load_seed_scores(session)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.engine.dispose()
+
+    def setUp(self) -> None:
+        self.session = Session(self.engine)
+
+    def tearDown(self) -> None:
+        self.session.close()
+
+    def test_monthly_points_match_pandas_for_every_seed_month(self) -> None:
+        months = defaultdict(list)
+        for entry in seed_entries():
+            months[entry["date"].replace(day=1)].append(entry)
+
+        for month, entries in sorted(months.items()):
+            with self.subTest(month=month):
+                endDate = max(entry["date"] for entry in entries)
+                self.assertEqual(
+                    sqlMonthlyPoints(self.session, self.games, month, endDate),
+                    stats.calculateMonthlyPoints(self.games, entries),
+                )
+
+    def test_range_without_scores(self) -> None:
+        self.assertEqual(sqlMonthlyPoints(self.session, self.games, datetime.date(2000, 1, 1), datetime.date(2000, 1, 31)), [])
+
+    def test_full_recompute_scores_in_sql_when_available(self) -> None:
+        date = datetime.date(2024, 5, 12)
+        with mock.patch("backend.services.get_settings") as settings:
+            settings.return_value.incremental_standings = False
+            expected = services.getScoreboardMonthly(self.session, date)
+            with mock.patch("backend.services.sqlScoringAvailable", return_value=True), \
+                    mock.patch("backend.services.sqlMonthlyPoints", wraps=sqlMonthlyPoints) as sqlScoring:
+                self.assertEqual(services.getScoreboardMonthly(self.session, date), expected)
+                self.assertEqual(sqlScoring.call_count, 1)
+
+    def test_only_postgres_scores_in_sql(self) -> None:
+        postgres = mock.Mock()
+        postgres.get_bind.return_value.dialect.name = "postgresql"
+        with mock.patch("backend.sql_scoring.get_settings") as settings:
+            settings.return_value.scoring_backend = "sql"
+            self.assertTrue(sqlScoringAvailable(postgres))
+            # SQLite has no stddev_samp, the pandas functions score it
+            self.assertFalse(sqlScoringAvailable(self.session))
+            settings.return_value.scoring_backend = "pandas"
+            self.assertFalse(sqlScoringAvailable(postgres))
+
+    def test_incremental_standings_score_with_no_backend(self) -> None:
+        # the default: SCORING_BACKEND only picks the kernel of the full recompute
+        with mock.patch("backend.services.get_settings") as settings, \
+                mock.patch("backend.services.getScoringBackend") as backend, \
+                mock.patch("backend.services.sqlMonthlyPoints") as sqlScoring:
+            settings.return_value.incremental_standings = True
+            settings.return_value.scoring_backend = "sql"
+            services._computeScoreboardMonthly(self.session, datetime.date(2024, 5, 12))
+        backend.assert_not_called()
+        sqlScoring.assert_not_called()
@@ -0,0 +1,69 @@
+import datetime
+import unittest
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+from ..models import Base, Game, Player, Score
+from ..schemas import ScoreCreate
+from ..services import addNewScore, updateScore
+from ..standings import getStandingsEngine
+from ..stats import calculateMonthlyPoints
+from .helpers import load_seed_scores
+
+
+class StandingsEngineTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        load_seed_scores(self.session)
+        self.games = {g.name: g.scoreMethod for g in self.session.scalars(select(Game))}
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.engine.dispose()
+
+    def full_recompute(self, startDate: datetime.date, endDate: datetime.date):
+        rows = self.session.execute(
+            select(Score.date, Game.name.label("gameName"), Player.name.label("playerName"), Score.score)
+            .join(Game, Score.gameId == Game.id)
+            .join(Player, Score.playerId == Player.id)
+            .where(Score.date >= startDate, Score.date <= endDate)
+        ).mappings().all()
+        return calculateMonthlyPoints(self.games, [dict(r) for r in rows])
+
+    def test_matches_full_recompute_for_every_seed_month(self) -> None:
+        standings = getStandingsEngine(self.session)
+        first = self.session.scalars(select(Score.date).order_by(Score.date)).first()
+        last = self.session.scalars(select(Score.date).order_by(Score.date.desc())).first()
+        month = first.replace(day=1)
+        while month <= last:
+            endDate = min((month + datetime.timedelta(days=31)).replace(day=1) - datetime.timedelta(days=1), last)
+            with self.subTest(month=month):
+                self.assertEqual(
+                    standings.monthlyPoints(self.session, self.games, month, endDate),
+                    self.full_recompute(month, endDate),
+                )
+            month = endDate + datetime.timedelta(days=1)
+
+    def test_score_write_recomputes_only_that_game_day(self) -> None:
+        standings = getStandingsEngine(self.session)
+        startDate, endDate = datetime.date(2024, 5, 1), datetime.date(2024, 5, 31)
+        standings.monthlyPoints(self.session, self.games, startDate, endDate)
+
+        statements: list[str] = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        cached = standings.monthlyPoints(self.session, self.games, startDate, endDate)
+        self.assertEqual(statements, [])
+        self.assertEqual(cached, self.full_recompute(startDate, endDate))
+
+        updateScore(self.session, ScoreCreate(date=datetime.date(2024, 5, 10), score=20, playerName="Nate", gameName="Crossword"))
+        addNewScore(self.session, ScoreCreate(date=datetime.date(2024, 5, 12), score=30, playerName="Rebecca", gameName="Crossword"))
+        addNewScore(self.session, ScoreCreate(date=datetime.date(2024, 5, 12), score=100, playerName="Rebecca", gameName="Sudoku"))
+
+        statements.clear()
+        updated = standings.monthlyPoints(self.session, self.games, startDate, endDate)
+        # one reload covering just the two touched dates
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(updated, self.full_recompute(startDate, endDate))
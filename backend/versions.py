@@ -0,0 +1,71 @@
+import datetime
+import secrets
+import threading
+import time
+from typing import Optional
+
+class DataVersions:
+    """In-process change counters used to build ETags for the read endpoints.
+
+    Every score write bumps the counter of its date and every new player bumps the
+    players counter, so a resource's version can be read without touching the
+    database. The epoch changes on every process start so ETags handed out before a
+    restart never match. Counters only see writes made through this process.
+
+    The time of the latest write is kept too, so reads can tell whether a replica may
+    not have that write yet.
+    """
+
+    def __init__(self) -> None:
+        self.epoch = secrets.token_hex(4)
+        self._lock = threading.Lock()
+        self._players = 0
+        self._scoreDates: dict[datetime.date, int] = {}
+        self._playersWritten = float("-inf")
+        self._scoreDatesWritten: dict[datetime.date, float] = {}
+
+    def playersChanged(self) -> None:
+        with self._lock:
+            self._players += 1
+            self._playersWritten = time.monotonic()
+
+    def scoreChanged(self, date: datetime.date) -> None:
+        with self._lock:
+            self._scoreDates[date] = self._scoreDates.get(date, 0) + 1
+            self._scoreDatesWritten[date] = time.monotonic()
+
+    def playersWrittenWithin(self, seconds: float) -> bool:
+        return time.monotonic() - self._playersWritten < seconds
+
+    def scoresWrittenWithin(self, seconds: float, startDate: datetime.date, endDate: Optional[datetime.date] = None) -> bool:
+        since = time.monotonic() - seconds
+        with self._lock:
+            return any(
+                written > since
+                for date, written in self._scoreDatesWritten.items()
+                if date >= startDate and (endDate is None or date <= endDate)
+            )
+
+    def playersVersion(self) -> int:
+        return self._players
+
+    def scoresVersion(self, startDate: datetime.date, endDate: Optional[datetime.date] = None) -> int:
+        # counters only grow, so the sum changes whenever any date in the range changes
+        with self._lock:
+            return sum(
+                count for date, count in self._scoreDates.items()
+                if date >= startDate and (endDate is None or date <= endDate)
+            )
+
+    def etag(self, *versions: int) -> str:
+        return '"' + "-".join([self.epoch, *(str(v) for v in versions)]) + '"'
+
+dataVersions = DataVersions()
+
+def etagMatches(ifNoneMatch: Optional[str], etag: str) -> bool:
+    if not ifNoneMatch:
+        return False
+    if ifNoneMatch.strip() == "*":
+        return True
+    # weak comparison, as If-None-Match requires
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in ifNoneMatch.split(","))
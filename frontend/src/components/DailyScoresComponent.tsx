@@ -1,11 +1,31 @@
 import { useState, useEffect } from "react";
 
-import { api } from '@/services/api';
-import type { Game, Score} from "@/services/api";
+import { api, HIGH_SCORE_WINS } from '@/services/api';
+import type { Game, Score, ScoreStreamEvent} from "@/services/api";
 import { GameScorecard } from "./GameScorecardComponent";
 import { Spinner } from "./SpinnerComponent";
 import {DateNavigator} from "@/components/DateNavigatorComponent";
 
+// merge a pushed write into the board, keeping each game ranked like the server does
+function applyScoreEvent(scores: Score[], games: Game[], event: ScoreStreamEvent): Score[] {
+    const merged = [...scores];
+    for (const score of event.scores) {
+        const index = merged.findIndex(s => s.gameName === score.gameName && s.playerName === score.playerName);
+        if (index >= 0) {
+            merged[index] = score;
+        } else {
+            merged.push(score);
+        }
+    }
+    return games.flatMap(game => {
+        const gameScores = game.name === 'Combined' && event.combined !== null
+            ? [...event.combined]
+            : merged.filter(score => score.gameName === game.name);
+        // stable, so ties keep submission order
+        return gameScores.sort((a, b) => game.scoreMethod === HIGH_SCORE_WINS ? b.score - a.score : a.score - b.score);
+    });
+}
+
 export function DailyScores() {
     // date selector with default date
     // set up state variables
@@ -16,28 +36,51 @@ export function DailyScores() {
     const dateDefault = new Date();
     const [date, setDate] = useState<Date>(dateDefault); 
 
-    // load data from the get scores end point
+    // load the board when the score stream connects, then apply the writes it pushes
     useEffect(() => {
+        const dateString = date.toISOString().split('T')[0];
+        let active = true;
+        let boardGames: Game[] = [];
+        // writes that arrive while the board loads, applied on top of it
+        let pending: ScoreStreamEvent[] | null = [];
+
         const fetchData = async () => {
-            setLoading(true);
+            const buffered: ScoreStreamEvent[] = [];
+            pending = buffered;
             setError(null);
             try {
-                const dateString = date.toISOString().split('T')[0];
                 const result = await api.getDailyScoreboard(dateString);
+                if (!active) return;
+                boardGames = result.games;
                 setGames(result.games);
-                setScores(result.scores);
-                if (result.games.length === 0 || result.scores.length === 0) {
+                setScores(buffered.reduce((scores, event) => applyScoreEvent(scores, boardGames, event), result.scores));
+                if (result.games.length === 0 || (result.scores.length === 0 && buffered.length === 0)) {
                     setError(Error('No data for this date'));
                 }
             } catch (err) {
-                if (err instanceof Error) {
+                if (active && err instanceof Error) {
                     setError(err);
                 }
             } finally {
-                setLoading(false);
+                // a reconnect may have started a newer load meanwhile
+                if (pending === buffered) pending = null;
+                if (active) setLoading(false);
+            }
+        };
+
+        setLoading(true);
+        const unsubscribe = api.subscribeToScores(dateString, 'day', fetchData, (event) => {
+            if (pending !== null) {
+                pending.push(event);
+                return;
             }
+            setScores(scores => applyScoreEvent(scores, boardGames, event));
+            if (boardGames.length) setError(null);
+        });
+        return () => {
+            active = false;
+            unsubscribe();
         };
-        fetchData();
     }, [date]);
 
     if (loading) return <Spinner />
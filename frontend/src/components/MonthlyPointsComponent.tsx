@@ -5,6 +5,9 @@ import type { Player, Point} from "@/services/api";
 import { Spinner } from "./SpinnerComponent";
 import { DateNavigator } from "./DateNavigatorComponent";
 
+// ms to wait after a pushed write before reloading, so a burst of writes costs one reload
+const RELOAD_DELAY = 2000;
+
 export function MonthlyPoints() {
     // create state variables (players, games, points, loading, error)
     const [players, setPlayers] = useState<Player[]>([]);
@@ -16,14 +19,17 @@ export function MonthlyPoints() {
     const dateDefault = new Date();
     const [date, setDate] = useState<Date>(dateDefault); 
 
-    // load data
+    // load data when the score stream connects, and again after writes to the month
     useEffect(() => {
+        const dateString = date.toISOString().split('T')[0];
+        let active = true;
+        let reload: ReturnType<typeof setTimeout> | null = null;
+
         const fetchData = async () => {
-            setLoading(true);
             setError(null);
             try {
-                const dateString = date.toISOString().split('T')[0];
                 const result = await api.getMonthlyScores(dateString);
+                if (!active) return;
 
                 setPlayers(result.players);
                 setCategories(result.categories);
@@ -33,14 +39,29 @@ export function MonthlyPoints() {
                     setError(Error('No valid scores for this date'))
                 }
             } catch (err){
-                if (err instanceof Error) {
+                if (active && err instanceof Error) {
                     setError(err);
                 }
             } finally {
-                setLoading(false);
+                if (active) setLoading(false);
+            }
+        };
+
+        setLoading(true);
+        const unsubscribe = api.subscribeToScores(dateString, 'month', fetchData, () => {
+            // points depend on every score of the day, so reload rather than patch
+            if (reload === null) {
+                reload = setTimeout(() => {
+                    reload = null;
+                    fetchData();
+                }, RELOAD_DELAY);
             }
+        });
+        return () => {
+            active = false;
+            if (reload !== null) clearTimeout(reload);
+            unsubscribe();
         };
-        fetchData();
     }, [date]);
 
     // create map for data
@@ -1,7 +1,9 @@
-import { type CreateScoreRequest, type Score} from "./types";
+import { type CreateScoreRequest, type Score, type ScoreFilters, type ScorePage, type ScoreStreamEvent, type StreamScope} from "./types";
 
 const API_BASE_URL = import.meta.env.VITE_API_URL
 
+const SCORES_PAGE_SIZE = 500
+
 export class ApiError extends Error {
     status: number;
 
@@ -24,10 +26,16 @@ async function handleResponseError(response: Response): Promise<never> {
     throw new ApiError(response.status, body.detail);
 }
 
+// send cookies cross-origin too, after a write the backend sets one that keeps
+// this browser's reads on the primary database until the replica caught up
+function apiFetch(url: string, init?: RequestInit): Promise<Response> {
+    return fetch(url, { ...init, credentials: 'include' });
+}
+
 export const api = {
     // authorize user
     async verifyPassword(password: string) {
-        const response = await fetch(`${API_BASE_URL}/auth/verify`,{
+        const response = await apiFetch(`${API_BASE_URL}/auth/verify`,{
             method: 'POST',
             headers: {'Content-Type': 'application/json' },
             body: JSON.stringify({password}),
@@ -39,7 +47,7 @@ export const api = {
     },
     // add player
     async addPlayer(name: string) {
-        const response = await fetch(`${API_BASE_URL}/players/new`, {
+        const response = await apiFetch(`${API_BASE_URL}/players/new`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json'},
             body: JSON.stringify({"name":name})
@@ -55,7 +63,7 @@ export const api = {
     },
     // get players
     async getPlayers() {
-        const response = await fetch (`${API_BASE_URL}/players`);
+        const response = await apiFetch(`${API_BASE_URL}/players`);
         if (!response.ok) {
             await handleResponseError(response);
         }
@@ -63,38 +71,53 @@ export const api = {
     },
     // get games
     async getGames(playerName: string) {
-        const response = await fetch (`${API_BASE_URL}/games/${playerName}`);
+        const response = await apiFetch(`${API_BASE_URL}/games/${playerName}`);
         if (!response.ok) {
             await handleResponseError(response);
         }
         return response.json();
     },
-    // get scores
-    async getScores(params: {
-        startDate: string; 
-        endDate?: string;
-        playerName?: string;
-        gameName?: string;
-    }) {
+    // get every score of the range in one request, use getScoresPage for long ranges
+    async getScores(params: ScoreFilters): Promise<Score[]> {
         const queryParams = new URLSearchParams();
         if (params?.startDate) queryParams.append('startDate', params.startDate);
         if (params?.endDate) queryParams.append('endDate', params.endDate);
         if (params?.playerName) queryParams.append('playerName', params.playerName);
         if (params?.gameName) queryParams.append('gameName', params.gameName);
 
-        const queryString = queryParams.toString();
-        const url = `${API_BASE_URL}/scores${queryString ? `?${queryString}` : ''}`;
+        const url = `${API_BASE_URL}/scores?${queryParams.toString()}`;
 
-        const response = await fetch(url);
+        const response = await apiFetch(url);
         if (!response.ok) {
             await handleResponseError(response);
         }
         return response.json();
     },
+    // get one page of scores, pass the returned cursor to load the next one when it is needed
+    async getScoresPage(params: ScoreFilters, limit: number = SCORES_PAGE_SIZE, cursor: string | null = null): Promise<ScorePage> {
+        const queryParams = new URLSearchParams();
+        if (params?.startDate) queryParams.append('startDate', params.startDate);
+        if (params?.endDate) queryParams.append('endDate', params.endDate);
+        if (params?.playerName) queryParams.append('playerName', params.playerName);
+        if (params?.gameName) queryParams.append('gameName', params.gameName);
+        queryParams.append('limit', String(limit));
+        if (cursor) queryParams.append('cursor', cursor);
+
+        const url = `${API_BASE_URL}/scores?${queryParams.toString()}`;
+
+        const response = await apiFetch(url);
+        if (!response.ok) {
+            await handleResponseError(response);
+        }
+        return {
+            scores: await response.json(),
+            nextCursor: response.headers.get('X-Next-Cursor'),
+        };
+    },
     // get combined scores
     async getCombinedScores(date: string) {
         const url = `${API_BASE_URL}/scores/combined?date=${date}`;
-        const response = await fetch(url);
+        const response = await apiFetch(url);
         if (!response.ok) {
             await handleResponseError(response);
         }
@@ -103,7 +126,16 @@ export const api = {
     // get monthly scores
     async getMonthlyScores(date:string) {
         const url = `${API_BASE_URL}/scores/monthly?date=${date}`;
-        const response = await fetch(url);
+        const response = await apiFetch(url);
+        if (!response.ok) {
+            await handleResponseError(response);
+        }
+        return response.json();
+    },
+    // get monthly-style points summed over any date range
+    async getStandings(start: string, end: string) {
+        const url = `${API_BASE_URL}/scores/standings?start=${start}&end=${end}`;
+        const response = await apiFetch(url);
         if (!response.ok) {
             await handleResponseError(response);
         }
@@ -111,7 +143,7 @@ export const api = {
     },
     // add score
     async createScore(scoreData: CreateScoreRequest): Promise<Score> {
-        const response = await fetch(`${API_BASE_URL}/score`,{
+        const response = await apiFetch(`${API_BASE_URL}/score`,{
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify(scoreData),
@@ -126,7 +158,7 @@ export const api = {
     },
     // update score
     async updateScore(scoreData: CreateScoreRequest): Promise<Score> {
-        const response= await fetch(`${API_BASE_URL}/score`,{
+        const response= await apiFetch(`${API_BASE_URL}/score`,{
             method: 'PUT',
             headers: {'Content-Type': 'application/json'},
             body: JSON.stringify(scoreData),
@@ -139,10 +171,19 @@ export const api = {
     // get dailyScoreboard
     async getDailyScoreboard(date:string) {
         const url = `${API_BASE_URL}/scores/daily?date=${date}`
-        const response = await fetch(url);
+        const response = await apiFetch(url);
         if (!response.ok) {
             await handleResponseError(response);
         }
         return response.json()
+    },
+    // live score writes for a date, instead of polling the boards
+    // onReady fires on every (re)connect: load the board then, onScores follows with each write
+    // returns a function that closes the stream
+    subscribeToScores(date: string, scope: StreamScope, onReady: () => void, onScores: (event: ScoreStreamEvent) => void): () => void {
+        const source = new EventSource(`${API_BASE_URL}/scores/stream?date=${date}&scope=${scope}`);
+        source.addEventListener('ready', () => onReady());
+        source.addEventListener('scores', (message: MessageEvent) => onScores(JSON.parse(message.data)));
+        return () => source.close();
     }
 }
@@ -1,2 +1,3 @@
 export { api, ApiError, DuplicateError } from './api';
-export type { CreateScoreRequest, Score, Game, Player, DailyScoreboard, MonthlyScoreboard, Point} from './types';
\ No newline at end of file
+export { HIGH_SCORE_WINS } from './types';
+export type { CreateScoreRequest, Score, Game, Player, DailyScoreboard, MonthlyScoreboard, Point, ScoreFilters, ScorePage, ScoreStreamEvent, StreamScope} from './types';
\ No newline at end of file
@@ -3,12 +3,14 @@ export interface Player {
     name: string
 }
 
-export type ScoreMethod = 1 | -1
+export type ScoreMethod = 100 | -100
+
+export const HIGH_SCORE_WINS: ScoreMethod = 100
 
 export interface Game {
     id?: number;
     name: string;
-    scoringMethod: ScoreMethod;
+    scoreMethod: ScoreMethod;
 }
 
 export interface Player {
@@ -24,6 +26,28 @@ export interface Score {
     score: number;
 }
 
+export interface ScoreFilters {
+    startDate: string; // YYYY-MM-DD
+    endDate?: string;
+    playerName?: string;
+    gameName?: string;
+}
+
+export interface ScorePage {
+    scores: Score[];
+    nextCursor: string | null;
+}
+
+// what GET /scores/stream pushes after each write
+export interface ScoreStreamEvent {
+    date: string;
+    scores: Score[];
+    // the date's combined scores, null on month streams when nobody watches the day
+    combined: Score[] | null;
+}
+
+export type StreamScope = 'day' | 'month'
+
 export interface Point {
     playerName: string;
     category: string;
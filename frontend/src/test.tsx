@@ -1,7 +1,10 @@
-import { useEffect } from 'react';
+import { useEffect, useState } from 'react';
 import { api } from './services/api/api';
 
 function Test() {
+  // cursor of the next page of scores, null once the last page is loaded
+  const [scoresCursor, setScoresCursor] = useState<string | null>(null);
+
   useEffect(() => {
     async function testAPI() {
       try {
@@ -13,8 +16,10 @@ function Test() {
         const games = await api.getGames('phil');
         console.log('Games:', games);
 
-        const scores = await api.getScores({startDate:'2025-12-01'});
-        console.log('Scores:', scores);
+        // only the first page, the rest loads on demand
+        const scores = await api.getScoresPage({startDate:'2025-12-01'});
+        console.log('Scores:', scores.scores);
+        setScoresCursor(scores.nextCursor);
 
         const combinedScores = await api.getCombinedScores('2025-12-01');
         console.log('Combined Scores:', combinedScores);
@@ -31,6 +36,16 @@ function Test() {
     
   }, []);
 
+  const loadMoreScores = async () => {
+    try {
+      const page = await api.getScoresPage({startDate:'2025-12-01'}, undefined, scoresCursor);
+      console.log('More Scores:', page.scores);
+      setScoresCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error: ', error);
+    }
+  }
+
   const submitScore = async () => {
     try {
       console.log('Submitting score...');
@@ -50,6 +65,13 @@ function Test() {
       >
         Submit Score
       </button>
+      {scoresCursor && (
+        <button
+          onClick={loadMoreScores}
+        >
+          Load more scores
+        </button>
+      )}
     </div>
   );
 }